@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Admission control and load shedding for webhook ingestion
+Bounds how many webhooks are processed at once and how many may wait.
+Final recording events are queued ahead of realtime chunks, and realtime
+chunks are shed first when the queue fills up. Speech synthesis has a
+controller of its own, so slow ElevenLabs calls never take ingestion slots.
+"""
+import heapq
+import itertools
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+from flask import jsonify, request
+
+PRIORITY_FINAL = 0
+PRIORITY_REALTIME = 1
+
+class Overloaded(Exception):
+    """Raised when a request is not admitted"""
+
+    def __init__(self, status, retry_after, reason):
+        super().__init__(reason)
+        self.status = status
+        self.retry_after = retry_after
+        self.reason = reason
+
+class _Waiter:
+    __slots__ = ('priority', 'state')
+
+    def __init__(self, priority):
+        self.priority = priority
+        self.state = 'waiting'
+
+class AdmissionController:
+    """Bounded concurrency with a bounded priority queue in front of it"""
+
+    def __init__(self, max_concurrent=8, max_queue=64, realtime_queue_limit=None, queue_timeout=10.0,
+                 name='Ingestion'):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        # Realtime chunks may only use part of the queue, leaving room for final events
+        self.realtime_queue_limit = max_queue // 2 if realtime_queue_limit is None else realtime_queue_limit
+        self.queue_timeout = queue_timeout
+        self._cond = threading.Condition()
+        self._active = 0
+        self._waiting = []  # heap of (priority, seq, waiter)
+        self._seq = itertools.count()
+        self._service_time = 0.05  # moving average, seconds
+        self._stats = {"admitted": 0, "shed": 0, "rejected": 0, "timed_out": 0, "evicted": 0}
+
+    @contextmanager
+    def admit(self, priority=PRIORITY_REALTIME):
+        """Hold a processing slot for the duration of the block, or raise Overloaded"""
+        self._acquire(priority)
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self._release(time.monotonic() - started)
+
+    def stats(self):
+        """Current load and shedding counters"""
+        with self._cond:
+            return {
+                "active": self._active,
+                "queued": len(self._waiting),
+                "max_concurrent": self.max_concurrent,
+                "max_queue": self.max_queue,
+                "avg_service_ms": round(self._service_time * 1000, 1),
+                **self._stats
+            }
+
+    def _retry_after(self):
+        backlog = self._active + len(self._waiting)
+        return max(1, math.ceil(backlog * self._service_time / self.max_concurrent))
+
+    def _reject(self, status, counter, reason):
+        self._stats[counter] += 1
+        raise Overloaded(status, self._retry_after(), reason)
+
+    def _acquire(self, priority):
+        with self._cond:
+            if self._active < self.max_concurrent and not self._waiting:
+                self._active += 1
+                self._stats['admitted'] += 1
+                return
+
+            if priority > PRIORITY_FINAL and len(self._waiting) >= self.realtime_queue_limit:
+                self._reject(429, 'shed', f"{self.name} busy, realtime chunk shed")
+            if len(self._waiting) >= self.max_queue and not self._evict_for(priority):
+                self._reject(503, 'rejected', f"{self.name} queue full")
+
+            waiter = _Waiter(priority)
+            entry = (priority, next(self._seq), waiter)
+            heapq.heappush(self._waiting, entry)
+            deadline = time.monotonic() + self.queue_timeout
+            while waiter.state == 'waiting':
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._waiting.remove(entry)
+                    heapq.heapify(self._waiting)
+                    self._reject(503, 'timed_out', f"Timed out waiting for {self.name.lower()} capacity")
+                self._cond.wait(remaining)
+            if waiter.state == 'evicted':
+                raise Overloaded(503, self._retry_after(), "Displaced by a higher-priority event")
+            self._stats['admitted'] += 1
+
+    def _evict_for(self, priority):
+        """Make room for a higher-priority request by dropping the newest lower-priority waiter"""
+        candidates = [entry for entry in self._waiting if entry[0] > priority]
+        if not candidates:
+            return False
+        victim = max(candidates, key=lambda entry: (entry[0], entry[1]))
+        self._waiting.remove(victim)
+        heapq.heapify(self._waiting)
+        victim[2].state = 'evicted'
+        self._stats['evicted'] += 1
+        self._cond.notify_all()
+        return True
+
+    def _release(self, elapsed):
+        with self._cond:
+            self._service_time = 0.9 * self._service_time + 0.1 * elapsed
+            self._active -= 1
+            while self._active < self.max_concurrent and self._waiting:
+                _, _, waiter = heapq.heappop(self._waiting)
+                waiter.state = 'admitted'
+                self._active += 1
+            self._cond.notify_all()
+
+    def guard(self, classify):
+        """Decorator admitting a Flask view with the priority classify(payload) returns"""
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                priority = classify(request.get_json(silent=True) or {})
+                try:
+                    with self.admit(priority):
+                        return view(*args, **kwargs)
+                except Overloaded as e:
+                    response = jsonify({"status": "error", "message": e.reason})
+                    response.status_code = e.status
+                    response.headers['Retry-After'] = str(e.retry_after)
+                    return response
+            return wrapper
+        return decorator
+
+def controller_from_env(prefix='INGEST', max_concurrent=8, max_queue=64, queue_timeout=10, name='Ingestion'):
+    """Build a controller from <prefix>_* environment variables (INGEST_* by default)"""
+    max_queue = int(os.getenv(f'{prefix}_MAX_QUEUE') or max_queue)
+    realtime_limit = os.getenv(f'{prefix}_REALTIME_QUEUE_LIMIT')
+    return AdmissionController(
+        max_concurrent=int(os.getenv(f'{prefix}_MAX_CONCURRENT') or max_concurrent),
+        max_queue=max_queue,
+        realtime_queue_limit=int(realtime_limit) if realtime_limit else None,
+        queue_timeout=float(os.getenv(f'{prefix}_QUEUE_TIMEOUT') or queue_timeout),
+        name=name
+    )
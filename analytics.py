@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Incrementally maintained interview analytics
+Rollups are updated per ingested interview (retracting its previous
+contribution first), so serving them never scans the interview archive
+"""
+import threading
+from collections import Counter
+from datetime import datetime
+
+# Keyword-category counters reported in analysis['metrics']
+KEYWORD_METRICS = [
+    'programming_languages_mentioned',
+    'frameworks_mentioned',
+    'technical_concepts',
+    'soft_skills_demonstrated',
+    'problem_solving_examples'
+]
+
+SCORE_BUCKET_SIZE = 10
+
+def _score_bucket(score):
+    """Histogram bucket label for a 0-100 score"""
+    low = min(int(score) // SCORE_BUCKET_SIZE * SCORE_BUCKET_SIZE, 100 - SCORE_BUCKET_SIZE)
+    return f"{low}-{low + SCORE_BUCKET_SIZE - 1 if low + SCORE_BUCKET_SIZE < 100 else 100}"
+
+def _periods(timestamp):
+    """Day and ISO week keys for an interview timestamp"""
+    try:
+        when = datetime.fromisoformat(str(timestamp))
+    except (TypeError, ValueError):
+        return None, None
+    year, week, _ = when.isocalendar()
+    return when.date().isoformat(), f"{year}-W{week:02d}"
+
+def interview_contribution(interview):
+    """What a single interview adds to the rollups"""
+    analysis = interview.get('analysis') or {}
+    metrics = analysis.get('metrics') or {}
+    enhanced = interview.get('n8n_enhanced') or {}
+    score = analysis.get('score') or 0
+    day, week = _periods(interview.get('timestamp'))
+    return {
+        "score": score,
+        "bucket": _score_bucket(score),
+        "day": day,
+        "week": week,
+        "word_count": metrics.get('word_count') or 0,
+        "keywords": {key: metrics.get(key) or 0 for key in KEYWORD_METRICS},
+        "topics": list(enhanced.get('topic_extraction') or []),
+        "engagement": enhanced.get('engagement_score') or 'unknown',
+        "sentiment": (enhanced.get('sentiment_analysis') or {}).get('sentiment') or 'unknown'
+    }
+
+class AnalyticsRollups:
+    """Running aggregates over all stored interviews"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._contributions = {}
+        self.count = 0
+        self.score_total = 0
+        self.word_total = 0
+        self.score_histogram = Counter()
+        self.by_day = {}   # day -> [count, score_total]
+        self.by_week = {}  # week -> [count, score_total]
+        self.keywords = Counter()
+        self.topics = Counter()
+        self.engagement = Counter()
+        self.sentiment = Counter()
+
+    def update(self, interview):
+        """Fold a new or changed interview into the rollups"""
+        contribution = interview_contribution(interview)
+        with self._lock:
+            previous = self._contributions.pop(interview['id'], None)
+            if previous:
+                self._apply(previous, -1)
+            self._contributions[interview['id']] = contribution
+            self._apply(contribution, 1)
+
+    def remove(self, interview_id):
+        """Retract an interview from the rollups"""
+        with self._lock:
+            previous = self._contributions.pop(interview_id, None)
+            if previous:
+                self._apply(previous, -1)
+
+    def rebuild(self, interviews):
+        """Recompute the rollups from scratch"""
+        with self._lock:
+            self._reset()
+        for interview in interviews:
+            self.update(interview)
+
+    def _apply(self, c, sign):
+        self.count += sign
+        self.score_total += sign * c['score']
+        self.word_total += sign * c['word_count']
+        self.score_histogram[c['bucket']] += sign
+        for periods, key in ((self.by_day, c['day']), (self.by_week, c['week'])):
+            if key is None:
+                continue
+            entry = periods.setdefault(key, [0, 0])
+            entry[0] += sign
+            entry[1] += sign * c['score']
+            if not entry[0]:
+                del periods[key]
+        self.keywords.update({key: sign * value for key, value in c['keywords'].items()})
+        self.topics.update({topic: sign for topic in c['topics']})
+        self.engagement[c['engagement']] += sign
+        self.sentiment[c['sentiment']] += sign
+
+    def snapshot(self, granularity='day'):
+        """Current rollups in API response shape"""
+        with self._lock:
+            periods = self.by_week if granularity == 'week' else self.by_day
+            return {
+                "interviews": self.count,
+                "average_score": round(self.score_total / self.count, 2) if self.count else 0,
+                "average_word_count": round(self.word_total / self.count, 2) if self.count else 0,
+                "score_distribution": _nonzero(self.score_histogram),
+                "averages": {
+                    "granularity": 'week' if granularity == 'week' else 'day',
+                    "periods": [
+                        {"period": key, "interviews": count, "average_score": round(total / count, 2)}
+                        for key, (count, total) in sorted(periods.items())
+                    ]
+                },
+                "keyword_mentions": _nonzero(self.keywords),
+                "topics": dict(_nonzero(self.topics).most_common()),
+                "engagement": _nonzero(self.engagement),
+                "sentiment": _nonzero(self.sentiment)
+            }
+
+def merge_snapshots(snapshots, granularity='day'):
+    """Combine snapshot() results of several shards into one"""
+    count = sum(s['interviews'] for s in snapshots)
+    # Totals are recovered from the (2-decimal) averages, so merged averages may be off by 0.01
+    score_total = sum(s['average_score'] * s['interviews'] for s in snapshots)
+    word_total = sum(s['average_word_count'] * s['interviews'] for s in snapshots)
+    periods = {}
+    for s in snapshots:
+        for period in s['averages']['periods']:
+            entry = periods.setdefault(period['period'], [0, 0])
+            entry[0] += period['interviews']
+            entry[1] += period['average_score'] * period['interviews']
+    merged = {key: Counter() for key in ('score_distribution', 'keyword_mentions', 'topics', 'engagement',
+                                          'sentiment')}
+    for s in snapshots:
+        for key, counter in merged.items():
+            counter.update(s[key])
+    return {
+        "interviews": count,
+        "average_score": round(score_total / count, 2) if count else 0,
+        "average_word_count": round(word_total / count, 2) if count else 0,
+        "score_distribution": merged['score_distribution'],
+        "averages": {
+            "granularity": 'week' if granularity == 'week' else 'day',
+            "periods": [
+                {"period": key, "interviews": n, "average_score": round(total / n, 2)}
+                for key, (n, total) in sorted(periods.items())
+            ]
+        },
+        "keyword_mentions": merged['keyword_mentions'],
+        "topics": dict(merged['topics'].most_common()),
+        "engagement": merged['engagement'],
+        "sentiment": merged['sentiment']
+    }
+
+def _nonzero(counter):
+    """Drop counters that have been fully retracted"""
+    return Counter({key: value for key, value in counter.items() if value})
@@ -3,24 +3,49 @@
 Backend API server for interview analysis and dashboard
 Handles webhooks from Recall.ai and provides interview data
 """
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, Response, request, jsonify, redirect, send_file, send_from_directory, stream_with_context
 from flask_cors import CORS
+from functools import partial, wraps
+import hmac
 import json
 import os
 import requests
 from datetime import datetime
 from pathlib import Path
 import re
+import threading
+import time
+
+from interview_analysis import analyze_interview, analysis_cache_info, get_rubric, set_rubric
+from rubric import load_rubric
+from search_index import TranscriptIndex, QuerySyntaxError, make_snippet
+from analytics import AnalyticsRollups
+from admission import PRIORITY_FINAL, PRIORITY_REALTIME, controller_from_env
+from interview_locks import KeyedLocks
+from interview_store import (DATA_DIR, DATA_FILE, SNAPSHOT_FILE, DataDirLock, InterviewStore, archiver_from_env,
+                             parse_time_filter)
+from interview_record import InterviewRecord
+from reanalyze import reanalyze_interviews, DEFAULT_BATCH_SIZE
+from export_interviews import FORMATS as EXPORT_FORMATS, export_lines, iter_export, parse_fields
+from bulk_import import (DEFAULT_BATCH_SIZE as IMPORT_BATCH_SIZE, import_interviews as bulk_import,
+                         iter_ndjson, iter_stream_lines)
+from job_queue import JobQueue, WorkerPool, MAX_IDLE_POLL, QUEUE_FILE
+from result_cache import n8n_result_cache, response_cache, transcript_hash
+import circuit_breaker
+import rate_limiter
+from profiler import profiler
+from elevenlabs_integration import synthesize_speech
+from audio_store import AudioStore, DEFAULT_MODEL_ID, DEFAULT_VOICE_ID, StoreFull, audio_key, check_text, is_valid_key
 
 # Import integrations
 try:
     from n8n_backend_service import N8NBackendService
-    n8n_backend_service = N8NBackendService()
+    n8n_backend_service = N8NBackendService(max_wait=rate_limiter.REQUEST_MAX_WAIT)
     N8N_AVAILABLE = True
 except:
     try:
         from n8n_backend import N8NBackend
-        n8n_backend_service = N8NBackend()
+        n8n_backend_service = N8NBackend(max_wait=rate_limiter.REQUEST_MAX_WAIT)
         N8N_AVAILABLE = True
     except:
         try:
@@ -31,6 +56,13 @@ except:
             N8N_AVAILABLE = False
             n8n_backend_service = None
 
+# Reports and enhanced analyses served from n8n MCP (results are cached)
+try:
+    from n8n_backend import N8NBackend
+    n8n_reports = N8NBackend(max_wait=rate_limiter.REQUEST_MAX_WAIT)
+except Exception:
+    n8n_reports = None
+
 try:
     from config import N8N_MCP_URL, ELEVENLABS_API_KEY
 except:
@@ -40,173 +72,262 @@ except:
 app = Flask(__name__, static_folder='.', static_url_path='')
 CORS(app)
 
-# Store interview data
-interviews_db = []
-DATA_FILE = Path(__file__).parent / "interviews_data.json"
+# Store interview data in a binary snapshot under DATA_DIR; records are read on demand
+DATA_DIR.mkdir(parents=True, exist_ok=True)
+interviews_db = InterviewStore(SNAPSHOT_FILE)
+archiver = archiver_from_env(interviews_db)
+
+# interviews_db is only changed under _db_lock, and records are replaced
+# rather than mutated, so readers and save_interviews() never see a
+# half-applied update
+_db_lock = threading.RLock()
+_positions = {}      # interview id -> index of its record in interviews_db
+_bot_positions = {}  # bot id -> index of its record in interviews_db
+_versions = {}       # interview id -> number of times it was published (keys response_cache)
+
+# Chunks for the same meeting are applied in order; different meetings run in parallel
+interview_locks = KeyedLocks()
+
+# Full-text index over transcripts, kept up to date as webhooks arrive
+transcript_index = TranscriptIndex()
+
+# Aggregates for /api/analytics, updated on every ingest
+analytics_rollups = AnalyticsRollups()
+
+# Synthesized speech, stored on disk by content key. Synthesis runs behind
+# its own small admission controller, never in the webhooks' slots
+audio_store = AudioStore(synthesize=partial(synthesize_speech, max_wait=rate_limiter.REQUEST_MAX_WAIT))
+synthesis = controller_from_env('TTS', max_concurrent=2, max_queue=4, queue_timeout=5, name='Synthesis')
+AUDIO_MAX_AGE = 365 * 24 * 3600  # audio for a key never changes
+
+# Write endpoints require `Authorization: Bearer <API_TOKEN>` when it is set;
+# speech synthesis (billed per character) is disabled without it
+API_TOKEN = os.getenv('API_TOKEN', '')
+
+def require_api_token(view):
+    """Decorator rejecting requests without the API token (when one is configured)"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if API_TOKEN:
+            header = request.headers.get('Authorization', '')
+            token = header[len('Bearer '):] if header.startswith('Bearer ') else request.headers.get('X-API-Token', '')
+            if not hmac.compare_digest(token.encode('utf-8'), API_TOKEN.encode('utf-8')):
+                return jsonify({"status": "error", "message": "Unauthorized"}), 401
+        return view(*args, **kwargs)
+    return wrapper
+
+# Bounded webhook ingestion; overload is answered with 429/503 + Retry-After
+ingestion = controller_from_env()
+
+# Analysis runs in worker processes fed by a durable queue once main() starts
+# them; until then (or with ANALYSIS_WORKERS=0) it runs inline
+ANALYSIS_WORKERS = int(os.getenv('ANALYSIS_WORKERS', str(os.cpu_count() or 1)))
+analysis_jobs = None
+analysis_pool = None
+
+PENDING_ANALYSIS = {
+    "score": 0,
+    "summary": "Analysis pending",
+    "strengths": [],
+    "weaknesses": [],
+    "recommendations": [],
+    "detailed_metrics": {},
+    "pending": True
+}
+
+# Per-request profiling (X-Profile header with PROFILE_TOKEN, or PROFILE_SAMPLE_RATE)
+@app.before_request
+def start_profile():
+    if not request.path.startswith('/api/debug/'):
+        request.environ['profile.session'] = profiler.begin(f"{request.method} {request.path}",
+                                                            request.headers.get('X-Profile'))
+
+@app.after_request
+def tag_profile(response):
+    session = request.environ.get('profile.session')
+    if session is not None:
+        session.status = response.status_code
+        response.headers['X-Profile-Id'] = session.id
+    return response
+
+@app.teardown_request
+def finish_profile(exc):
+    # Runs after streamed bodies are sent, so exports are profiled end to end
+    session = request.environ.pop('profile.session', None)
+    if session is not None:
+        profiler.finish(session)
+
+def ingest_priority(data):
+    """Final recording events outrank realtime transcription chunks"""
+    event = str(data.get('event') or '')
+    if event == 'transcription' or event.startswith('transcript.') or 'is_final' in data:
+        return PRIORITY_REALTIME
+    return PRIORITY_FINAL
 
 def load_interviews():
-    """Load interviews from file"""
-    global interviews_db
-    if DATA_FILE.exists():
-        try:
-            with open(DATA_FILE, 'r') as f:
-                interviews_db = json.load(f)
-        except:
-            interviews_db = []
+    """Open the interview snapshot (only its index is read)"""
+    with _db_lock:
+        interviews_db.load(legacy_json=DATA_FILE)
+        _reindex()
     return interviews_db
 
+def _reindex():
+    """Rebuild the id -> position lookups from the snapshot index"""
+    _positions.clear()
+    _bot_positions.clear()
+    for idx in range(len(interviews_db)):
+        interview_id, bot_id, _ = interviews_db.meta(idx)
+        _positions.setdefault(interview_id, idx)
+        if bot_id is not None:
+            _bot_positions.setdefault(bot_id, idx)
+
+def find_interview(interview_id, bot_id=None):
+    """Current record for an interview id (or bot id)"""
+    with _db_lock:
+        idx = _positions.get(interview_id)
+        if idx is None and bot_id is not None:
+            idx = _bot_positions.get(bot_id)
+        return interviews_db[idx] if idx is not None else None
+
+def _record_index(record):
+    """Position of this exact record object in interviews_db, or None"""
+    with _db_lock:
+        idx = _positions.get(record.get('id'))
+        if idx is not None:
+            current = interviews_db[idx]
+            # Archived records are read fresh each time, so compare by value too
+            if current is record or current == record:
+                return idx
+        return interviews_db.index_of(record)
+
+def publish_interview(record, previous=None):
+    """Store a new record, or replace `previous` with it
+
+    Callers hold the interview's lock in interview_locks, so records for one
+    interview are never published concurrently. Returns the stored record.
+    """
+    record = InterviewRecord.coerce(record)
+    with _db_lock:
+        idx = _record_index(previous) if previous is not None else None
+        if idx is None:
+            interviews_db.append(record)
+            idx = len(interviews_db) - 1
+        else:
+            interviews_db[idx] = record
+        _positions.setdefault(record['id'], idx)
+        if record.get('bot_id') is not None:
+            _bot_positions.setdefault(record['bot_id'], idx)
+        # Bumped only after the record is in place, so a reader seeing the new
+        # version can't cache the old body under it
+        _versions[record['id']] = _versions.get(record['id'], 0) + 1
+    response_cache.invalidate(record['id'])
+    analytics_rollups.update(record)
+    return record
+
+def rebuild_search_index():
+    """Rebuild the transcript search index from the loaded interviews"""
+    transcript_index.rebuild((inv['id'], inv.get('transcript', '')) for inv in interviews_db.iter_uncached())
+
+def rebuild_analytics():
+    """Rebuild the analytics rollups from the loaded interviews"""
+    analytics_rollups.rebuild(interviews_db.iter_uncached())
+
+def warm_up():
+    """Build derived indexes in the background so startup only waits for the snapshot index"""
+    def build():
+        started = datetime.now()
+        rebuild_search_index()
+        rebuild_analytics()
+        print(f"✅ Search index and analytics ready ({(datetime.now() - started).total_seconds():.1f}s)")
+    threading.Thread(target=build, daemon=True).start()
+
+def start_analysis_workers():
+    """Start the analysis worker processes and the thread applying their results"""
+    global analysis_jobs, analysis_pool
+    if ANALYSIS_WORKERS <= 0:
+        return
+    analysis_jobs = JobQueue(QUEUE_FILE)
+    analysis_pool = WorkerPool(QUEUE_FILE, ANALYSIS_WORKERS).start()
+    threading.Thread(target=_apply_finished_jobs, daemon=True).start()
+    print(f"⚙️  {ANALYSIS_WORKERS} analysis workers started")
+
+def queue_analysis(interview, audio_duration=None):
+    """Enqueue analysis of an interview's current transcript, replacing any queued one"""
+    return analysis_jobs.enqueue('analyze', interview['id'], {
+        "transcript": interview.get('transcript', ''),
+        "audio_duration": audio_duration,
+        "rubric": get_rubric()
+    })
+
+def _apply_finished_jobs():
+    """Write finished jobs back to their interviews, and failures as an error status"""
+    idle_poll = 0.05
+    while True:
+        finished = analysis_jobs.finished()
+        failed = analysis_jobs.failed()
+        if not finished and not failed:
+            time.sleep(idle_poll)
+            idle_poll = min(MAX_IDLE_POLL, idle_poll * 2)
+            continue
+        idle_poll = 0.05
+        handled = []
+        for job_id, kind, interview_id, result in finished:
+            try:
+                _apply_job_result(kind, interview_id, result)
+                handled.append(job_id)
+            except Exception as e:
+                # Picked up below as a failed job on the next pass
+                print(f"⚠️  Could not apply {kind} job {job_id}: {e}")
+                analysis_jobs.fail(job_id, f"apply failed: {e}", max_attempts=0)
+        for job_id, kind, interview_id, payload, error in failed:
+            try:
+                _record_job_failure(kind, interview_id, payload, error)
+            except Exception as e:
+                print(f"⚠️  Could not record failure of {kind} job {job_id}: {e}")
+            handled.append(job_id)
+        save_interviews()
+        analysis_jobs.ack(handled)
+
+def _record_job_failure(kind, interview_id, payload, error):
+    """Mark an interview whose analysis failed for good, so it doesn't stay pending"""
+    print(f"✗ {kind} job for {interview_id} failed: {error}")
+    if kind != 'analyze':
+        return  # enhancement is optional; the analysis stands on its own
+    with interview_locks.hold(interview_id):
+        current = find_interview(interview_id)
+        if current is None or not (current.get('analysis') or {}).get('pending'):
+            return
+        if 'transcript' in payload and transcript_hash(current.get('transcript', '')) != transcript_hash(payload['transcript']):
+            return  # The transcript has grown since; its own job is queued
+        analysis = {**current['analysis'], 'pending': False, 'error': error, 'summary': "Analysis failed"}
+        publish_interview({**current, 'analysis': analysis}, previous=current)
+
+def _apply_job_result(kind, interview_id, result):
+    with interview_locks.hold(interview_id):
+        current = find_interview(interview_id)
+        if current is None or transcript_hash(current.get('transcript', '')) != result['transcript_sha256']:
+            return  # The transcript has grown since; its own job is queued
+        if kind == 'analyze':
+            analysis = result['analysis']
+            if current.get('transcript'):
+                analysis = {**analysis, 'transcript': current['transcript']}
+            interview = publish_interview({**current, 'analysis': analysis}, previous=current)
+            print(f"✅ Analysis complete for {interview_id} - Score: {analysis['score']}/100")
+        elif result.get('n8n_enhanced'):
+            publish_interview({**current, 'n8n_enhanced': result['n8n_enhanced']}, previous=current)
+            return
+        else:
+            return
+    if N8N_AVAILABLE and n8n_backend_service:
+        analysis_jobs.enqueue('enhance', interview_id, interview.to_dict())
+
 def save_interviews():
-    """Save interviews to file"""
-    with open(DATA_FILE, 'w') as f:
-        json.dump(interviews_db, f, indent=2)
-
-def analyze_interview(transcript_text, audio_duration=None):
-    """Enhanced interview analysis with software developer focus"""
-    if not transcript_text:
-        return {
-            "score": 0,
-            "summary": "No transcript available",
-            "strengths": [],
-            "weaknesses": [],
-            "recommendations": [],
-            "detailed_metrics": {}
-        }
-    
-    text_lower = transcript_text.lower()
-    words = transcript_text.split()
-    word_count = len(words)
-    
-    # Enhanced technical keywords for software developers
-    programming_languages = ['python', 'javascript', 'java', 'c++', 'c#', 'go', 'rust', 'typescript', 
-                            'ruby', 'php', 'swift', 'kotlin', 'scala', 'dart', 'r', 'matlab']
-    
-    frameworks = ['react', 'angular', 'vue', 'django', 'flask', 'spring', 'express', 'node', 
-                 'laravel', 'rails', 'next', 'nuxt', 'nest', 'fastapi']
-    
-    technical_concepts = ['api', 'rest', 'graphql', 'microservices', 'docker', 'kubernetes', 
-                         'aws', 'azure', 'gcp', 'database', 'sql', 'nosql', 'mongodb', 
-                         'postgresql', 'redis', 'elasticsearch', 'git', 'ci/cd', 'devops',
-                         'agile', 'scrum', 'tdd', 'testing', 'unit test', 'integration test',
-                         'algorithm', 'data structure', 'big o', 'optimization', 'scalability',
-                         'security', 'authentication', 'authorization', 'oauth', 'jwt']
-    
-    soft_skills = ['team', 'collaboration', 'communication', 'leadership', 'mentor', 
-                   'code review', 'pair programming', 'scrum master', 'product owner']
-    
-    problem_solving = ['problem', 'solution', 'approach', 'challenge', 'solve', 'debug',
-                      'troubleshoot', 'optimize', 'refactor', 'architecture', 'design pattern']
-    
-    # Count keyword mentions
-    lang_score = sum(1 for lang in programming_languages if lang in text_lower)
-    framework_score = sum(1 for fw in frameworks if fw in text_lower)
-    tech_score = sum(1 for tech in technical_concepts if tech in text_lower)
-    soft_score = sum(1 for skill in soft_skills if skill in text_lower)
-    problem_score = sum(1 for ps in problem_solving if ps in text_lower)
-    
-    # Calculate detailed metrics
-    technical_depth = lang_score + framework_score + tech_score
-    communication_quality = soft_score + (word_count / 50)  # More words = better communication
-    problem_solving_ability = problem_score
-    
-    # Advanced scoring algorithm
-    technical_weight = 0.4
-    communication_weight = 0.3
-    problem_solving_weight = 0.2
-    engagement_weight = 0.1
-    
-    technical_ratio = min(1.0, technical_depth / 15)  # Normalize to 0-1
-    communication_ratio = min(1.0, communication_quality / 20)
-    problem_ratio = min(1.0, problem_solving_ability / 10)
-    engagement_ratio = min(1.0, word_count / 500)
-    
-    score = int((
-        technical_ratio * technical_weight +
-        communication_ratio * communication_weight +
-        problem_ratio * problem_solving_weight +
-        engagement_ratio * engagement_weight
-    ) * 100)
-    
-    # Generate detailed strengths
-    strengths = []
-    if lang_score >= 2:
-        strengths.append(f"Demonstrates knowledge of {lang_score} programming languages")
-    if framework_score >= 2:
-        strengths.append(f"Familiar with {framework_score} frameworks/libraries")
-    if tech_score >= 5:
-        strengths.append("Strong understanding of technical concepts and best practices")
-    if soft_score >= 3:
-        strengths.append("Good soft skills and team collaboration experience")
-    if problem_score >= 3:
-        strengths.append("Shows strong problem-solving and analytical thinking")
-    if word_count > 400:
-        strengths.append("Provides detailed and comprehensive answers")
-    if not strengths:
-        strengths.append("Participated actively in the interview")
-    
-    # Generate detailed weaknesses
-    weaknesses = []
-    if lang_score < 1:
-        weaknesses.append("Limited discussion of specific programming languages")
-    if framework_score < 1:
-        weaknesses.append("Could mention more frameworks and tools")
-    if tech_score < 3:
-        weaknesses.append("Needs deeper technical discussion")
-    if soft_score < 2:
-        weaknesses.append("Could emphasize more on teamwork and collaboration")
-    if problem_score < 2:
-        weaknesses.append("Limited demonstration of problem-solving process")
-    if word_count < 150:
-        weaknesses.append("Responses were too brief - provide more detail")
-    
-    # Generate actionable recommendations
-    recommendations = []
-    if technical_depth < 10:
-        recommendations.append("Prepare specific examples of projects using different technologies")
-        recommendations.append("Be ready to discuss system architecture and design decisions")
-    if communication_quality < 10:
-        recommendations.append("Practice explaining complex technical concepts in simple terms")
-        recommendations.append("Prepare STAR method examples (Situation, Task, Action, Result)")
-    if problem_score < 3:
-        recommendations.append("Prepare examples of challenging problems you've solved")
-        recommendations.append("Practice walking through your problem-solving process")
-    if word_count < 200:
-        recommendations.append("Provide more detailed answers with concrete examples")
-    if not recommendations:
-        recommendations.append("Continue building on current strengths")
-        recommendations.append("Consider contributing to open source projects")
-    
-    # Generate comprehensive summary
-    summary = f"Comprehensive interview analysis for Software Developer position. "
-    summary += f"Analyzed {word_count} words over {audio_duration or 'unknown'} duration. "
-    summary += f"Technical depth: {'Excellent' if technical_depth >= 15 else 'Good' if technical_depth >= 8 else 'Needs improvement'}. "
-    summary += f"Communication: {'Excellent' if communication_quality >= 15 else 'Good' if communication_quality >= 8 else 'Needs improvement'}. "
-    summary += f"Problem-solving: {'Strong' if problem_score >= 5 else 'Moderate' if problem_score >= 3 else 'Limited'}. "
-    summary += f"Overall performance score: {score}/100."
-    
-    return {
-        "score": score,
-        "summary": summary,
-        "metrics": {
-            "word_count": word_count,
-            "audio_duration": audio_duration,
-            "technical_depth": technical_depth,
-            "programming_languages_mentioned": lang_score,
-            "frameworks_mentioned": framework_score,
-            "technical_concepts": tech_score,
-            "soft_skills_demonstrated": soft_score,
-            "problem_solving_examples": problem_score
-        },
-        "detailed_metrics": {
-            "technical_ratio": round(technical_ratio, 2),
-            "communication_ratio": round(communication_ratio, 2),
-            "problem_solving_ratio": round(problem_ratio, 2),
-            "engagement_ratio": round(engagement_ratio, 2)
-        },
-        "strengths": strengths,
-        "weaknesses": weaknesses,
-        "recommendations": recommendations,
-        "transcript": transcript_text
-    }
+    """Save changed interviews to the snapshot
+
+    Concurrent saves are coalesced by the store, and only records changed
+    since the last save are written.
+    """
+    interviews_db.flush()
 
 @app.route('/')
 def index():
@@ -217,6 +338,7 @@ def dashboard():
     return send_from_directory('.', 'dashboard.html')
 
 @app.route('/api/webhook/recall', methods=['POST'])
+@ingestion.guard(ingest_priority)
 def recall_webhook():
     """Webhook endpoint for Recall.ai to send interview data"""
     try:
@@ -296,59 +418,85 @@ def recall_webhook():
             print("⚠️  No transcript or audio data, skipping analysis")
             return jsonify({"status": "received", "message": "No transcript data yet"}), 200
         
-        # Analyze the interview
-        print("🔍 Analyzing interview...")
-        analysis = analyze_interview(transcript_text, audio_duration)
-        print(f"✅ Analysis complete - Score: {analysis['score']}/100")
-        
-        # Create or update interview record
+        # Create or update interview record; it's analyzed once its full
+        # transcript is known (inline, or by the analysis workers)
         interview_id = bot_id or f"interview_{datetime.now().timestamp()}"
         
-        # Check if interview already exists
-        existing_interview = None
-        for idx, inv in enumerate(interviews_db):
-            if inv.get('id') == interview_id or inv.get('bot_id') == bot_id:
-                existing_interview = idx
-                break
-        
-        if existing_interview is not None:
-            # Update existing interview
-            interview = interviews_db[existing_interview]
-            # Append new transcript to existing
+        with interview_locks.hold(interview_id):
+            existing = find_interview(interview_id, bot_id)
+            
+            if existing is not None:
+                # Update existing interview
+                interview = dict(existing)
+                # Append new transcript to existing
+                if transcript_text:
+                    existing_transcript = interview.get('transcript', '')
+                    interview['transcript'] = existing_transcript + " " + transcript_text if existing_transcript else transcript_text
+                # Update analysis with combined data
+                if analysis_jobs is None:
+                    print("🔍 Analyzing interview...")
+                    interview['analysis'] = analyze_interview(interview['transcript'], audio_duration or interview.get('audio_duration'))
+                else:
+                    interview['analysis'] = {**(existing.get('analysis') or PENDING_ANALYSIS), 'pending': True}
+                interview['last_updated'] = datetime.now().isoformat()
+                raw_data = existing.get('raw_data') or []
+                interview['raw_data'] = (raw_data if isinstance(raw_data, list) else [raw_data]) + [data]  # Append new data
+                interview = publish_interview(interview, previous=existing)
+                print(f"📝 Updated existing interview: {interview_id}")
+            else:
+                # Create new interview record
+                analysis = None
+                if analysis_jobs is None:
+                    print("🔍 Analyzing interview...")
+                    analysis = analyze_interview(transcript_text, audio_duration)
+                interview = {
+                    "id": interview_id,
+                    "bot_id": bot_id,
+                    "timestamp": datetime.now().isoformat(),
+                    "meeting_url": meeting_url,
+                    "transcript": transcript_text,
+                    "analysis": analysis or PENDING_ANALYSIS,
+                    "raw_data": [data],
+                    "audio_duration": audio_duration
+                }
+                interview = publish_interview(interview)
+                print(f"✨ Created new interview: {interview_id}")
+            if analysis_jobs is None:
+                print(f"✅ Analysis complete - Score: {interview['analysis']['score']}/100")
+            
+            # Index only the newly received chunk; cached n8n results are now outdated
             if transcript_text:
-                existing_transcript = interview.get('transcript', '')
-                interview['transcript'] = existing_transcript + " " + transcript_text if existing_transcript else transcript_text
-            # Update analysis with combined data
-            interview['analysis'] = analyze_interview(interview['transcript'], audio_duration or interview.get('audio_duration'))
-            interview['last_updated'] = datetime.now().isoformat()
-            interview['raw_data'].append(data)  # Append new data
-            print(f"📝 Updated existing interview: {interview_id}")
-        else:
-            # Create new interview record
-            interview = {
-                "id": interview_id,
-                "bot_id": bot_id,
-                "timestamp": datetime.now().isoformat(),
-                "meeting_url": meeting_url,
-                "transcript": transcript_text,
-                "analysis": analysis,
-                "raw_data": [data],
-                "audio_duration": audio_duration
-            }
-            interviews_db.append(interview)
-            print(f"✨ Created new interview: {interview_id}")
+                transcript_index.add_text(interview['id'], transcript_text)
+                n8n_result_cache.invalidate(interview['id'])
         
         # Save to database
         save_interviews()
-        print(f"💾 Saved interview data to {DATA_FILE}")
+        print(f"💾 Saved interview data to {SNAPSHOT_FILE}")
+        
+        if analysis_jobs is not None:
+            # Workers analyze it, then hand it to the n8n backend
+            job_id = queue_analysis(interview, audio_duration or interview.get('audio_duration'))
+            print(f"⚙️  Queued analysis job {job_id}")
+            print(f"{'='*60}\n")
+            return jsonify({
+                "status": "success",
+                "interview_id": interview["id"],
+                "transcript_length": len(transcript_text),
+                "score": interview['analysis'].get('score'),
+                "analysis_job": job_id,
+                "message": "Interview data stored, analysis queued"
+            }), 200
         
         # Forward to n8n backend for enhanced processing
         if N8N_AVAILABLE and n8n_backend_service:
             try:
                 print("🔄 Processing via n8n backend...")
-                enhanced_result = n8n_backend_service.process_interview_data(interview)
+                enhanced_result = n8n_backend_service.process_interview_data(interview.to_dict())
                 if enhanced_result and enhanced_result.get('n8n_enhanced'):
-                    interview['n8n_enhanced'] = enhanced_result.get('n8n_enhanced')
+                    with interview_locks.hold(interview_id):
+                        current = find_interview(interview['id']) or interview
+                        interview = publish_interview(
+                            {**current, 'n8n_enhanced': enhanced_result.get('n8n_enhanced')}, previous=current)
                     save_interviews()
                     print("✅ n8n backend processing complete")
             except Exception as e:
@@ -357,7 +505,7 @@ def recall_webhook():
         # Also try local n8n webhook
         n8n_url = os.getenv('N8N_WEBHOOK_URL', 'http://localhost:5678/webhook/interview-webhook')
         try:
-            requests.post(n8n_url, json=interview, timeout=2)
+            circuit_breaker.post(n8n_url, json=interview.to_dict(), timeout=2)
         except:
             pass  # n8n not available, continue anyway
         
@@ -367,7 +515,7 @@ def recall_webhook():
             "status": "success",
             "interview_id": interview["id"],
             "transcript_length": len(transcript_text),
-            "score": analysis['score'],
+            "score": interview['analysis']['score'],
             "message": "Interview data processed and analyzed"
         }), 200
         
@@ -376,6 +524,7 @@ def recall_webhook():
         return jsonify({"status": "error", "message": str(e)}), 500
 
 @app.route('/api/webhook/n8n', methods=['POST'])
+@ingestion.guard(lambda data: PRIORITY_FINAL)
 def n8n_webhook():
     """Webhook endpoint for n8n to send processed interview data"""
     try:
@@ -386,8 +535,8 @@ def n8n_webhook():
         transcript_text = interview_data.get('transcript', '')
         audio_duration = interview_data.get('duration')
         
-        # Analyze the interview
-        analysis = analyze_interview(transcript_text, audio_duration)
+        # Analyze the interview, or leave it to the analysis workers
+        analysis = analyze_interview(transcript_text, audio_duration) if analysis_jobs is None else PENDING_ANALYSIS
         
         # Create interview record
         interview = {
@@ -401,56 +550,395 @@ def n8n_webhook():
         }
         
         # Save to database
-        interviews_db.append(interview)
+        with interview_locks.hold(interview['id']):
+            publish_interview(interview)
+            transcript_index.set_text(interview['id'], transcript_text)
+            n8n_result_cache.invalidate(interview['id'])
         save_interviews()
         
-        return jsonify({
+        response = {
             "status": "success",
             "interview_id": interview["id"],
             "analysis": analysis
-        }), 200
+        }
+        if analysis_jobs is not None:
+            response["analysis_job"] = queue_analysis(interview, audio_duration)
+        return jsonify(response), 200
         
     except Exception as e:
         print(f"n8n webhook error: {e}")
         return jsonify({"status": "error", "message": str(e)}), 500
 
+@app.route('/api/reanalyze', methods=['POST'])
+@require_api_token
+def reanalyze():
+    """Re-score stored interviews with the current rubric, streaming progress as NDJSON"""
+    options = request.get_json(silent=True) or {}
+    try:
+        # Checked before streaming starts, so bad input is a 400 rather than a broken stream
+        since = parse_time_filter(options.get('since'), 'since')
+        until = parse_time_filter(options.get('until'), 'until')
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+
+    def apply_reanalysis(interview, analysis, reanalyzed_at):
+        with interview_locks.hold(interview['id']):
+            current = interview if _record_index(interview) is not None else find_interview(interview['id'])
+            if current is None or current.get('transcript') != interview.get('transcript'):
+                return False  # Transcript changed meanwhile; this analysis is already outdated
+            publish_interview({**current, 'analysis': analysis, 'last_reanalyzed': reanalyzed_at},
+                              previous=current)
+            return True
+
+    def generate():
+        try:
+            with _db_lock:
+                snapshot = list(interviews_db)
+            for progress in reanalyze_interviews(
+                snapshot,
+                workers=options.get('workers'),
+                batch_size=options.get('batch_size') or DEFAULT_BATCH_SIZE,
+                apply=apply_reanalysis,
+                on_batch=lambda batch: save_interviews(),
+                ids=options.get('ids'),
+                since=since,
+                until=until,
+                processed_by=options.get('processed_by'),
+                stale_only=options.get('stale_only', False)
+            ):
+                yield json.dumps(progress) + "\n"
+        except Exception as e:
+            print(f"Re-analysis error: {e}")
+            yield json.dumps({"error": str(e)}) + "\n"
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+@app.route('/api/import', methods=['POST'])
+@require_api_token
+def import_interviews():
+    """Bulk import interviews from an NDJSON body, streaming progress as NDJSON
+
+    Query: workers, batch_size, replace=1 (overwrite existing ids), enrich=1 (queue n8n enrichment)
+    """
+    replace = request.args.get('replace', '').lower() in ('1', 'true')
+    enrich = request.args.get('enrich', '').lower() in ('1', 'true')
+    workers = request.args.get('workers', type=int)
+    batch_size = request.args.get('batch_size', type=int) or IMPORT_BATCH_SIZE
+
+    def publish(record):
+        with interview_locks.hold(record['id']):
+            stored = publish_interview(record, previous=find_interview(record['id']))
+            transcript_index.set_text(record['id'], record['transcript'])
+            n8n_result_cache.invalidate(record['id'])
+        return stored
+
+    def enqueue_enrichment(record):
+        if analysis_jobs is None or not (N8N_AVAILABLE and n8n_backend_service):
+            return False
+        analysis_jobs.enqueue('enhance', record['id'], record.to_dict())
+        return True
+
+    def exists(interview_id):
+        with _db_lock:
+            return interview_id in _positions
+
+    def generate():
+        try:
+            items = iter_ndjson(iter_stream_lines(request.stream))
+            for progress in bulk_import(items, publish, save_interviews, exists=exists, workers=workers,
+                                        batch_size=batch_size, replace=replace,
+                                        enqueue_enrichment=enqueue_enrichment if enrich else None):
+                yield json.dumps(progress) + "\n"
+        except Exception as e:
+            print(f"Import error: {e}")
+            yield json.dumps({"error": str(e)}) + "\n"
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+@app.route('/api/rubric', methods=['GET'])
+def rubric():
+    """Get the scoring rubric currently in use"""
+    return jsonify({"rubric": get_rubric(), "analysis_cache": analysis_cache_info()})
+
+@app.route('/api/rubric/reload', methods=['POST'])
+@require_api_token
+def reload_rubric():
+    """Reload the scoring rubric from RUBRIC_FILE"""
+    try:
+        set_rubric(load_rubric())
+    except Exception as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+    return jsonify({"status": "success", "version": get_rubric()['version']})
+
 @app.route('/api/interviews', methods=['GET'])
 def get_interviews():
-    """Get all interviews"""
-    load_interviews()
-    return jsonify(interviews_db)
+    """Get interviews as a JSON array, streamed one record at a time
+
+    Query: offset, limit (page through the list). X-Total-Count carries the number of interviews.
+    """
+    offset = request.args.get('offset', 0, type=int)
+    limit = request.args.get('limit', type=int)
+    if offset < 0 or (limit is not None and limit < 0):
+        return jsonify({"error": "offset and limit must be non-negative integers"}), 400
+    with _db_lock:
+        total = len(interviews_db)
+    end = total if limit is None else min(total, offset + limit)
+
+    def generate():
+        # Archived records are read and dropped one at a time, never all held at once
+        yield "["
+        for i, record in enumerate(interviews_db.iter_uncached(range(offset, end))):
+            yield ("," if i else "") + json.dumps(record.to_dict(), default=str)
+        yield "]"
+
+    return Response(stream_with_context(generate()), mimetype='application/json',
+                    headers={"X-Total-Count": str(total)})
+
+@app.route('/api/interviews/export', methods=['GET'])
+def export_interviews():
+    """Stream interviews as NDJSON or CSV, one record at a time
+
+    Query: format=ndjson|csv, fields=id,analysis.score,..., since/until (ISO timestamps)
+    """
+    fmt = request.args.get('format', 'ndjson')
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({"error": "format must be 'ndjson' or 'csv'"}), 400
+    try:
+        records = iter_export(interviews_db, request.args.get('since'), request.args.get('until'))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    lines = export_lines(records, fmt, parse_fields(request.args.get('fields')))
+    filename = f"interviews_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{fmt}"
+    return Response(stream_with_context(lines),
+                    mimetype='text/csv' if fmt == 'csv' else 'application/x-ndjson',
+                    headers={"Content-Disposition": f"attachment; filename={filename}"})
+
+def _cached_interview_response(key, load):
+    """JSON response for an interview read, from response_cache when the record hasn't changed
+
+    key is (kind, interview_id, version); load() returns the record on a miss.
+    """
+    body = response_cache.get(key)
+    if body is None:
+        interview = load()
+        if interview is None:
+            return None
+        body = jsonify(interview.to_dict()).get_data()
+        response_cache.put(key, body)
+    return Response(body, mimetype='application/json')
 
 @app.route('/api/interviews/<interview_id>', methods=['GET'])
 def get_interview(interview_id):
     """Get specific interview by ID"""
-    load_interviews()
-    interview = next((i for i in interviews_db if i['id'] == interview_id), None)
-    if interview:
-        return jsonify(interview)
+    key = ('interview', interview_id, _versions.get(interview_id, 0))
+    response = _cached_interview_response(key, lambda: find_interview(interview_id))
+    if response is not None:
+        return response
     return jsonify({"error": "Interview not found"}), 404
 
+@app.route('/api/interviews/<interview_id>/report', methods=['GET'])
+def get_interview_report(interview_id):
+    """Comprehensive report from n8n, cached until the transcript changes"""
+    return _n8n_result(interview_id, lambda interview: n8n_reports.generate_report(
+        interview_id, interview.get('transcript', '')))
+
+@app.route('/api/interviews/<interview_id>/enhanced-analysis', methods=['GET'])
+def get_enhanced_analysis(interview_id):
+    """Enhanced analysis from n8n, cached until the transcript changes"""
+    return _n8n_result(interview_id, lambda interview: n8n_reports.enhance_analysis(
+        interview_id, interview.get('transcript', '')))
+
+def _n8n_result(interview_id, fetch):
+    interview = find_interview(interview_id)
+    if not interview:
+        return jsonify({"error": "Interview not found"}), 404
+    if not (n8n_reports and n8n_reports.mcp_url and n8n_reports.jwt):
+        return jsonify({"error": "n8n MCP is not configured"}), 503
+    result = fetch(interview)
+    if result is None:
+        return jsonify({"error": "n8n MCP request failed"}), 502
+    return jsonify(result)
+
 @app.route('/api/interviews/latest', methods=['GET'])
 def get_latest_interview():
     """Get the most recent interview"""
-    load_interviews()
-    if interviews_db:
-        return jsonify(interviews_db[-1])
+    with _db_lock:
+        idx = len(interviews_db) - 1
+        interview_id = interviews_db.meta(idx)[0] if idx >= 0 else None
+    if interview_id is not None:
+        key = ('latest', interview_id, idx, _versions.get(interview_id, 0))
+        return _cached_interview_response(key, lambda: interviews_db[idx])
     return jsonify({"error": "No interviews found"}), 404
 
+@app.route('/api/search', methods=['GET'])
+def search_interviews():
+    """Full-text search over transcripts
+
+    Supports implicit AND, OR, NOT/-term, "exact phrases" and parentheses,
+    e.g. /api/search?q=kubernetes oauth -java
+    """
+    query = request.args.get('q', '')
+    limit = request.args.get('limit', 20, type=int)
+    started = datetime.now()
+    try:
+        hits, total = transcript_index.search(query, limit=limit)
+    except QuerySyntaxError as e:
+        return jsonify({"error": str(e)}), 400
+    
+    results = []
+    for interview_id, relevance, terms in hits:
+        interview = find_interview(interview_id)
+        if not interview:
+            continue
+        snippet, highlights = make_snippet(interview.get('transcript', ''), terms)
+        results.append({
+            "interview_id": interview_id,
+            "relevance": relevance,
+            "timestamp": interview.get('timestamp'),
+            "score": interview.get('analysis', {}).get('score'),
+            "snippet": snippet,
+            "highlights": highlights
+        })
+    
+    return jsonify({
+        "query": query,
+        "total": total,
+        "results": results,
+        "took_ms": round((datetime.now() - started).total_seconds() * 1000, 2)
+    })
+
+@app.route('/api/analytics', methods=['GET'])
+def get_analytics():
+    """Aggregate interview statistics, served from incrementally updated rollups"""
+    granularity = request.args.get('granularity', 'day')
+    if granularity not in ('day', 'week'):
+        return jsonify({"error": "granularity must be 'day' or 'week'"}), 400
+    return jsonify(analytics_rollups.snapshot(granularity))
+
+@app.route('/api/tts', methods=['POST'])
+@require_api_token
+@synthesis.guard(lambda data: PRIORITY_FINAL)
+def synthesize():
+    """Register a prompt and synthesize it: POST {"text", "voice_id", "model_id"} -> {"key", "url"}"""
+    if not API_TOKEN:
+        return jsonify({"error": "Speech synthesis is disabled; set API_TOKEN to enable it"}), 403
+    params = request.get_json(silent=True) or {}
+    try:
+        key = audio_store.register(params.get('text'), params.get('voice_id') or DEFAULT_VOICE_ID,
+                                   params.get('model_id') or DEFAULT_MODEL_ID)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except StoreFull as e:
+        return jsonify({"error": str(e)}), 507
+    if audio_store.get(key) is None:
+        return jsonify({"error": "Speech synthesis failed", "key": key}), 502
+    return jsonify({"key": key, "url": f"/api/tts/{key}.mp3"})
+
+@app.route('/api/tts', methods=['GET'])
+def tts():
+    """Redirect ?text=...&voice_id=...&model_id=... to its audio (usable as an <audio> src)
+
+    Only serves prompts already synthesized through POST; never registers or synthesizes.
+    """
+    text = request.args.get('text')
+    try:
+        check_text(text)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    key = audio_key(text, request.args.get('voice_id') or DEFAULT_VOICE_ID,
+                    request.args.get('model_id') or DEFAULT_MODEL_ID)
+    if not audio_store.exists(key):
+        return jsonify({"error": "Audio not found"}), 404
+    return redirect(f"/api/tts/{key}.mp3", code=303)
+
+@app.route('/api/tts/<key>.mp3', methods=['GET'])
+def tts_audio(key):
+    """Serve synthesized audio, with Range and caching support"""
+    path = audio_store.cached(key) if is_valid_key(key) else None
+    if path is None:
+        return jsonify({"error": "Audio not found"}), 404
+    response = send_file(path, mimetype='audio/mpeg', conditional=True, etag=key, max_age=AUDIO_MAX_AGE)
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
+
+def _profiles_authorized():
+    return profiler.authorized(request.headers.get('X-Profile-Token') or request.headers.get('X-Profile'))
+
+@app.route('/api/debug/profiles', methods=['GET'])
+def list_profiles():
+    """Stored request profiles (requires PROFILE_TOKEN)"""
+    if not _profiles_authorized():
+        return jsonify({"status": "error", "message": "Not found"}), 404
+    return jsonify({"profiler": profiler.stats(), "profiles": profiler.list()})
+
+@app.route('/api/debug/profiles/<profile_id>', methods=['GET'])
+def get_profile(profile_id):
+    """One profile's summary, or its pstats file with ?format=pstats"""
+    if not _profiles_authorized():
+        return jsonify({"status": "error", "message": "Not found"}), 404
+    if request.args.get('format') == 'pstats':
+        path = profiler.stats_path(profile_id)
+        if path is None:
+            return jsonify({"status": "error", "message": "Profile not found"}), 404
+        return send_file(path, mimetype='application/octet-stream', as_attachment=True,
+                         download_name=path.name)
+    summary = profiler.summary(profile_id)
+    if summary is None:
+        return jsonify({"status": "error", "message": "Profile not found"}), 404
+    return jsonify(summary)
+
 @app.route('/api/health', methods=['GET'])
 def health():
     """Health check endpoint"""
-    return jsonify({"status": "healthy", "interviews_count": len(interviews_db)})
+    return jsonify({
+        "status": "healthy",
+        "interviews_count": len(interviews_db),
+        "ingestion": ingestion.stats(),
+        "storage": {**interviews_db.stats(), "last_archive": archiver.last_run},
+        "n8n_cache": n8n_result_cache.stats(),
+        "response_cache": response_cache.stats(),
+        "circuits": circuit_breaker.breaker_stats(),
+        "rate_limits": rate_limiter.limiter_stats(),
+        "tts_audio": {**audio_store.stats(), "admission": synthesis.stats()},
+        "profiler": profiler.stats(),
+        "analysis_jobs": {**analysis_jobs.stats(), "workers": analysis_pool.alive()} if analysis_jobs else None
+    })
 
 if __name__ == '__main__':
+    debug = os.getenv('API_DEBUG', '1') == '1'
+    port = int(os.getenv('PORT', '5000'))
+    # The debug reloader also runs this block in its watcher process; only
+    # the process serving requests may write to the store
+    serving = not debug or os.environ.get('WERKZEUG_RUN_MAIN') == 'true'
+    data_dir_lock = DataDirLock(DATA_DIR)
+    if serving and not data_dir_lock.acquire():
+        print(f"✗ {DATA_DIR} is in use by another API server or an offline re-analysis/import")
+        raise SystemExit(1)
     load_interviews()
+    warm_up()
+    if serving:
+        archiver.start()
+        start_analysis_workers()
+    if not API_TOKEN:
+        print("⚠️  API_TOKEN not set: write endpoints are unauthenticated and speech synthesis is disabled")
     print(f"\n{'='*60}")
-    print("API Server starting on http://localhost:5000")
+    print(f"API Server starting on http://localhost:{port}")
     print("Endpoints:")
     print("  - GET  /api/interviews - List all interviews")
     print("  - GET  /api/interviews/latest - Get latest interview")
+    print("  - GET  /api/interviews/export - Stream interviews as NDJSON/CSV")
+    print("  - GET  /api/interviews/<id>/report - n8n report (cached)")
+    print("  - GET  /api/search?q=... - Search transcripts")
+    print("  - GET  /api/analytics - Aggregate interview statistics")
     print("  - POST /api/webhook/recall - Recall.ai webhook")
+    print("  - POST /api/reanalyze - Re-score stored interviews")
+    print("  - POST /api/import - Bulk import interviews (NDJSON)")
+    print("  - POST /api/tts - Synthesize speech (API_TOKEN)")
+    print("  - GET  /api/tts/<key>.mp3 - Synthesized speech")
+    print("  - GET  /api/debug/profiles - Request profiles (PROFILE_TOKEN)")
+    print("  - POST /api/rubric/reload - Reload scoring rubric")
     print("  - GET  /dashboard - Interview dashboard")
     print(f"{'='*60}\n")
-    app.run(host='0.0.0.0', port=5000, debug=True)
+    app.run(host='0.0.0.0', port=port, debug=debug)
 
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+On-disk store for synthesized speech
+Audio is keyed by a hash of (voice, model, text), so a prompt is
+synthesized once and then served as a plain file: api_server sends it
+with send_file (Range requests, ETag, long-lived caching) and players
+never cost more than a sendfile.
+
+Prompts are bounded (TTS_MAX_TEXT_LENGTH characters each, at most
+AUDIO_STORE_MAX_ENTRIES of them). When the store is full, the least
+recently used tenth of it is evicted to make room.
+
+Usage:
+  python3 audio_store.py "Hi, I'm Sarah. Tell me about yourself."   # synthesize and print the key
+  python3 audio_store.py --stats
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from elevenlabs_integration import synthesize_speech
+from interview_locks import KeyedLocks
+
+AUDIO_STORE_DIR = Path(os.getenv('AUDIO_STORE_DIR') or Path(__file__).parent / "audio_cache")
+DEFAULT_VOICE_ID = "21m00Tcm4TlvDq8ikWAM"
+DEFAULT_MODEL_ID = "eleven_monolingual_v1"
+MAX_TEXT_LENGTH = int(os.getenv('TTS_MAX_TEXT_LENGTH') or 1000)
+MAX_ENTRIES = int(os.getenv('AUDIO_STORE_MAX_ENTRIES') or 5000)
+TOUCH_INTERVAL = 3600  # an entry's last-use time (its prompt file's mtime) is refreshed at most this often
+
+KEY_PATTERN = re.compile(r'^[0-9a-f]{64}$')
+
+def audio_key(text, voice_id=DEFAULT_VOICE_ID, model_id=DEFAULT_MODEL_ID):
+    """Content key for a prompt: same text, voice and model give the same audio"""
+    spec = json.dumps([voice_id, model_id, text], ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(spec.encode('utf-8')).hexdigest()
+
+def is_valid_key(key):
+    return bool(KEY_PATTERN.match(key or ''))
+
+def check_text(text):
+    """Raise ValueError unless text is a prompt the store accepts"""
+    if not isinstance(text, str) or not text or len(text) > MAX_TEXT_LENGTH:
+        raise ValueError(f"text must be 1-{MAX_TEXT_LENGTH} characters")
+
+class StoreFull(Exception):
+    """The store is full and nothing could be evicted"""
+
+class AudioStore:
+    """Synthesized audio files under root/<2 hex>/<key>.mp3, with the prompt in <key>.json"""
+
+    def __init__(self, root=AUDIO_STORE_DIR, synthesize=synthesize_speech, max_entries=MAX_ENTRIES):
+        self.root = Path(root)
+        self.synthesize = synthesize
+        self.max_entries = max_entries
+        self._entries = None  # registered prompts, counted on first register
+        self._entries_lock = threading.Lock()
+        self._locks = KeyedLocks()
+        self._stats = {"hits": 0, "synthesized": 0, "failed": 0, "evicted": 0}
+        self._stats_lock = threading.Lock()
+
+    def _count(self, stat):
+        with self._stats_lock:
+            self._stats[stat] += 1
+
+    def _path(self, key, suffix):
+        if not is_valid_key(key):
+            raise ValueError(f"Invalid audio key '{key}'")
+        return self.root / key[:2] / f"{key}{suffix}"
+
+    def audio_path(self, key):
+        return self._path(key, '.mp3')
+
+    def _write(self, path, data):
+        # Write next to the target and rename, so readers never see a partial file
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def register(self, text, voice_id=DEFAULT_VOICE_ID, model_id=DEFAULT_MODEL_ID):
+        """Remember a prompt so its key can be synthesized; returns the key
+
+        Evicts the least recently used entries when max_entries are stored. Raises
+        ValueError for an invalid prompt and StoreFull if nothing could be evicted.
+        """
+        check_text(text)
+        key = audio_key(text, voice_id, model_id)
+        spec_path = self._path(key, '.json')
+        try:
+            os.utime(spec_path)  # in use again, so evicted last
+            return key
+        except FileNotFoundError:
+            pass
+        with self._entries_lock:
+            if self._entries is None:
+                self._entries = len(list(self.root.glob('*/*.json'))) if self.root.exists() else 0
+            if self._entries >= self.max_entries:
+                self._entries -= self._evict(max(1, self.max_entries // 10))
+                if self._entries >= self.max_entries:
+                    raise StoreFull(f"Audio store is full ({self.max_entries} prompts)")
+            if not spec_path.exists():
+                spec = {"text": text, "voice_id": voice_id, "model_id": model_id}
+                self._write(spec_path, json.dumps(spec, ensure_ascii=False).encode('utf-8'))
+                self._entries += 1
+        return key
+
+    def prompt(self, key):
+        """The registered prompt for a key, or None"""
+        try:
+            return json.loads(self._path(key, '.json').read_text(encoding='utf-8'))
+        except FileNotFoundError:
+            return None
+
+    def _evict(self, count):
+        """Delete up to count least recently used entries not being synthesized; returns how many"""
+        entries = []
+        for spec_path in self.root.glob('*/*.json'):
+            try:
+                entries.append((spec_path.stat().st_mtime, spec_path))
+            except FileNotFoundError:
+                pass  # evicted by another process
+        evicted = 0
+        for _, spec_path in sorted(entries):
+            if evicted >= count:
+                break
+            if self._locks.busy(spec_path.stem):
+                continue
+            spec_path.with_suffix('.mp3').unlink(missing_ok=True)
+            spec_path.unlink(missing_ok=True)
+            evicted += 1
+        if evicted:
+            with self._stats_lock:
+                self._stats['evicted'] += evicted
+            print(f"🧹 Evicted {evicted} least recently used audio entries")
+        return evicted
+
+    def _touch(self, key):
+        spec_path = self._path(key, '.json')
+        try:
+            if time.time() - spec_path.stat().st_mtime > TOUCH_INTERVAL:
+                os.utime(spec_path)
+        except FileNotFoundError:
+            pass
+
+    def exists(self, key):
+        """Whether the audio for key has been synthesized"""
+        return self.audio_path(key).exists()
+
+    def cached(self, key):
+        """Path of the audio for key if it has been synthesized, else None (never synthesizes)
+
+        Counts as a hit and as a use of the entry for eviction.
+        """
+        path = self.audio_path(key)
+        if not path.exists():
+            return None
+        self._count('hits')
+        self._touch(key)
+        return path
+
+    def get(self, key):
+        """Path of the audio for key, synthesizing it first if needed; None if unknown or synthesis failed
+
+        Concurrent misses for one key synthesize it only once.
+        """
+        path = self.audio_path(key)
+        if path.exists():
+            self._count('hits')
+            return path
+        with self._locks.hold(key):
+            if path.exists():
+                self._count('hits')
+                return path
+            spec = self.prompt(key)
+            if spec is None:
+                return None
+            audio = self.synthesize(spec['text'], voice_id=spec['voice_id'], model_id=spec['model_id'])
+            if not audio:
+                self._count('failed')
+                return None
+            self._write(path, audio)
+            self._count('synthesized')
+            print(f"🔊 Synthesized audio {key[:12]} ({len(audio)} bytes)")
+            return path
+
+    def stats(self):
+        with self._stats_lock:
+            return dict(self._stats)
+
+    def disk_usage(self):
+        """Number and total size of stored audio files (walks the store)"""
+        files = list(self.root.glob('*/*.mp3')) if self.root.exists() else []
+        return {"files": len(files), "bytes": sum(f.stat().st_size for f in files),
+                "max_entries": self.max_entries}
+
+def main():
+    parser = argparse.ArgumentParser(description="Synthesized speech store")
+    parser.add_argument('text', nargs='?', help="Prompt to synthesize")
+    parser.add_argument('--voice-id', default=DEFAULT_VOICE_ID)
+    parser.add_argument('--model-id', default=DEFAULT_MODEL_ID)
+    parser.add_argument('--stats', action='store_true', help="Print store statistics and exit")
+    args = parser.parse_args()
+
+    store = AudioStore()
+    if args.stats or not args.text:
+        print(json.dumps({**store.stats(), **store.disk_usage()}, indent=2))
+        return
+    try:
+        key = store.register(args.text, args.voice_id, args.model_id)
+    except (ValueError, StoreFull) as e:
+        print(f"✗ {e}")
+        sys.exit(1)
+    path = store.get(key)
+    if path is None:
+        print("✗ Speech synthesis failed")
+        sys.exit(1)
+    print(f"✓ {key} → {path}")
+
+if __name__ == '__main__':
+    main()
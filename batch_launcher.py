@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Batch launcher for interview days
+Reads a schedule of meetings and creates Recall.ai bots concurrently with a
+bounded worker pool, retries and a status report. Bot creation draws from
+the shared Recall.ai rate limit (RATE_LIMIT_RECALL in rate_limiter.py),
+which also retries 429 responses.
+
+Set RECALL_API_BASE_URL to run against a local Recall.ai stand-in.
+"""
+import argparse
+import csv
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
+import requests
+
+from interview_bot import create_interview_bot
+from join_meeting_now import create_immediate_join_bot
+from rate_limiter import quota_for, retry_after_seconds
+
+DEFAULT_WEBHOOK_URL = os.getenv("WEBHOOK_URL", "http://localhost:5000/api/webhook/recall")
+# 429s are retried (and the quota paused) by the shared rate limiter, not here
+RETRYABLE_STATUS = {500, 502, 503, 504}
+
+def parse_join_at(value):
+    """A join_at value as an aware UTC datetime; naive timestamps are taken as local time
+
+    Raises ValueError for anything that isn't an ISO 8601 timestamp.
+    """
+    if isinstance(value, datetime):
+        when = value
+    else:
+        try:
+            when = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+        except ValueError:
+            raise ValueError(f"join_at must be an ISO 8601 timestamp, got {value!r}") from None
+    return when.astimezone(timezone.utc)
+
+def load_schedule(path):
+    """Load meetings from a JSON list or a CSV file with a meeting_url column
+
+    Optional per-meeting fields: webhook_url, camera_url, ngrok_url, join_at
+    (ISO timestamp to launch at) and mode ("interview" or "immediate").
+    join_at is parsed here, so a bad value fails before any bot is created.
+    """
+    path = Path(path)
+    with open(path, 'r', newline='') as f:
+        if path.suffix.lower() == '.csv':
+            meetings = [{k: v for k, v in row.items() if v} for row in csv.DictReader(f)]
+        else:
+            meetings = json.load(f)
+            meetings = meetings.get('meetings', []) if isinstance(meetings, dict) else meetings
+    for meeting in meetings:
+        if not meeting.get('meeting_url'):
+            raise ValueError(f"Schedule entry without meeting_url: {meeting}")
+        if meeting.get('join_at'):
+            meeting['join_at'] = parse_join_at(meeting['join_at'])
+    return meetings
+
+def _retry_delay(attempt, response=None, base=1.0, cap=30.0):
+    """Backoff before the next attempt, honoring Retry-After when given"""
+    retry_after = retry_after_seconds(response)
+    if retry_after is not None:
+        return min(cap, retry_after)
+    return min(cap, base * (2 ** attempt)) * random.uniform(0.5, 1.0)
+
+def launch_bot(meeting, default_mode='interview', max_retries=3):
+    """Create one bot, retrying transient failures; returns a status entry"""
+    mode = meeting.get('mode', default_mode)
+    webhook_url = meeting.get('webhook_url', DEFAULT_WEBHOOK_URL)
+    status = {
+        "meeting_url": meeting['meeting_url'],
+        "mode": mode,
+        "status": "failed",
+        "bot_id": None,
+        "attempts": 0,
+        "error": None,
+        "started_at": datetime.now().isoformat()
+    }
+    started = time.time()
+
+    for attempt in range(max_retries + 1):
+        status['attempts'] = attempt + 1
+        response = None
+        try:
+            if mode == 'immediate':
+                response = create_immediate_join_bot(meeting['meeting_url'], webhook_url, meeting.get('ngrok_url'))
+            else:
+                response = create_interview_bot(meeting['meeting_url'], webhook_url, meeting.get('camera_url'))
+        except requests.exceptions.RequestException as e:
+            status['error'] = str(e)
+        else:
+            if response.status_code in (200, 201):
+                bot_data = response.json()
+                status.update(status="created", bot_id=bot_data.get('id'), error=None)
+                break
+            status['error'] = f"{response.status_code}: {response.text[:200]}"
+            if response.status_code not in RETRYABLE_STATUS:
+                break
+        if attempt < max_retries:
+            time.sleep(_retry_delay(attempt, response))
+
+    status['elapsed'] = round(time.time() - started, 3)
+    return status
+
+def launch_schedule(meetings, workers=8, max_retries=3, default_mode='interview', on_status=None):
+    """Launch bots for every scheduled meeting and return their status entries
+
+    Meetings with a join_at time are submitted when that time arrives; the
+    rest are submitted immediately. At most `workers` bots are created at
+    once, within the shared Recall.ai request rate.
+    """
+    # Parse every join_at up front: a bad one must not stop a run halfway
+    join_times = [parse_join_at(m['join_at']) if m.get('join_at') else None for m in meetings]
+    immediately = datetime.min.replace(tzinfo=timezone.utc)
+    ordered = sorted(zip(join_times, meetings), key=lambda pair: pair[0] or immediately)
+    futures = []
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for join_at, meeting in ordered:
+            if join_at:
+                delay = (join_at - datetime.now(timezone.utc)).total_seconds()
+                if delay > 0:
+                    time.sleep(delay)
+            future = executor.submit(launch_bot, meeting, default_mode, max_retries)
+            if on_status:
+                future.add_done_callback(lambda f: on_status(f.result()))
+            futures.append(future)
+    return [future.result() for future in futures]
+
+def print_report(results):
+    """Print a status summary for a launch run"""
+    created = [r for r in results if r['status'] == 'created']
+    print(f"\n{'='*60}")
+    print(f"Launch report: {len(created)}/{len(results)} bots created")
+    print(f"{'='*60}")
+    for r in results:
+        if r['status'] == 'created':
+            print(f"✓ {r['meeting_url']} → bot {r['bot_id']} ({r['attempts']} attempt(s), {r['elapsed']}s)")
+        else:
+            print(f"✗ {r['meeting_url']} - {r['error']} ({r['attempts']} attempt(s))")
+
+def main():
+    parser = argparse.ArgumentParser(description="Launch interview bots for a schedule of meetings")
+    parser.add_argument('schedule', help="JSON or CSV file listing meetings")
+    parser.add_argument('--workers', type=int, default=8, help="Bots created concurrently")
+    parser.add_argument('--retries', type=int, default=3, help="Retries for 5xx and connection errors")
+    parser.add_argument('--mode', choices=['interview', 'immediate'], default='interview',
+                        help="Default bot type for meetings without a mode")
+    parser.add_argument('--report', help="Write the status report to this JSON file")
+    args = parser.parse_args()
+
+    try:
+        meetings = load_schedule(args.schedule)
+    except ValueError as e:
+        parser.error(str(e))
+    print(f"{'='*60}")
+    print("AI Interview Bot Batch Launcher")
+    print(f"{'='*60}\n")
+    rate, burst = quota_for('recall')
+    print(f"Meetings: {len(meetings)}  Workers: {args.workers}  Rate: {rate}/s (burst {burst})\n")
+
+    started = time.time()
+    results = launch_schedule(
+        meetings, workers=args.workers, max_retries=args.retries, default_mode=args.mode,
+        on_status=lambda r: print(f"{'✓' if r['status'] == 'created' else '✗'} {r['meeting_url']}")
+    )
+    print_report(results)
+    print(f"\nTotal time: {time.time() - started:.1f}s")
+
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"💾 Report saved to {args.report}")
+
+    sys.exit(0 if all(r['status'] == 'created' for r in results) else 1)
+
+if __name__ == '__main__':
+    main()
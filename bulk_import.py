@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Bulk import of historical interview transcripts
+Reads interviews from an NDJSON file or a directory (.txt transcripts,
+.json records, .ndjson files), scores them across a process pool and
+writes them to the store one batch at a time. n8n enrichment is queued
+for the analysis workers instead of run inline.
+
+Usage:
+  python3 bulk_import.py transcripts.ndjson
+  python3 bulk_import.py past_interviews/ --workers 8 --enrich
+  python3 bulk_import.py transcripts.ndjson --api http://localhost:5000
+"""
+import argparse
+import hashlib
+import itertools
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+import requests
+
+from interview_analysis import analyze_interview, get_rubric, set_rubric
+from interview_store import DATA_FILE, SNAPSHOT_FILE, DataDirLock, InterviewStore
+from job_queue import JobQueue, QUEUE_FILE
+
+DEFAULT_BATCH_SIZE = 500
+TEXT_SUFFIXES = ('.txt', '.md')
+NDJSON_SUFFIXES = ('.ndjson', '.jsonl')
+
+def iter_source(path):
+    """Yield raw interview dicts from an NDJSON file or a directory"""
+    path = Path(path)
+    if path.is_dir():
+        for file in sorted(p for p in path.rglob('*') if p.is_file()):
+            yield from _iter_file(file)
+    else:
+        yield from _iter_file(path)
+
+def _iter_file(file):
+    suffix = file.suffix.lower()
+    if suffix in TEXT_SUFFIXES:
+        yield {
+            "id": file.stem,
+            "transcript": file.read_text(encoding='utf-8', errors='replace'),
+            "timestamp": datetime.fromtimestamp(file.stat().st_mtime).isoformat(),
+            "source": file.name
+        }
+    elif suffix == '.json':
+        with open(file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        for item in data if isinstance(data, list) else [data]:
+            yield {"source": file.name, **item}
+    elif suffix in NDJSON_SUFFIXES:
+        with open(file, 'r', encoding='utf-8') as f:
+            yield from iter_ndjson(f)
+
+def iter_stream_lines(stream, chunk_size=1 << 20):
+    """Yield lines from a binary stream read in large chunks
+
+    Iterating a WSGI input stream line by line is very slow for long
+    lines such as whole transcripts.
+    """
+    pending = b''
+    while chunk := stream.read(chunk_size):
+        lines = (pending + chunk).split(b"\n")
+        pending = lines.pop()
+        yield from lines
+    if pending:
+        yield pending
+
+def iter_ndjson(lines):
+    """Yield one dict per non-empty NDJSON line (None for lines that aren't valid JSON)"""
+    for number, line in enumerate(lines, 1):
+        if isinstance(line, bytes):
+            line = line.decode('utf-8', errors='replace')
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as e:
+            print(f"⚠️  Invalid JSON on line {number}: {e}")
+            yield None
+
+def transcript_text(value):
+    """Flatten a transcript given as text or as a list of segments"""
+    if isinstance(value, list):
+        return " ".join(seg.get('text', '') if isinstance(seg, dict) else str(seg) for seg in value)
+    return value or ''
+
+def import_id(raw):
+    """Interview id an imported item is stored under (derived from the transcript if it has none)"""
+    interview_id = raw.get('id') or raw.get('bot_id')
+    if not interview_id:
+        transcript = transcript_text(raw.get('transcript') or raw.get('text'))
+        interview_id = f"import_{hashlib.sha256(transcript.encode('utf-8')).hexdigest()[:16]}"
+    return str(interview_id)
+
+def normalize(raw, imported_at):
+    """Interview record (without analysis) for one imported item"""
+    transcript = transcript_text(raw.get('transcript') or raw.get('text'))
+    record = {
+        "id": import_id(raw),
+        "bot_id": raw.get('bot_id'),
+        "timestamp": raw.get('timestamp') or imported_at,
+        "meeting_url": raw.get('meeting_url'),
+        "transcript": transcript,
+        "audio_duration": raw.get('audio_duration') or raw.get('duration'),
+        "processed_by": "import",
+        "imported_at": imported_at
+    }
+    if raw.get('source'):
+        record['source'] = raw['source']
+    return record
+
+def _analyze_job(job):
+    """Worker entry point: score one transcript"""
+    transcript, duration = job
+    return analyze_interview(transcript, duration)
+
+def _batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(itertools.islice(iterator, size)):
+        yield batch
+
+def import_interviews(items, publish, flush, exists=None, workers=None, batch_size=DEFAULT_BATCH_SIZE,
+                      replace=False, enqueue_enrichment=None):
+    """Import raw interview items, yielding a progress report after each batch
+
+    publish(record) stores one record and flush() persists a batch.
+    Interviews for which exists(id) is true are skipped unless replace is
+    set. Scoring of the next batch overlaps with writing the current one.
+    """
+    workers = workers or os.cpu_count() or 1
+    batch_size = max(1, batch_size)
+    imported_at = datetime.now().isoformat()
+    started = time.time()
+    progress = {"read": 0, "imported": 0, "skipped": 0, "failed": 0, "enrichment_queued": 0,
+                "elapsed": 0.0, "done": False}
+
+    def records():
+        for raw in items:
+            progress['read'] += 1
+            try:
+                if not isinstance(raw, dict):
+                    raise ValueError("not a JSON object")
+                record = normalize(raw, imported_at)
+            except Exception as e:
+                print(f"⚠️  Skipping unreadable item {progress['read']}: {e}")
+                progress['failed'] += 1
+                continue
+            if exists and not replace and exists(record['id']):
+                progress['skipped'] += 1
+                continue
+            yield record
+
+    def write(batch, analyses):
+        for record, analysis in zip(batch, analyses):
+            stored = publish({**record, "analysis": analysis})
+            progress['imported'] += 1
+            if enqueue_enrichment and enqueue_enrichment(stored):
+                progress['enrichment_queued'] += 1
+        flush()
+        progress['elapsed'] = round(time.time() - started, 3)
+        return dict(progress)
+
+    executor = None
+    if workers > 1:
+        # Workers score with the same rubric as this process, even if it was swapped at runtime.
+        # Spawned, not forked, since /api/import runs this inside the threaded API server
+        executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                                       initializer=set_rubric, initargs=(get_rubric(),))
+    try:
+        pending = None
+        for batch in _batched(records(), batch_size):
+            jobs = [(record['transcript'], record['audio_duration']) for record in batch]
+            if executor:
+                analyses = executor.map(_analyze_job, jobs, chunksize=max(1, len(jobs) // (workers * 4)))
+            else:
+                analyses = map(_analyze_job, jobs)
+            if pending:
+                yield write(*pending)
+            pending = (batch, analyses)
+        if pending:
+            yield write(*pending)
+    finally:
+        if executor:
+            executor.shutdown(cancel_futures=True)
+    progress['done'] = True
+    progress['elapsed'] = round(time.time() - started, 3)
+    yield dict(progress)
+
+def import_via_api(api_url, source, **options):
+    """Stream a source to a running API server as NDJSON and print its progress"""
+    body = (json.dumps(item).encode('utf-8') + b"\n" for item in iter_source(source))
+    params = {k: v for k, v in options.items() if v is not None}
+    headers = {"Content-Type": "application/x-ndjson"}
+    if os.getenv('API_TOKEN'):
+        headers["Authorization"] = f"Bearer {os.environ['API_TOKEN']}"
+    response = requests.post(f"{api_url.rstrip('/')}/api/import", data=body, params=params,
+                             headers=headers, stream=True, timeout=None)
+    if response.status_code != 200:
+        print(f"✗ Error: {response.status_code} - {response.text}")
+        return False
+    for line in response.iter_lines():
+        if line:
+            print_progress(json.loads(line))
+    return True
+
+def print_progress(progress):
+    """Print a single progress report"""
+    if 'error' in progress:
+        print(f"✗ {progress['error']}")
+        return
+    if progress['done']:
+        print(f"✅ Import complete: {progress['imported']} imported, {progress['skipped']} skipped, "
+              f"{progress['failed']} failed, {progress['enrichment_queued']} queued for enrichment "
+              f"({progress['elapsed']}s)")
+        return
+    print(f"📥 {progress['imported']} imported, {progress['skipped']} skipped, {progress['failed']} failed "
+          f"of {progress['read']} read ({progress['elapsed']}s)")
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import historical interview transcripts")
+    parser.add_argument('source', help="NDJSON file or directory of .txt/.json/.ndjson files")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help="Interviews written per batch")
+    parser.add_argument('--replace', action='store_true', help="Replace interviews that already exist")
+    parser.add_argument('--enrich', action='store_true', help="Queue n8n enrichment for imported interviews")
+    parser.add_argument('--data-file', default=str(SNAPSHOT_FILE), help="Interview snapshot to import into")
+    parser.add_argument('--api', help="Import through a running API server, e.g. http://localhost:5000")
+    args = parser.parse_args()
+
+    if not Path(args.source).exists():
+        print(f"✗ No such file or directory: {args.source}")
+        sys.exit(1)
+
+    print(f"{'='*60}")
+    print("Bulk Interview Import")
+    print(f"{'='*60}\n")
+
+    if args.api:
+        ok = import_via_api(args.api, args.source, workers=args.workers, batch_size=args.batch_size,
+                            replace=int(args.replace) or None, enrich=int(args.enrich) or None)
+        sys.exit(0 if ok else 1)
+
+    # A running API server owns the store; rewriting it underneath would lose its updates
+    if not DataDirLock(Path(args.data_file).parent).acquire():
+        print(f"✗ An API server is using {Path(args.data_file).parent}; re-run with --api <server URL>")
+        sys.exit(1)
+    store = InterviewStore(args.data_file).load(legacy_json=DATA_FILE)
+    positions = {store.meta(idx)[0]: idx for idx in range(len(store))}
+    queue = JobQueue(QUEUE_FILE) if args.enrich else None
+
+    def publish(record):
+        idx = positions.get(record['id'])
+        if idx is None:
+            store.append(record)
+            positions[record['id']] = len(store) - 1
+            return store[-1]
+        store[idx] = record
+        return store[idx]
+
+    def enqueue_enrichment(record):
+        queue.enqueue('enhance', record['id'], record.to_dict())
+        return True
+
+    for progress in import_interviews(iter_source(args.source), publish, store.flush, exists=positions.__contains__,
+                                      workers=args.workers, batch_size=args.batch_size, replace=args.replace,
+                                      enqueue_enrichment=enqueue_enrichment if queue else None):
+        print_progress(progress)
+    print(f"\n💾 Saved imported interviews to {args.data_file}")
+
+if __name__ == '__main__':
+    main()
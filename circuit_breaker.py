@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Circuit breakers for outbound calls to n8n endpoints
+Each endpoint URL gets one breaker per process, shared by N8NBackendService,
+N8NBackend, n8n_mcp_integration and the api_server forwarder. After
+repeated failures the breaker opens and calls fail instantly; a background
+probe checks the endpoint, and once it answers again a single trial call
+is let through (half-open) to decide whether to close the breaker.
+"""
+import os
+import threading
+import time
+from collections import deque
+
+import requests
+
+import rate_limiter
+from profiler import span
+
+FAILURE_THRESHOLD = int(os.getenv('CIRCUIT_FAILURE_THRESHOLD', '3'))
+FAILURE_RATE = float(os.getenv('CIRCUIT_FAILURE_RATE', '0.5'))
+WINDOW = int(os.getenv('CIRCUIT_WINDOW', '20'))
+PROBE_INTERVAL = float(os.getenv('CIRCUIT_PROBE_INTERVAL', '10'))
+PROBE_TIMEOUT = float(os.getenv('CIRCUIT_PROBE_TIMEOUT', '2'))
+
+class CircuitOpen(requests.exceptions.RequestException):
+    """Raised instead of calling an endpoint whose breaker is open"""
+
+class CircuitBreaker:
+    """Per-endpoint breaker: closed → open → half-open (one trial call) → closed"""
+
+    def __init__(self, name, probe, failure_threshold=FAILURE_THRESHOLD, failure_rate=FAILURE_RATE,
+                 window=WINDOW, probe_interval=PROBE_INTERVAL):
+        self.name = name
+        self.probe = probe
+        self.failure_threshold = failure_threshold
+        self.failure_rate = failure_rate
+        self.probe_interval = probe_interval
+        self.state = 'closed'
+        self._outcomes = deque(maxlen=window)  # True for success
+        self._consecutive_failures = 0
+        self._opened_at = None
+        self._trial_pending = False
+        self._lock = threading.Lock()
+        self._stats = {"calls": 0, "failures": 0, "rejected": 0, "opened": 0, "probes": 0}
+
+    def allow(self):
+        """Whether a call may go out now; open breakers reject instantly"""
+        with self._lock:
+            if self.state == 'closed' or self.state == 'half_open' and self._trial_pending:
+                self._trial_pending = False
+                self._stats['calls'] += 1
+                return True
+            self._stats['rejected'] += 1
+            return False
+
+    def cancel(self):
+        """An allowed call never went out (held back by a rate limit)"""
+        with self._lock:
+            self._stats['calls'] -= 1
+            if self.state == 'half_open':
+                self._trial_pending = True
+
+    def record(self, ok):
+        with self._lock:
+            if self.state == 'half_open':
+                # Outcome of the trial call
+                if ok:
+                    self._close()
+                else:
+                    self._stats['failures'] += 1
+                    self._open()
+                return
+            self._outcomes.append(ok)
+            if ok:
+                self._consecutive_failures = 0
+                return
+            self._stats['failures'] += 1
+            self._consecutive_failures += 1
+            failures = self._outcomes.count(False)
+            if self.state == 'closed' and (
+                    self._consecutive_failures >= self.failure_threshold or
+                    len(self._outcomes) == self._outcomes.maxlen and failures / len(self._outcomes) >= self.failure_rate):
+                self._open()
+
+    def _open(self):
+        self.state = 'open'
+        self._opened_at = time.time()
+        self._stats['opened'] += 1
+        print(f"⚡ Circuit open for {self.name}; probing every {self.probe_interval:g}s")
+        threading.Thread(target=self._probe_loop, daemon=True, name=f"circuit-probe-{self.name}").start()
+
+    def _close(self):
+        self.state = 'closed'
+        self._outcomes.clear()
+        self._consecutive_failures = 0
+        print(f"✅ Circuit closed for {self.name}")
+
+    def _probe_loop(self):
+        while True:
+            time.sleep(self.probe_interval)
+            with self._lock:
+                self._stats['probes'] += 1
+            try:
+                ok = self.probe()
+            except Exception:
+                ok = False
+            if ok:
+                with self._lock:
+                    self.state = 'half_open'
+                    self._trial_pending = True
+                return
+
+    def stats(self):
+        with self._lock:
+            return {
+                "state": self.state,
+                "failure_rate": round(self._outcomes.count(False) / len(self._outcomes), 2) if self._outcomes else 0.0,
+                "open_for": round(time.time() - self._opened_at, 1) if self.state != 'closed' else 0,
+                **self._stats
+            }
+
+def _probe_url(url):
+    """An endpoint is up if it answers at all without a server error"""
+    def probe():
+        response = requests.head(url, timeout=PROBE_TIMEOUT, allow_redirects=False)
+        return response.status_code < 500
+    return probe
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+def breaker_for(url):
+    """The process-wide breaker for an endpoint URL"""
+    with _breakers_lock:
+        breaker = _breakers.get(url)
+        if breaker is None:
+            breaker = _breakers[url] = CircuitBreaker(url, _probe_url(url))
+        return breaker
+
+def breaker_stats():
+    """State of every breaker, by endpoint"""
+    with _breakers_lock:
+        breakers = dict(_breakers)
+    return {url: breaker.stats() for url, breaker in breakers.items()}
+
+def post(url, rate_limit=None, max_wait=None, **kwargs):
+    """requests.post through the endpoint's breaker
+
+    Raises CircuitOpen without touching the network while the breaker is
+    open. Connection errors, timeouts and 5xx responses count as failures.
+    With rate_limit set to a service name, the call also goes through that
+    service's rate limiter, waiting at most max_wait seconds for its quota
+    (default RATE_LIMIT_MAX_WAIT).
+    """
+    breaker = breaker_for(url)
+    if not breaker.allow():
+        raise CircuitOpen(f"{url} is unavailable (circuit open)")
+    try:
+        with span(f"POST {url}"):
+            if rate_limit:
+                response = rate_limiter.post(rate_limit, url, max_wait=rate_limiter.MAX_WAIT if max_wait is None else max_wait,
+                                         **kwargs)
+            else:
+                response = requests.post(url, **kwargs)
+    except rate_limiter.RateLimited:
+        breaker.cancel()
+        raise
+    except Exception:
+        breaker.record(False)
+        raise
+    breaker.record(response.status_code < 500)
+    return response
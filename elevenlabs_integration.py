@@ -4,9 +4,15 @@ ElevenLabs API integration for voice synthesis
 """
 import requests
 import json
+import os
 from config import ELEVENLABS_API_KEY, ELEVENLABS_API_URL
+import rate_limiter
 
-def synthesize_speech(text, voice_id="21m00Tcm4TlvDq8ikWAM", model_id="eleven_monolingual_v1"):
+# Seconds to wait for ElevenLabs to answer a synthesis request
+SYNTHESIS_TIMEOUT = float(os.getenv('TTS_TIMEOUT') or 30)
+
+def synthesize_speech(text, voice_id="21m00Tcm4TlvDq8ikWAM", model_id="eleven_monolingual_v1",
+                      timeout=SYNTHESIS_TIMEOUT, max_wait=rate_limiter.MAX_WAIT):
     """Synthesize speech using ElevenLabs API"""
     url = f"{ELEVENLABS_API_URL}/text-to-speech/{voice_id}"
     
@@ -26,7 +32,8 @@ def synthesize_speech(text, voice_id="21m00Tcm4TlvDq8ikWAM", model_id="eleven_mo
     }
     
     try:
-        response = requests.post(url, json=data, headers=headers)
+        response = rate_limiter.post('elevenlabs', url, json=data, headers=headers, timeout=timeout,
+                                     max_wait=max_wait)
         if response.status_code == 200:
             return response.content  # Audio bytes
         else:
@@ -42,7 +49,7 @@ def get_voices():
     headers = {"xi-api-key": ELEVENLABS_API_KEY}
     
     try:
-        response = requests.get(url, headers=headers)
+        response = rate_limiter.get('elevenlabs', url, headers=headers, timeout=10)
         if response.status_code == 200:
             return response.json()
         return None
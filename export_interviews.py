@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Streaming export of interviews as NDJSON or CSV
+Records are read from the store one at a time, filtered by the timestamps
+in the snapshot index, so exporting the whole archive runs in constant
+memory and output starts immediately.
+
+Usage:
+  python3 export_interviews.py --format csv --since 2024-01-01 -o interviews.csv
+  python3 export_interviews.py --fields id,timestamp,analysis.score,transcript > interviews.ndjson
+  python3 export_interviews.py --api http://localhost:5000 --format csv -o interviews.csv
+"""
+import argparse
+import csv
+import io
+import json
+import sys
+from pathlib import Path
+
+import requests
+
+from interview_store import DATA_FILE, SNAPSHOT_FILE, InterviewStore, parse_time_filter, parse_timestamp
+
+FORMATS = ('ndjson', 'csv')
+
+# CSV needs fixed columns; NDJSON exports whole records unless fields are given
+DEFAULT_CSV_FIELDS = [
+    'id', 'bot_id', 'timestamp', 'meeting_url', 'processed_by', 'audio_duration',
+    'analysis.score', 'analysis.summary', 'analysis.metrics.word_count',
+    'analysis.strengths', 'analysis.weaknesses', 'analysis.recommendations'
+]
+
+def parse_fields(value):
+    """Split a comma-separated field list ("id,analysis.score")"""
+    if not value:
+        return None
+    if isinstance(value, (list, tuple)):
+        return [f for f in value if f]
+    return [f.strip() for f in value.split(',') if f.strip()]
+
+def get_field(record, path):
+    """Value at a dotted path such as analysis.metrics.word_count, or None"""
+    value = record
+    for part in path.split('.'):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+def select_fields(record, fields):
+    """Record reduced to the given dotted fields (all of it when fields is None)"""
+    if not fields:
+        return record
+    return {field: get_field(record, field) for field in fields}
+
+def iter_export(store, since=None, until=None):
+    """Iterator over full interview records (API shape) in store order, filtered by timestamp
+
+    The filter uses the snapshot index, so skipped records are never read.
+    An invalid since/until raises ValueError here, before anything is
+    streamed.
+    """
+    since = parse_time_filter(since, 'since')
+    until = parse_time_filter(until, 'until')
+
+    def wanted(idx):
+        if not since and not until:
+            return True
+        timestamp = parse_timestamp(store.meta(idx)[2])
+        if timestamp is None:
+            return False
+        return (not since or timestamp >= since) and (not until or timestamp <= until)
+
+    indices = (idx for idx in range(len(store)) if wanted(idx))
+    return (record.to_dict() for record in store.iter_uncached(indices))
+
+def ndjson_lines(records, fields=None):
+    """Yield one JSON line per record"""
+    for record in records:
+        yield json.dumps(select_fields(record, fields), default=str) + "\n"
+
+def csv_lines(records, fields=None):
+    """Yield a CSV header and one row per record; nested values are JSON-encoded"""
+    fields = fields or DEFAULT_CSV_FIELDS
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def flush():
+        line = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return line
+
+    writer.writerow(fields)
+    yield flush()
+    for record in records:
+        row = []
+        for field in fields:
+            value = get_field(record, field)
+            if isinstance(value, (dict, list)):
+                value = json.dumps(value, default=str)
+            row.append('' if value is None else value)
+        writer.writerow(row)
+        yield flush()
+
+def export_lines(records, fmt='ndjson', fields=None):
+    """Serialize records lazily in the given format"""
+    if fmt not in FORMATS:
+        raise ValueError(f"format must be one of {', '.join(FORMATS)}")
+    return csv_lines(records, fields) if fmt == 'csv' else ndjson_lines(records, fields)
+
+def export_via_api(api_url, out, fmt, fields, since, until):
+    """Stream an export from a running API server into a file object"""
+    params = {"format": fmt, "fields": ",".join(fields) if fields else None, "since": since, "until": until}
+    with requests.get(f"{api_url.rstrip('/')}/api/interviews/export", params=params, stream=True, timeout=30) as response:
+        response.raise_for_status()
+        response.encoding = 'utf-8'
+        for chunk in response.iter_content(chunk_size=65536, decode_unicode=True):
+            out.write(chunk)
+
+def main():
+    parser = argparse.ArgumentParser(description="Export interviews as NDJSON or CSV")
+    parser.add_argument('--format', choices=FORMATS, default='ndjson')
+    parser.add_argument('--fields', help="Comma-separated fields, dotted for nested ones (e.g. id,analysis.score)")
+    parser.add_argument('--since', help="Only interviews recorded at or after this ISO timestamp")
+    parser.add_argument('--until', help="Only interviews recorded at or before this ISO timestamp")
+    parser.add_argument('-o', '--output', help="Output file (default: stdout)")
+    parser.add_argument('--data-file', default=str(SNAPSHOT_FILE), help="Interview snapshot to export")
+    parser.add_argument('--api', help="Export from a running API server instead, e.g. http://localhost:5000")
+    args = parser.parse_args()
+    try:
+        parse_time_filter(args.since, '--since')
+        parse_time_filter(args.until, '--until')
+    except ValueError as e:
+        parser.error(str(e))
+
+    fields = parse_fields(args.fields)
+    out = open(args.output, 'w', newline='', encoding='utf-8') if args.output else sys.stdout
+    try:
+        if args.api:
+            export_via_api(args.api, out, args.format, fields, args.since, args.until)
+        else:
+            data_file = Path(args.data_file)
+            if not data_file.exists() and not DATA_FILE.exists():
+                print(f"✗ No interview data at {data_file}", file=sys.stderr)
+                sys.exit(1)
+            store = InterviewStore(data_file).load(legacy_json=DATA_FILE)
+            for line in export_lines(iter_export(store, args.since, args.until), args.format, fields):
+                out.write(line)
+    finally:
+        if args.output:
+            out.close()
+    if args.output:
+        print(f"✓ Exported interviews to {args.output}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Interview analysis
+Scores interview transcripts for software developer positions.
+Results are memoized by transcript hash, duration and rubric version.
+"""
+import copy
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+from profiler import traced
+from rubric import load_rubric
+from transcript_features import TranscriptFeatures
+
+ANALYSIS_CACHE_SIZE = int(os.getenv('ANALYSIS_CACHE_SIZE', '1024'))
+
+_rubric = load_rubric()
+_analysis_cache = OrderedDict()
+_cache_lock = threading.Lock()
+_cache_stats = {"hits": 0, "misses": 0}
+
+def get_rubric():
+    """Get the rubric currently used for analysis"""
+    return _rubric
+
+def set_rubric(rubric):
+    """Switch analysis to a different rubric"""
+    global _rubric
+    _rubric = rubric
+
+def rubric_version():
+    """Version of the rubric currently used for analysis"""
+    return _rubric['version']
+
+def is_stale(analysis):
+    """Check whether an analysis was produced by a different rubric version"""
+    return (analysis or {}).get('rubric_version') != rubric_version()
+
+def analysis_cache_info():
+    """Analysis cache size and hit statistics"""
+    with _cache_lock:
+        return {"size": len(_analysis_cache), "max_size": ANALYSIS_CACHE_SIZE, **_cache_stats}
+
+def _cache_key(transcript_text, audio_duration, rubric):
+    digest = hashlib.sha256((transcript_text or '').encode('utf-8')).hexdigest()
+    return digest, json.dumps(audio_duration, sort_keys=True, default=str), rubric['version']
+
+@traced('analyze_interview')
+def analyze_interview(transcript_text, audio_duration=None, rubric=None):
+    """Enhanced interview analysis with software developer focus
+
+    Identical (transcript, duration, rubric version) inputs are served from a
+    bounded LRU cache instead of being re-analyzed. Scoring reads the
+    transcript's TranscriptFeatures; their compact form is returned as
+    analysis['features'] so n8n enhancement doesn't extract them again.
+    """
+    rubric = rubric or _rubric
+    key = _cache_key(transcript_text, audio_duration, rubric)
+    with _cache_lock:
+        cached = _analysis_cache.get(key)
+        if cached is not None:
+            _analysis_cache.move_to_end(key)
+            _cache_stats['hits'] += 1
+    if cached is None:
+        features = TranscriptFeatures.extract(transcript_text, rubric)
+        analysis = _score_transcript(transcript_text, features, audio_duration, rubric)
+        # Cache entries don't keep their own copy of the transcript
+        cached = {k: v for k, v in analysis.items() if k != 'transcript'}
+        with _cache_lock:
+            _cache_stats['misses'] += 1
+            _analysis_cache[key] = cached
+            _analysis_cache.move_to_end(key)
+            while len(_analysis_cache) > ANALYSIS_CACHE_SIZE:
+                _analysis_cache.popitem(last=False)
+
+    # Callers own the returned dict, so never hand out the cached one
+    analysis = copy.deepcopy(cached)
+    if transcript_text:
+        analysis['transcript'] = transcript_text
+    return analysis
+
+def _score_transcript(transcript_text, features, audio_duration, rubric):
+    """Score a transcript's features against the given rubric"""
+    if not transcript_text:
+        return {
+            "score": 0,
+            "summary": "No transcript available",
+            "strengths": [],
+            "weaknesses": [],
+            "recommendations": [],
+            "detailed_metrics": {},
+            "rubric_version": rubric['version']
+        }
+    
+    word_count = features.word_count
+    
+    keywords = rubric['keywords']
+    weights = rubric['weights']
+    norms = rubric['normalization']
+    programming_languages = keywords['programming_languages']
+    frameworks = keywords['frameworks']
+    technical_concepts = keywords['technical_concepts']
+    soft_skills = keywords['soft_skills']
+    problem_solving = keywords['problem_solving']
+    
+    # Count keyword mentions
+    lang_score = features.count(programming_languages)
+    framework_score = features.count(frameworks)
+    tech_score = features.count(technical_concepts)
+    soft_score = features.count(soft_skills)
+    problem_score = features.count(problem_solving)
+    
+    # Calculate detailed metrics
+    technical_depth = lang_score + framework_score + tech_score
+    communication_quality = soft_score + (word_count / norms['words_per_communication_point'])  # More words = better communication
+    problem_solving_ability = problem_score
+    
+    # Advanced scoring algorithm
+    technical_weight = weights['technical']
+    communication_weight = weights['communication']
+    problem_solving_weight = weights['problem_solving']
+    engagement_weight = weights['engagement']
+    
+    technical_ratio = min(1.0, technical_depth / norms['technical_depth'])  # Normalize to 0-1
+    communication_ratio = min(1.0, communication_quality / norms['communication_quality'])
+    problem_ratio = min(1.0, problem_solving_ability / norms['problem_solving'])
+    engagement_ratio = min(1.0, word_count / norms['word_count'])
+    
+    score = int((
+        technical_ratio * technical_weight +
+        communication_ratio * communication_weight +
+        problem_ratio * problem_solving_weight +
+        engagement_ratio * engagement_weight
+    ) * 100)
+    
+    # Generate detailed strengths
+    strengths = []
+    if lang_score >= 2:
+        strengths.append(f"Demonstrates knowledge of {lang_score} programming languages")
+    if framework_score >= 2:
+        strengths.append(f"Familiar with {framework_score} frameworks/libraries")
+    if tech_score >= 5:
+        strengths.append("Strong understanding of technical concepts and best practices")
+    if soft_score >= 3:
+        strengths.append("Good soft skills and team collaboration experience")
+    if problem_score >= 3:
+        strengths.append("Shows strong problem-solving and analytical thinking")
+    if word_count > 400:
+        strengths.append("Provides detailed and comprehensive answers")
+    if not strengths:
+        strengths.append("Participated actively in the interview")
+    
+    # Generate detailed weaknesses
+    weaknesses = []
+    if lang_score < 1:
+        weaknesses.append("Limited discussion of specific programming languages")
+    if framework_score < 1:
+        weaknesses.append("Could mention more frameworks and tools")
+    if tech_score < 3:
+        weaknesses.append("Needs deeper technical discussion")
+    if soft_score < 2:
+        weaknesses.append("Could emphasize more on teamwork and collaboration")
+    if problem_score < 2:
+        weaknesses.append("Limited demonstration of problem-solving process")
+    if word_count < 150:
+        weaknesses.append("Responses were too brief - provide more detail")
+    
+    # Generate actionable recommendations
+    recommendations = []
+    if technical_depth < 10:
+        recommendations.append("Prepare specific examples of projects using different technologies")
+        recommendations.append("Be ready to discuss system architecture and design decisions")
+    if communication_quality < 10:
+        recommendations.append("Practice explaining complex technical concepts in simple terms")
+        recommendations.append("Prepare STAR method examples (Situation, Task, Action, Result)")
+    if problem_score < 3:
+        recommendations.append("Prepare examples of challenging problems you've solved")
+        recommendations.append("Practice walking through your problem-solving process")
+    if word_count < 200:
+        recommendations.append("Provide more detailed answers with concrete examples")
+    if not recommendations:
+        recommendations.append("Continue building on current strengths")
+        recommendations.append("Consider contributing to open source projects")
+    
+    # Generate comprehensive summary
+    summary = f"Comprehensive interview analysis for Software Developer position. "
+    summary += f"Analyzed {word_count} words over {audio_duration or 'unknown'} duration. "
+    summary += f"Technical depth: {'Excellent' if technical_depth >= 15 else 'Good' if technical_depth >= 8 else 'Needs improvement'}. "
+    summary += f"Communication: {'Excellent' if communication_quality >= 15 else 'Good' if communication_quality >= 8 else 'Needs improvement'}. "
+    summary += f"Problem-solving: {'Strong' if problem_score >= 5 else 'Moderate' if problem_score >= 3 else 'Limited'}. "
+    summary += f"Overall performance score: {score}/100."
+    
+    return {
+        "score": score,
+        "summary": summary,
+        "metrics": {
+            "word_count": word_count,
+            "audio_duration": audio_duration,
+            "technical_depth": technical_depth,
+            "programming_languages_mentioned": lang_score,
+            "frameworks_mentioned": framework_score,
+            "technical_concepts": tech_score,
+            "soft_skills_demonstrated": soft_score,
+            "problem_solving_examples": problem_score
+        },
+        "detailed_metrics": {
+            "technical_ratio": round(technical_ratio, 2),
+            "communication_ratio": round(communication_ratio, 2),
+            "problem_solving_ratio": round(problem_ratio, 2),
+            "engagement_ratio": round(engagement_ratio, 2)
+        },
+        "strengths": strengths,
+        "weaknesses": weaknesses,
+        "recommendations": recommendations,
+        "features": features.to_dict(),
+        "transcript": transcript_text,
+        "rubric_version": rubric['version']
+    }
@@ -8,10 +8,12 @@ import json
 import sys
 import os
 
+import rate_limiter
+
 # Configuration
 MEETING_URL = os.getenv("MEETING_URL", "https://meet.google.com/zif-cudw-mph")
 API_TOKEN = os.getenv("RECALL_API_TOKEN", "")
-API_BASE_URL = "https://us-west-2.recall.ai"
+API_BASE_URL = os.getenv("RECALL_API_BASE_URL", "https://us-west-2.recall.ai")
 API_ENDPOINT = f"{API_BASE_URL}/api/v1/bot/"
 
 # Get webhook URL from environment or ngrok
@@ -85,7 +87,7 @@ def create_interview_bot(meeting_url, webhook_url, camera_url=None):
         "Content-Type": "application/json"
     }
     
-    return requests.post(API_ENDPOINT, json=payload, headers=headers)
+    return rate_limiter.post('recall', API_ENDPOINT, json=payload, headers=headers)
 
 def main():
     print(f"{'='*60}")
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Per-interview locking for concurrent webhook processing
+A sharded table of FIFO locks keyed by interview/bot id: requests for the
+same meeting are applied one at a time in arrival order, while different
+meetings proceed in parallel.
+"""
+import threading
+from contextlib import contextmanager
+
+class KeyedLocks:
+    """Striped table of per-key FIFO (ticket) locks"""
+
+    def __init__(self, stripes=64):
+        self._conditions = [threading.Condition() for _ in range(stripes)]
+        # Per stripe: key -> [next_ticket, now_serving]; entries vanish when idle
+        self._tickets = [{} for _ in range(stripes)]
+
+    def _stripe(self, key):
+        index = hash(key) % len(self._conditions)
+        return self._conditions[index], self._tickets[index]
+
+    @contextmanager
+    def hold(self, key):
+        """Hold the lock for key; waiters for the same key are served in arrival order"""
+        condition, tickets = self._stripe(key)
+        with condition:
+            entry = tickets.setdefault(key, [0, 0])
+            ticket = entry[0]
+            entry[0] += 1
+            while entry[1] != ticket:
+                condition.wait()
+        try:
+            yield
+        finally:
+            with condition:
+                entry[1] += 1
+                if entry[1] == entry[0]:
+                    del tickets[key]
+                condition.notify_all()
+
+    def busy(self, key):
+        """Whether key is currently held or waited on"""
+        condition, tickets = self._stripe(key)
+        with condition:
+            return key in tickets
+
+    def active_keys(self):
+        """Number of keys currently held or waited on"""
+        return sum(len(tickets) for tickets in self._tickets)
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Compact interview records
+Interviews are kept as slotted records instead of free-form dicts. The
+transcript is stored once: the analysis transcript and transcript text
+inside raw webhook payloads are replaced by references into the record's
+transcript. raw_data is kept as one compact JSON string rather than a tree
+of dicts, since it is only read when a record is served or updated.
+Repeated strings (analysis wording, keys, meeting URLs) are interned so
+records share them.
+
+Records are read-only mappings over the stored form; to_dict() rebuilds the
+full shape served by the API.
+"""
+import json
+import sys
+from collections.abc import Mapping
+
+FIELDS = ('id', 'bot_id', 'timestamp', 'meeting_url', 'transcript', 'analysis',
+          'raw_data', 'audio_duration', 'processed_by')
+TRANSCRIPT_REF = '$transcript'
+MIN_REF_LENGTH = 24      # shorter strings are cheaper to keep than to reference
+MAX_INTERN_LENGTH = 512
+
+_MISSING = object()
+
+def intern_value(value):
+    """Intern dict keys and short strings throughout a JSON-like value"""
+    if isinstance(value, str):
+        return sys.intern(value) if len(value) <= MAX_INTERN_LENGTH else value
+    if isinstance(value, dict):
+        return {sys.intern(k) if isinstance(k, str) else k: intern_value(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [intern_value(v) for v in value]
+    return value
+
+def compact_payload(value, transcript):
+    """Replace transcript text inside a payload with {"$transcript": [start, end]} references"""
+    if isinstance(value, str):
+        if len(value) >= MIN_REF_LENGTH and transcript:
+            start = transcript.find(value)
+            if start >= 0:
+                return {TRANSCRIPT_REF: [start, start + len(value)]}
+        return sys.intern(value) if len(value) <= MAX_INTERN_LENGTH else value
+    if isinstance(value, dict):
+        if TRANSCRIPT_REF in value:
+            return value
+        return {sys.intern(k) if isinstance(k, str) else k: compact_payload(v, transcript) for k, v in value.items()}
+    if isinstance(value, list):
+        return [compact_payload(v, transcript) for v in value]
+    return value
+
+def expand_payload(value, transcript):
+    """Inverse of compact_payload"""
+    if isinstance(value, dict):
+        if TRANSCRIPT_REF in value and len(value) == 1:
+            start, end = value[TRANSCRIPT_REF]
+            return transcript[start:end]
+        return {k: expand_payload(v, transcript) for k, v in value.items()}
+    if isinstance(value, list):
+        return [expand_payload(v, transcript) for v in value]
+    return value
+
+class InterviewRecord(Mapping):
+    """Immutable interview record
+
+    Mapping access returns the stored form, where the analysis transcript and
+    transcript text in raw_data are references into the record's transcript.
+    Build a changed record with {**record, ...} and publish that; use
+    to_dict() for API responses.
+    """
+
+    __slots__ = FIELDS + ('extra',)
+
+    def __init__(self, fields, extra=None):
+        for name in FIELDS:
+            object.__setattr__(self, name, fields.get(name, _MISSING))
+        object.__setattr__(self, 'extra', extra or None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("InterviewRecord is immutable; publish a new record instead")
+
+    @classmethod
+    def coerce(cls, record):
+        """Record for a plain dict (compacting it), or the record itself"""
+        if isinstance(record, cls):
+            return record
+        return cls.from_dict(record)
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a compact record from the full (API or legacy) shape"""
+        data = dict(data)
+        transcript = data.get('transcript')
+        analysis = data.get('analysis')
+        if isinstance(analysis, dict) and isinstance(analysis.get('transcript'), str):
+            data['analysis'] = {**analysis, 'transcript': compact_payload(analysis['transcript'], transcript or '')}
+        if 'raw_data' in data:
+            raw_data = compact_payload(data['raw_data'], transcript if isinstance(transcript, str) else '')
+            data['raw_data'] = json.dumps(raw_data, separators=(',', ':'))
+        return cls._build(data)
+
+    @classmethod
+    def from_stored(cls, data):
+        """Build a record from its stored (already compact) form
+
+        Compact records always keep raw_data as a JSON string; the analysis
+        transcript is no marker, as short transcripts are never referenced.
+        """
+        if 'raw_data' in data and not isinstance(data['raw_data'], str):
+            # Written before records were compacted
+            return cls.from_dict(data)
+        return cls._build(data)
+
+    @classmethod
+    def _build(cls, data):
+        fields = {}
+        extra = {}
+        for key, value in data.items():
+            if key in FIELDS:
+                fields[key] = value
+            else:
+                extra[sys.intern(key)] = value
+        for name in ('analysis', 'meeting_url', 'processed_by', 'bot_id'):
+            if name in fields:
+                fields[name] = intern_value(fields[name])
+        return cls(fields, extra)
+
+    # Mapping protocol over the stored form
+
+    def __getitem__(self, key):
+        if key in FIELDS:
+            value = getattr(self, key)
+            if value is not _MISSING:
+                return json.loads(value) if key == 'raw_data' else value
+        elif self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __iter__(self):
+        for name in FIELDS:
+            if getattr(self, name) is not _MISSING:
+                yield name
+        if self.extra:
+            yield from self.extra
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __eq__(self, other):
+        if not isinstance(other, Mapping):
+            return NotImplemented
+        return self.to_stored() == (other.to_stored() if isinstance(other, InterviewRecord) else
+                                    InterviewRecord.from_dict(other).to_stored())
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"InterviewRecord(id={self.id!r})"
+
+    # Serialization
+
+    def to_stored(self):
+        """Compact plain dict written to the snapshot (raw_data stays a JSON string)"""
+        data = {name: getattr(self, name) for name in FIELDS if getattr(self, name) is not _MISSING}
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def to_dict(self):
+        """Full record as served by the API, with the transcript copies restored"""
+        data = dict(self.items())
+        transcript = data.get('transcript') if isinstance(data.get('transcript'), str) else ''
+        for name in ('analysis', 'raw_data'):
+            if name in data:
+                data[name] = expand_payload(data[name], transcript)
+        return data
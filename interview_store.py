@@ -0,0 +1,581 @@
+#!/usr/bin/env python3
+"""
+Binary snapshot store for interviews
+Records are stored as compact JSON blobs in a single file with a header
+pointing at an index of record offsets. Opening the store only reads the
+header and index; records are read on demand through a memory map.
+
+File layout:
+  header   MAGIC | format version | record count | index offset | index length
+  records  compact JSON blobs, appended as interviews change
+  index    one entry per record, in list order: segment, offset, length, id, bot_id, timestamp
+
+Updates append the changed records and a new index, then rewrite the
+fixed-size header to point at it, so a crash mid-write leaves the previous
+snapshot intact. Space held by superseded records is reclaimed by
+compaction once it exceeds the live data.
+
+Cold records can be moved into read-only, zlib-compressed archive segments
+(segment numbers above 0 in the index). They stay reachable by position
+but are never kept in memory: only hot records are cached once decoded.
+What every record, archived or not, still costs in memory is its index
+entry: id, bot id and timestamp, plus 16 bytes of location.
+
+Only one process may write a store: the API server and the offline CLIs
+take DataDirLock on its directory first.
+"""
+import fcntl
+import json
+from array import array
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from interview_record import InterviewRecord
+
+# DATA_DIR lets several nodes (shards) run from one checkout
+DATA_DIR = Path(os.getenv('DATA_DIR') or Path(__file__).parent)
+DATA_FILE = DATA_DIR / "interviews_data.json"  # legacy format, migrated on first load
+SNAPSHOT_FILE = DATA_DIR / "interviews_data.snap"
+
+MAGIC = b'IVSNAP\x00\x01'
+FORMAT_VERSION = 2
+HEADER = struct.Struct('<8sIIQQ')
+ENTRY = struct.Struct('<IQIHHH')
+ENTRY_V1 = struct.Struct('<QIHHH')
+NO_BOT = 0xFFFF
+HOT = 0  # segment number of the snapshot itself
+
+SEGMENT_MAGIC = b'IVSEG\x00\x00\x01'
+SEGMENT_HEADER = struct.Struct('<8sIQQ')  # magic, record count, footer offset, footer length
+
+class _Refs:
+    """Locations (segment, offset, length) of stored records, or None, packed into arrays"""
+
+    NONE = 0xFFFFFFFF  # segment number marking a record not stored yet
+
+    def __init__(self, refs=()):
+        self._segments = array('I')
+        self._offsets = array('Q')
+        self._lengths = array('I')
+        for ref in refs:
+            self.append(ref)
+
+    def __len__(self):
+        return len(self._segments)
+
+    def __getitem__(self, idx):
+        segment = self._segments[idx]
+        if segment == self.NONE:
+            return None
+        return segment, self._offsets[idx], self._lengths[idx]
+
+    def __setitem__(self, idx, ref):
+        segment, offset, length = ref if ref is not None else (self.NONE, 0, 0)
+        self._segments[idx] = segment
+        self._offsets[idx] = offset
+        self._lengths[idx] = length
+
+    def __iter__(self):
+        for idx in range(len(self)):
+            yield self[idx]
+
+    def append(self, ref):
+        segment, offset, length = ref if ref is not None else (self.NONE, 0, 0)
+        self._segments.append(segment)
+        self._offsets.append(offset)
+        self._lengths.append(length)
+
+def parse_timestamp(value):
+    """Parse an ISO timestamp as naive local time, returning None if it is not one
+
+    Interviews are stamped with naive local times, so aware values (such as
+    ...Z) are converted to local time to stay comparable with them.
+    """
+    if isinstance(value, datetime):
+        timestamp = value
+    else:
+        try:
+            timestamp = datetime.fromisoformat(str(value))
+        except (TypeError, ValueError):
+            return None
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone().replace(tzinfo=None)
+    return timestamp
+
+def parse_time_filter(value, name='timestamp'):
+    """Parse a since/until filter: None when unset, ValueError when it isn't an ISO timestamp"""
+    if value is None or value == '':
+        return None
+    timestamp = parse_timestamp(value)
+    if timestamp is None:
+        raise ValueError(f"{name} must be an ISO 8601 timestamp, got {value!r}")
+    return timestamp
+
+def encode_record(record):
+    """Serialize a record for the snapshot"""
+    return json.dumps(InterviewRecord.coerce(record).to_stored(), separators=(',', ':')).encode('utf-8')
+
+def _record_meta(record):
+    return (str(record.get('id')), record.get('bot_id'), str(record.get('timestamp') or ''))
+
+class InterviewStore:
+    """List-like interview store backed by a binary snapshot file
+
+    Supports len(), indexing (including negative), assignment, append and
+    iteration like the plain list it replaces. Records are stored as
+    immutable InterviewRecords: assign a new record (or dict) to change one.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._lock = threading.RLock()
+        self._flush_lock = threading.Lock()
+        self._metas = []      # (id, bot_id, timestamp) per record
+        self._refs = _Refs()  # (segment, offset, length) of the stored copy, or None
+        self._objs = {}       # position -> materialized record; hot or unsaved records only
+        self._dirty = set()
+        self._change_seq = 0
+        self._saved_seq = 0
+        self._mmap = None
+        self._segments = {}  # segment number -> mmap
+        self._file_size = 0
+        self._live_bytes = 0
+        self.archive_dir = self.path.with_suffix('.archive')
+
+    # Loading
+
+    def load(self, legacy_json=None):
+        """Open the snapshot, migrating from a legacy JSON file if there is none yet"""
+        if self.path.exists():
+            with self._lock:
+                self._open()
+        elif legacy_json and Path(legacy_json).exists():
+            with open(legacy_json, 'r') as f:
+                records = json.load(f)
+            with self._lock:
+                self._reset()
+                for record in records:
+                    self.append(record)
+            self.flush()
+        else:
+            with self._lock:
+                self._reset()
+        return self
+
+    def _reset(self):
+        self._metas, self._refs, self._objs = [], _Refs(), {}
+        self._dirty = set()
+        self._live_bytes = 0
+
+    def _open(self):
+        with open(self.path, 'rb') as f:
+            header = f.read(HEADER.size)
+            magic, version, count, index_offset, index_length = HEADER.unpack(header)
+            if magic != MAGIC or version not in (1, FORMAT_VERSION):
+                raise ValueError(f"{self.path} is not an interview snapshot")
+            f.seek(index_offset)
+            index = f.read(index_length)
+        self._reset()
+        pos = 0
+        entry = ENTRY if version == FORMAT_VERSION else ENTRY_V1
+        for _ in range(count):
+            if version == FORMAT_VERSION:
+                segment, offset, length, id_len, bot_len, ts_len = entry.unpack_from(index, pos)
+            else:
+                segment = HOT
+                offset, length, id_len, bot_len, ts_len = entry.unpack_from(index, pos)
+            pos += entry.size
+            record_id = index[pos:pos + id_len].decode('utf-8')
+            pos += id_len
+            bot_id = None
+            if bot_len != NO_BOT:
+                bot_id = index[pos:pos + bot_len].decode('utf-8')
+                pos += bot_len
+            timestamp = index[pos:pos + ts_len].decode('utf-8')
+            pos += ts_len
+            self._metas.append((record_id, bot_id, timestamp))
+            self._refs.append((segment, offset, length))
+            if segment == HOT:
+                self._live_bytes += length
+        self._remap()
+
+    def _remap(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file_size = self.path.stat().st_size
+        with open(self.path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    # List protocol
+
+    def __len__(self):
+        return len(self._metas)
+
+    def __bool__(self):
+        return bool(self._metas)
+
+    def __getitem__(self, idx):
+        with self._lock:
+            idx = self._normalize(idx)
+            record = self._objs.get(idx)
+            if record is None:
+                record = self._read(idx)
+                if self._refs[idx][0] == HOT:
+                    self._objs[idx] = record
+            return record
+
+    def __setitem__(self, idx, record):
+        record = InterviewRecord.coerce(record)
+        with self._lock:
+            idx = self._normalize(idx)
+            self._objs[idx] = record
+            self._metas[idx] = _record_meta(record)
+            self._mark_dirty(idx)
+
+    def __iter__(self):
+        for idx in range(len(self)):
+            yield self[idx]
+
+    def append(self, record):
+        record = InterviewRecord.coerce(record)
+        with self._lock:
+            self._metas.append(_record_meta(record))
+            self._refs.append(None)
+            self._objs[len(self._metas) - 1] = record
+            self._mark_dirty(len(self._metas) - 1)
+
+    def _normalize(self, idx):
+        if idx < 0:
+            idx += len(self._metas)
+        if not 0 <= idx < len(self._metas):
+            raise IndexError("interview index out of range")
+        return idx
+
+    def _mark_dirty(self, idx):
+        self._dirty.add(idx)
+        self._change_seq += 1
+
+    # Index-only access
+
+    def meta(self, idx):
+        """(id, bot_id, timestamp) of a record without reading it"""
+        return self._metas[self._normalize(idx)]
+
+    def index_of(self, record):
+        """Position of this exact record object, or None"""
+        with self._lock:
+            for idx, obj in self._objs.items():
+                if obj is record:
+                    return idx
+        return None
+
+    def iter_uncached(self, indices=None):
+        """Yield every record (or those at the given positions) without keeping it in memory"""
+        for idx in (range(len(self)) if indices is None else indices):
+            with self._lock:
+                record = self._objs.get(idx)
+                if record is None:
+                    record = self._read(idx)
+            yield record
+
+    def _read(self, idx):
+        segment, offset, length = self._refs[idx]
+        if segment == HOT:
+            data = self._mmap[offset:offset + length]
+        else:
+            data = zlib.decompress(self._segment(segment)[offset:offset + length])
+        return InterviewRecord.from_stored(json.loads(data))
+
+    def _segment(self, segment):
+        if segment not in self._segments:
+            with open(self._segment_path(segment), 'rb') as f:
+                self._segments[segment] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._segments[segment]
+
+    def _segment_path(self, segment):
+        return self.archive_dir / f"segment-{segment:06d}.seg"
+
+    def is_archived(self, idx):
+        """Whether a record currently lives in an archive segment"""
+        with self._lock:
+            idx = self._normalize(idx)
+            ref = self._refs[idx]
+            return ref is not None and ref[0] != HOT and idx not in self._dirty
+
+    # Persistence
+
+    def flush(self):
+        """Write changed records, a new index and the header
+
+        Concurrent callers are coalesced: a flush that starts after your
+        change was made covers it, so only one of them writes.
+        """
+        with self._lock:
+            wanted = self._change_seq
+        with self._flush_lock:
+            if self._saved_seq >= wanted:
+                return
+            with self._lock:
+                dirty = sorted(self._dirty)
+                written = {idx: self._objs[idx] for idx in dirty}
+                metas = list(self._metas)
+                refs = list(self._refs)
+                self._dirty.clear()
+                seq = self._change_seq
+
+            new_refs = self._write(written, metas, refs)
+
+            with self._lock:
+                for idx, ref in new_refs.items():
+                    # A newer version may have been stored meanwhile; it stays dirty
+                    if self._objs.get(idx) is written[idx]:
+                        old = self._refs[idx]
+                        self._live_bytes += ref[2] - (old[2] if old and old[0] == HOT else 0)
+                        self._refs[idx] = ref
+                self._remap()
+                self._saved_seq = seq
+            if self._file_size > 2 * self._live_bytes + (1 << 20):
+                self._compact()
+
+    def _write(self, written, metas, refs):
+        if not self.path.exists():
+            with open(self.path, 'wb') as f:
+                f.write(HEADER.pack(MAGIC, FORMAT_VERSION, 0, HEADER.size, 0))
+        new_refs = {}
+        with open(self.path, 'r+b') as f:
+            f.seek(0, os.SEEK_END)
+            for idx, record in written.items():
+                data = encode_record(record)
+                new_refs[idx] = (HOT, f.tell(), len(data))
+                f.write(data)
+                refs[idx] = new_refs[idx]
+            index_offset = f.tell()
+            count, index = _encode_index(metas, refs)
+            f.write(index)
+            f.flush()
+            os.fsync(f.fileno())
+            # Only now point the header at the new index
+            f.seek(0)
+            f.write(HEADER.pack(MAGIC, FORMAT_VERSION, count, index_offset, len(index)))
+            f.flush()
+            os.fsync(f.fileno())
+        return new_refs
+
+    def _compact(self):
+        """Rewrite the snapshot with live records only (runs under the flush lock)"""
+        with self._lock:
+            metas = list(self._metas)
+            refs = list(self._refs)
+            source = self._mmap
+            tmp_path = self.path.with_suffix('.compact')
+            new_refs = []
+            with open(tmp_path, 'wb') as f:
+                f.write(HEADER.pack(MAGIC, FORMAT_VERSION, 0, HEADER.size, 0))
+                for ref in refs:
+                    if ref is None or ref[0] != HOT:
+                        new_refs.append(ref)
+                        continue
+                    segment, offset, length = ref
+                    new_refs.append((HOT, f.tell(), length))
+                    f.write(source[offset:offset + length])
+                index_offset = f.tell()
+                count, index = _encode_index(metas, new_refs)
+                f.write(index)
+                f.seek(0)
+                f.write(HEADER.pack(MAGIC, FORMAT_VERSION, count, index_offset, len(index)))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+            self._refs = _Refs(new_refs)
+            self._live_bytes = sum(ref[2] for ref in new_refs if ref and ref[0] == HOT)
+            self._remap()
+
+    # Archiving
+
+    def archive_cold(self, max_age_days=None, hot_max=None):
+        """Move old records into a compressed archive segment, returning how many moved
+
+        A record is cold when its timestamp is older than max_age_days, or when
+        it is among the oldest beyond the newest hot_max records kept hot.
+        Records changed since the last flush are left alone.
+        """
+        with self._flush_lock:
+            with self._lock:
+                candidates = self._cold_candidates(max_age_days, hot_max)
+                if not candidates:
+                    return 0
+                # Copy the blobs out now: the snapshot mmap is only replaced under the flush lock
+                blobs = [(idx, self._refs[idx], self._mmap[self._refs[idx][1]:self._refs[idx][1] + self._refs[idx][2]])
+                         for idx in candidates]
+                ids = [self._metas[idx][0] for idx in candidates]
+            segment = self._next_segment()
+            seg_refs = self._write_segment(segment, ids, [blob for _, _, blob in blobs])
+
+            with self._lock:
+                moved = 0
+                for (idx, ref, _), seg_ref in zip(blobs, seg_refs):
+                    # Skip records replaced while the segment was being written
+                    if self._refs[idx] != ref or idx in self._dirty:
+                        continue
+                    self._refs[idx] = (segment,) + seg_ref
+                    self._objs.pop(idx, None)
+                    self._live_bytes -= ref[2]
+                    moved += 1
+                # The index must be rewritten even though no record is dirty
+                self._change_seq += 1
+        self.flush()
+        return moved
+
+    def _cold_candidates(self, max_age_days, hot_max):
+        hot = [idx for idx, ref in enumerate(self._refs)
+               if ref is not None and ref[0] == HOT and idx not in self._dirty]
+        cold = set()
+        if max_age_days is not None:
+            cutoff = (datetime.now() - timedelta(days=max_age_days)).isoformat()
+            cold.update(idx for idx in hot if self._metas[idx][2] and self._metas[idx][2] < cutoff)
+        if hot_max is not None:
+            remaining = [idx for idx in hot if idx not in cold]
+            excess = len(remaining) + len(self._dirty) - hot_max
+            if excess > 0:
+                remaining.sort(key=lambda idx: (self._metas[idx][2], idx))
+                cold.update(remaining[:excess])
+        return sorted(cold)
+
+    def _next_segment(self):
+        existing = [int(p.stem.split('-')[1]) for p in self.archive_dir.glob('segment-*.seg')]
+        used = {ref[0] for ref in self._refs if ref is not None}
+        return max(existing + list(used) + [HOT]) + 1
+
+    def _write_segment(self, segment, ids, blobs):
+        """Write a read-only segment of compressed blobs, returning (offset, length) per blob
+
+        The footer lists (id, offset, length) so a segment can be inspected on its own.
+        """
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        path = self._segment_path(segment)
+        tmp_path = path.with_suffix('.tmp')
+        refs = []
+        with open(tmp_path, 'wb') as f:
+            f.write(SEGMENT_HEADER.pack(SEGMENT_MAGIC, 0, 0, 0))
+            for blob in blobs:
+                data = zlib.compress(blob, 6)
+                refs.append((f.tell(), len(data)))
+                f.write(data)
+            footer_offset = f.tell()
+            footer = json.dumps([[record_id, offset, length] for record_id, (offset, length) in zip(ids, refs)],
+                                separators=(',', ':')).encode('utf-8')
+            f.write(footer)
+            f.seek(0)
+            f.write(SEGMENT_HEADER.pack(SEGMENT_MAGIC, len(blobs), footer_offset, len(footer)))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        return refs
+
+    def stats(self):
+        """Record counts and file usage"""
+        with self._lock:
+            return {
+                "records": len(self._metas),
+                "materialized": len(self._objs),
+                "archived": sum(1 for ref in self._refs if ref and ref[0] != HOT),
+                "segments": len(list(self.archive_dir.glob('segment-*.seg'))) if self.archive_dir.exists() else 0,
+                "dirty": len(self._dirty),
+                "file_bytes": self._file_size,
+                "live_bytes": self._live_bytes
+            }
+
+class Archiver:
+    """Background thread moving cold interviews out of memory into archive segments"""
+
+    def __init__(self, store, max_age_days=30, hot_max=5000, interval=300):
+        self.store = store
+        self.max_age_days = max_age_days
+        self.hot_max = hot_max
+        self.interval = interval
+        self.last_run = None
+        self._stop = threading.Event()
+
+    def run_once(self):
+        started = time.time()
+        moved = self.store.archive_cold(self.max_age_days, self.hot_max)
+        self.last_run = {"archived": moved, "took_ms": round((time.time() - started) * 1000, 1),
+                         "at": datetime.now().isoformat()}
+        if moved:
+            print(f"🗄️  Archived {moved} cold interviews in {self.last_run['took_ms']}ms")
+        return moved
+
+    def start(self):
+        def loop():
+            while not self._stop.wait(self.interval):
+                try:
+                    self.run_once()
+                except Exception as e:
+                    print(f"Archiver error: {e}")
+        threading.Thread(target=loop, daemon=True, name='interview-archiver').start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+def archiver_from_env(store):
+    """Build an archiver from ARCHIVE_* / HOT_MAX_INTERVIEWS environment variables"""
+    max_age = os.getenv('ARCHIVE_AFTER_DAYS', '30')
+    hot_max = os.getenv('HOT_MAX_INTERVIEWS', '5000')
+    return Archiver(
+        store,
+        max_age_days=float(max_age) if max_age else None,
+        hot_max=int(hot_max) if hot_max else None,
+        interval=float(os.getenv('ARCHIVE_INTERVAL', '300'))
+    )
+
+class DataDirLock:
+    """Advisory lock on a data directory, held by whichever process writes its store"""
+
+    def __init__(self, directory=DATA_DIR):
+        self.path = Path(directory) / "store.lock"
+        self._file = None
+
+    def acquire(self):
+        """Take the lock without waiting; returns False if another process holds it"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, 'a')
+        try:
+            fcntl.flock(self._file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            self._file.close()
+            self._file = None
+            return False
+        return True
+
+    def release(self):
+        if self._file is not None:
+            fcntl.flock(self._file, fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
+
+def _encode_index(metas, refs):
+    """Encode index entries for stored records, returning (count, bytes)"""
+    parts = []
+    count = 0
+    for (record_id, bot_id, timestamp), ref in zip(metas, refs):
+        if ref is None:
+            # Appended after the last flush; it is written by the next one
+            continue
+        count += 1
+        id_bytes = record_id.encode('utf-8')
+        bot_bytes = str(bot_id).encode('utf-8') if bot_id is not None else b''
+        ts_bytes = timestamp.encode('utf-8')
+        parts.append(ENTRY.pack(ref[0], ref[1], ref[2], len(id_bytes),
+                                len(bot_bytes) if bot_id is not None else NO_BOT, len(ts_bytes)))
+        parts.append(id_bytes)
+        parts.append(bot_bytes)
+        parts.append(ts_bytes)
+    return count, b''.join(parts)
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Durable job queue for CPU-heavy interview processing
+Jobs are persisted in SQLite and consumed by a pool of worker processes,
+so analysis scales across cores and survives restarts while the API
+process only stores chunks and applies finished results.
+
+Jobs for the same interview and kind are coalesced while they wait: a new
+transcript chunk replaces the queued job instead of adding another one.
+
+Usage:
+  python3 job_queue.py --workers 4        # run workers next to the API server
+  python3 job_queue.py --stats
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from interview_analysis import analyze_interview
+from interview_store import DATA_DIR
+from n8n_backend_service import N8NBackendService
+from profiler import profiler
+from result_cache import transcript_hash
+
+QUEUE_FILE = DATA_DIR / "analysis_jobs.db"
+JOB_LEASE = float(os.getenv('JOB_LEASE_SECONDS', '120'))
+MAX_ATTEMPTS = 3
+MAX_IDLE_POLL = 1.0  # idle pollers back off to this interval
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_until REAL,
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_by_status ON jobs (status, id);
+CREATE INDEX IF NOT EXISTS jobs_by_key ON jobs (kind, key, status);
+"""
+
+class JobQueue:
+    """SQLite-backed job queue shared by the API process and the workers"""
+
+    def __init__(self, path=QUEUE_FILE):
+        self.path = Path(path)
+        self._local = threading.local()
+        self._connection().executescript(SCHEMA)
+
+    def _connection(self):
+        # sqlite3 connections can't be shared between threads
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _connect(self):
+        return _Transaction(self._connection())
+
+    def enqueue(self, kind, key, payload, coalesce=True):
+        """Add a job, or replace the payload of the same interview's queued job; returns the job id"""
+        now = time.time()
+        data = json.dumps(payload, separators=(',', ':'))
+        with self._connect() as conn:
+            if coalesce:
+                row = conn.execute("SELECT id FROM jobs WHERE kind = ? AND key = ? AND status = 'queued'",
+                                   (kind, key)).fetchone()
+                if row:
+                    conn.execute("UPDATE jobs SET payload = ?, updated_at = ? WHERE id = ?", (data, now, row[0]))
+                    return row[0]
+            cursor = conn.execute(
+                "INSERT INTO jobs (kind, key, payload, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (kind, key, data, now, now))
+            return cursor.lastrowid
+
+    def claim(self, lease=JOB_LEASE):
+        """Take the oldest runnable job as (id, kind, key, payload), or None
+
+        Jobs whose worker died are picked up again once their lease expires.
+        Finding a job is a plain read, so idle workers never contend for the
+        write lock; it is only taken to claim a job that was found.
+        """
+        runnable = "(status = 'queued' OR (status = 'running' AND lease_until < ?))"
+        while True:
+            now = time.time()
+            row = self._connection().execute(
+                f"SELECT id FROM jobs WHERE {runnable} ORDER BY id LIMIT 1", (now,)).fetchone()
+            if not row:
+                return None
+            with self._connect() as conn:
+                claimed = conn.execute(
+                    f"UPDATE jobs SET status = 'running', attempts = attempts + 1, lease_until = ?, "
+                    f"updated_at = ? WHERE id = ? AND {runnable}", (now + lease, now, row[0], now)).rowcount
+                if claimed:
+                    # Read the payload under the lock: a coalescing enqueue may have just replaced it
+                    job = conn.execute("SELECT id, kind, key, payload FROM jobs WHERE id = ?", (row[0],)).fetchone()
+                    return job[0], job[1], job[2], json.loads(job[3])
+            # Another worker claimed it first; look again
+
+    def complete(self, job_id, result):
+        with self._connect() as conn:
+            conn.execute("UPDATE jobs SET status = 'done', result = ?, payload = '{}', lease_until = NULL, "
+                         "updated_at = ? WHERE id = ?",
+                         (json.dumps(result, separators=(',', ':')), time.time(), job_id))
+
+    def fail(self, job_id, error, max_attempts=MAX_ATTEMPTS):
+        """Record a failure; the job is retried until it has been attempted max_attempts times
+
+        max_attempts=0 fails it for good.
+        """
+        with self._connect() as conn:
+            conn.execute("UPDATE jobs SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'queued' END, "
+                         "error = ?, lease_until = NULL, updated_at = ? WHERE id = ?",
+                         (max_attempts, str(error), time.time(), job_id))
+
+    def finished(self, limit=100):
+        """Completed jobs waiting to be applied, as (id, kind, key, result)"""
+        rows = self._connection().execute(
+            "SELECT id, kind, key, result FROM jobs WHERE status = 'done' ORDER BY id LIMIT ?", (limit,)).fetchall()
+        return [(job_id, kind, key, json.loads(result)) for job_id, kind, key, result in rows]
+
+    def failed(self, limit=100):
+        """Jobs that failed for good, as (id, kind, key, payload, error)"""
+        rows = self._connection().execute(
+            "SELECT id, kind, key, payload, error FROM jobs WHERE status = 'failed' ORDER BY id LIMIT ?",
+            (limit,)).fetchall()
+        return [(job_id, kind, key, json.loads(payload), error) for job_id, kind, key, payload, error in rows]
+
+    def ack(self, job_ids):
+        """Remove applied jobs"""
+        with self._connect() as conn:
+            conn.executemany("DELETE FROM jobs WHERE id = ?", [(job_id,) for job_id in job_ids])
+
+    def renew(self, job_id, lease=JOB_LEASE):
+        """Extend the lease of a running job; False once it has been lost to another worker"""
+        now = time.time()
+        with self._connect() as conn:
+            return conn.execute("UPDATE jobs SET lease_until = ?, updated_at = ? "
+                                "WHERE id = ? AND status = 'running'", (now + lease, now, job_id)).rowcount > 0
+
+    def stats(self):
+        """Job counts by status"""
+        rows = self._connection().execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        counts = {"queued": 0, "running": 0, "done": 0, "failed": 0}
+        counts.update(dict(rows))
+        return counts
+
+class _Transaction:
+    """BEGIN IMMEDIATE ... COMMIT around a block, so claims never race"""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        return False
+
+# Job handlers (run in the worker processes)
+
+def run_job(kind, payload):
+    """Execute one job and return its JSON result"""
+    if kind == 'analyze':
+        transcript = payload.get('transcript', '')
+        analysis = analyze_interview(transcript, payload.get('audio_duration'), rubric=payload.get('rubric'))
+        analysis.pop('transcript', None)  # the record already holds it
+        return {"analysis": analysis, "transcript_sha256": transcript_hash(transcript)}
+    if kind == 'enhance':
+        result = N8NBackendService().process_interview_data(payload) or {}
+        return {"n8n_enhanced": result.get('n8n_enhanced'),
+                "transcript_sha256": transcript_hash(payload.get('transcript', ''))}
+    raise ValueError(f"Unknown job kind '{kind}'")
+
+def _worker_loop(path, poll_interval, parent_pid):
+    queue = JobQueue(path)
+    idle_poll = poll_interval
+    while True:
+        job = queue.claim()
+        if job is None:
+            if parent_pid and os.getppid() != parent_pid:
+                return  # the API server went away
+            time.sleep(idle_poll)
+            idle_poll = min(MAX_IDLE_POLL, idle_poll * 2)
+            continue
+        idle_poll = poll_interval
+        job_id, kind, key, payload = job
+        # Keep the lease alive while the job runs, so only jobs of dead workers expire
+        done = threading.Event()
+        threading.Thread(target=_renew_lease, args=(path, job_id, done), daemon=True).start()
+        try:
+            with profiler.profile(f"job {kind} {key}"):
+                result = run_job(kind, payload)
+            queue.complete(job_id, result)
+        except Exception as e:
+            print(f"⚠️  Job {job_id} ({kind} {key}) failed: {e}")
+            queue.fail(job_id, e)
+        finally:
+            done.set()
+
+def _renew_lease(path, job_id, done):
+    queue = JobQueue(path)
+    while not done.wait(JOB_LEASE / 3):
+        if not queue.renew(job_id):
+            return
+
+class WorkerPool:
+    """Worker processes consuming a JobQueue"""
+
+    def __init__(self, path=QUEUE_FILE, workers=None, poll_interval=0.05):
+        self.path = Path(path)
+        self.workers = workers or os.cpu_count() or 1
+        self.poll_interval = poll_interval
+        self.processes = []
+
+    def start(self, attach=True):
+        """Start the workers; attached workers exit when this process does"""
+        context = multiprocessing.get_context('spawn')
+        parent_pid = os.getpid() if attach else None
+        for i in range(self.workers):
+            process = context.Process(target=_worker_loop, name=f"analysis-worker-{i}",
+                                      args=(str(self.path), self.poll_interval, parent_pid), daemon=attach)
+            process.start()
+            self.processes.append(process)
+        return self
+
+    def stop(self):
+        for process in self.processes:
+            process.terminate()
+        for process in self.processes:
+            process.join()
+        self.processes = []
+
+    def alive(self):
+        return sum(1 for process in self.processes if process.is_alive())
+
+def main():
+    parser = argparse.ArgumentParser(description="Analysis job queue workers")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument('--queue-file', default=str(QUEUE_FILE), help="SQLite job queue")
+    parser.add_argument('--stats', action='store_true', help="Print job counts and exit")
+    args = parser.parse_args()
+
+    queue = JobQueue(args.queue_file)
+    if args.stats:
+        print(json.dumps(queue.stats(), indent=2))
+        return
+
+    pool = WorkerPool(args.queue_file, args.workers)
+    print(f"{'='*60}")
+    print("Analysis Workers")
+    print(f"{'='*60}")
+    print(f"  Queue:   {args.queue_file}")
+    print(f"  Workers: {pool.workers}")
+    print(f"{'='*60}\n")
+    pool.start(attach=False)
+    try:
+        for process in pool.processes:
+            process.join()
+    except KeyboardInterrupt:
+        pool.stop()
+
+if __name__ == '__main__':
+    main()
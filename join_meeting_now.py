@@ -7,8 +7,9 @@ import json
 import sys
 import os
 from config import RECALL_API_TOKEN
+import rate_limiter
 
-API_BASE_URL = "https://us-west-2.recall.ai"
+API_BASE_URL = os.getenv("RECALL_API_BASE_URL", "https://us-west-2.recall.ai")
 API_ENDPOINT = f"{API_BASE_URL}/api/v1/bot/"
 
 def create_immediate_join_bot(meeting_url, webhook_url, ngrok_url=None):
@@ -99,7 +100,7 @@ def create_immediate_join_bot(meeting_url, webhook_url, ngrok_url=None):
         print(f"   URL: {camera_url}")
         print(f"   Make sure ngrok is running and API server is accessible")
     
-    return requests.post(API_ENDPOINT, json=payload, headers=headers)
+    return rate_limiter.post('recall', API_ENDPOINT, json=payload, headers=headers)
 
 def main():
     print(f"\n{'='*70}")
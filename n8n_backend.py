@@ -1,20 +1,67 @@
 #!/usr/bin/env python3
 """
 n8n Backend Service - Processes interview data through n8n workflows
+
+Usage:
+  python3 n8n_backend.py                        # test the connection
+  python3 n8n_backend.py --backfill --batch-size 50
 """
+import argparse
+import itertools
 import requests
 import json
 import os
 from datetime import datetime
 from config import N8N_MCP_URL, N8N_MCP_JWT
+from result_cache import n8n_result_cache, transcript_hash
+from interview_store import DATA_FILE, SNAPSHOT_FILE, InterviewStore
+import circuit_breaker
+from transcript_features import features_for
+
+MCP_BATCH_MAX_ITEMS = int(os.getenv('MCP_BATCH_MAX_ITEMS', '50'))
+MCP_BATCH_MAX_BYTES = int(os.getenv('MCP_BATCH_MAX_BYTES', str(2 * 1024 * 1024)))
+
+def mcp_payload(interview_data):
+    """MCP params for processing one interview, with its transcript features precomputed"""
+    transcript = interview_data.get("transcript", "")
+    analysis = interview_data.get("analysis", {})
+    return {
+        "interview_id": interview_data.get("id"),
+        "transcript": transcript,
+        "timestamp": interview_data.get("timestamp"),
+        "meeting_url": interview_data.get("meeting_url"),
+        "analysis": analysis,
+        "features": features_for(transcript or "", (analysis or {}).get("features")).to_dict(),
+        "raw_data": interview_data.get("raw_data", {})
+    }
+
+def pack_batches(items, max_items=MCP_BATCH_MAX_ITEMS, max_bytes=MCP_BATCH_MAX_BYTES):
+    """Split encoded items into batches within the item and size limits
+
+    Yields lists of (position, encoded) pairs. An item larger than max_bytes
+    is sent in a batch of its own.
+    """
+    batch, size = [], 2
+    for position, encoded in items:
+        if batch and (len(batch) >= max_items or size + len(encoded) + 1 > max_bytes):
+            yield batch
+            batch, size = [], 2
+        batch.append((position, encoded))
+        size += len(encoded) + 1
+    if batch:
+        yield batch
 
 class N8NBackend:
     """n8n Backend for interview processing"""
     
-    def __init__(self, mcp_url=None, jwt=None):
+    def __init__(self, mcp_url=None, jwt=None, cache=None, max_wait=None):
         self.mcp_url = mcp_url or N8N_MCP_URL
+        self.max_wait = max_wait  # for the n8n quota; keep it small on request paths
         self.jwt = jwt or N8N_MCP_JWT
+        self.cache = cache or n8n_result_cache
         self.local_webhook = os.getenv('N8N_WEBHOOK_URL', 'http://localhost:5678/webhook/interview-webhook')
+        self.rpc_accepted = None  # whether the MCP server takes JSON-RPC style calls, once known
+        self._rpc_ids = itertools.count(1)
     
     def send_to_mcp(self, data, endpoint="process-interview"):
         """Send data to n8n MCP server"""
@@ -36,25 +83,76 @@ class N8NBackend:
         }
         
         try:
-            response = requests.post(url, json=payload, headers=headers, timeout=10)
-            if response.status_code == 200:
-                result = response.json()
-                return result.get('result') if isinstance(result, dict) else result
-            else:
-                # Try direct POST to the URL
-                response = requests.post(url, json=data, headers=headers, timeout=10)
+            if self.rpc_accepted is not False:
+                response = circuit_breaker.post(url, rate_limit='n8n', max_wait=self.max_wait, json=payload, headers=headers, timeout=10)
                 if response.status_code == 200:
-                    return response.json()
-                print(f"n8n MCP error: {response.status_code}")
-                return None
+                    self.rpc_accepted = True
+                    result = response.json()
+                    return result.get('result') if isinstance(result, dict) else result
+                if self.rpc_accepted:
+                    # The server does take JSON-RPC calls, so this one just failed
+                    print(f"n8n MCP error: {response.status_code}")
+                    return None
+            # Try direct POST to the URL
+            response = circuit_breaker.post(url, rate_limit='n8n', max_wait=self.max_wait, json=data, headers=headers, timeout=10)
+            if response.status_code == 200:
+                self.rpc_accepted = False
+                return response.json()
+            print(f"n8n MCP error: {response.status_code}")
+            return None
         except Exception as e:
             print(f"Error sending to n8n MCP: {e}")
             return None
     
+    def send_batch_to_mcp(self, items, endpoint="process-interview",
+                          max_items=MCP_BATCH_MAX_ITEMS, max_bytes=MCP_BATCH_MAX_BYTES):
+        """Send many calls as JSON-RPC batches, returning one result per item (None on failure)
+
+        Items are packed into batches of at most max_items calls and
+        max_bytes of JSON; results are matched back to items by request id.
+        """
+        results = [None] * len(items)
+        if not self.mcp_url or not items:
+            return results
+        headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {self.jwt}"
+        }
+
+        ids = {}
+        encoded = []
+        for position, params in enumerate(items):
+            request_id = next(self._rpc_ids)
+            ids[request_id] = position
+            call = {"jsonrpc": "2.0", "id": request_id, "method": endpoint, "params": params}
+            encoded.append((position, json.dumps(call, separators=(',', ':'))))
+
+        for batch in pack_batches(encoded, max_items, max_bytes):
+            body = "[" + ",".join(call for _, call in batch) + "]"
+            try:
+                response = circuit_breaker.post(self.mcp_url, rate_limit='n8n', max_wait=self.max_wait,
+                                                data=body.encode('utf-8'), headers=headers, timeout=30)
+                replies = response.json() if response.status_code == 200 else None
+            except Exception as e:
+                print(f"Error sending batch to n8n MCP: {e}")
+                continue
+            if not isinstance(replies, list):
+                print(f"n8n MCP batch error: {response.status_code}")
+                continue
+            for reply in replies:
+                position = ids.get(reply.get('id')) if isinstance(reply, dict) else None
+                if position is None:
+                    continue
+                if 'error' in reply:
+                    print(f"n8n MCP error for item {position}: {reply['error']}")
+                else:
+                    results[position] = reply.get('result')
+        return results
+    
     def send_to_local_webhook(self, data):
         """Send data to local n8n webhook"""
         try:
-            response = requests.post(self.local_webhook, json=data, timeout=5)
+            response = circuit_breaker.post(self.local_webhook, json=data, timeout=5)
             if response.status_code == 200:
                 return response.json()
             return None
@@ -68,14 +166,7 @@ class N8NBackend:
         
         if self.mcp_url and self.jwt:
             print("🔄 Processing via n8n MCP...")
-            result = self.send_to_mcp({
-                "interview_id": interview_data.get("id"),
-                "transcript": interview_data.get("transcript", ""),
-                "timestamp": interview_data.get("timestamp"),
-                "meeting_url": interview_data.get("meeting_url"),
-                "analysis": interview_data.get("analysis", {}),
-                "raw_data": interview_data.get("raw_data", {})
-            }, "process-interview")
+            result = self.send_to_mcp(mcp_payload(interview_data), "process-interview")
         
         if not result:
             print("🔄 Trying local n8n webhook...")
@@ -83,24 +174,68 @@ class N8NBackend:
         
         return result
     
+    def process_interviews(self, interviews, max_items=MCP_BATCH_MAX_ITEMS):
+        """Process many interviews through n8n MCP in batches, returning results in order"""
+        if not (self.mcp_url and self.jwt):
+            return [None] * len(interviews)
+        return self.send_batch_to_mcp([mcp_payload(interview) for interview in interviews],
+                                      "process-interview", max_items=max_items)
+    
     def enhance_analysis(self, interview_id, transcript):
-        """Get enhanced analysis from n8n"""
+        """Get enhanced analysis from n8n (cached until the transcript changes)"""
         if self.mcp_url and self.jwt:
-            return self.send_to_mcp({
-                "interview_id": interview_id,
-                "transcript": transcript
-            }, "get-analysis")
+            return self.cache.get_or_compute(
+                ("get-analysis", interview_id, transcript_hash(transcript)),
+                lambda: self.send_to_mcp({
+                    "interview_id": interview_id,
+                    "transcript": transcript
+                }, "get-analysis"))
         return None
     
-    def generate_report(self, interview_id):
-        """Generate comprehensive report via n8n"""
+    def generate_report(self, interview_id, transcript=None):
+        """Generate comprehensive report via n8n (cached until the transcript changes)"""
         if self.mcp_url and self.jwt:
-            return self.send_to_mcp({
-                "interview_id": interview_id
-            }, "generate-report")
+            return self.cache.get_or_compute(
+                ("generate-report", interview_id, transcript_hash(transcript) if transcript is not None else None),
+                lambda: self.send_to_mcp({
+                    "interview_id": interview_id
+                }, "generate-report"))
         return None
 
-if __name__ == '__main__':
+def backfill(batch_size=MCP_BATCH_MAX_ITEMS, include_enhanced=False):
+    """Send stored interviews without n8n results through n8n MCP in batches"""
+    backend = N8NBackend()
+    if not (backend.mcp_url and backend.jwt):
+        print("✗ N8N_MCP_URL and N8N_MCP_JWT must be set")
+        return False
+    store = InterviewStore(SNAPSHOT_FILE).load(legacy_json=DATA_FILE)
+    positions = [idx for idx, interview in enumerate(store.iter_uncached())
+                 if include_enhanced or not interview.get('n8n_enhanced')]
+    print(f"📦 {len(positions)} interviews to process in batches of {batch_size}")
+
+    processed = 0
+    for start in range(0, len(positions), batch_size):
+        chunk = positions[start:start + batch_size]
+        interviews = [store[idx].to_dict() for idx in chunk]
+        for idx, result in zip(chunk, backend.process_interviews(interviews, max_items=batch_size)):
+            if isinstance(result, dict) and result.get('n8n_enhanced'):
+                store[idx] = {**store[idx], 'n8n_enhanced': result['n8n_enhanced']}
+                processed += 1
+        store.flush()
+        print(f"🔄 {min(start + batch_size, len(positions))}/{len(positions)} sent, {processed} enhanced")
+    return True
+
+def main():
+    parser = argparse.ArgumentParser(description="n8n backend")
+    parser.add_argument('--backfill', action='store_true', help="Process stored interviews in batches")
+    parser.add_argument('--batch-size', type=int, default=MCP_BATCH_MAX_ITEMS, help="Interviews per MCP batch")
+    parser.add_argument('--all', action='store_true', help="Include interviews that already have n8n results")
+    args = parser.parse_args()
+
+    if args.backfill:
+        backfill(args.batch_size, include_enhanced=args.all)
+        return
+
     backend = N8NBackend()
     print("Testing n8n backend...")
     test_data = {
@@ -114,3 +249,6 @@ if __name__ == '__main__':
     else:
         print("⚠️  n8n backend not available (this is okay if n8n isn't running)")
 
+if __name__ == '__main__':
+    main()
+
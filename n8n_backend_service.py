@@ -10,6 +10,9 @@ import sys
 from datetime import datetime
 from pathlib import Path
 
+import circuit_breaker
+from transcript_features import SENTIMENT_WORDS, TOPIC_KEYWORDS, features_for
+
 try:
     from config import N8N_MCP_URL, N8N_MCP_JWT
 except:
@@ -19,8 +22,9 @@ except:
 class N8NBackendService:
     """n8n Backend Service for interview processing"""
     
-    def __init__(self):
+    def __init__(self, max_wait=None):
         self.mcp_url = N8N_MCP_URL
+        self.max_wait = max_wait  # for the n8n quota; keep it small on request paths
         self.jwt = N8N_MCP_JWT
         self.local_webhook = os.getenv('N8N_WEBHOOK_URL', 'http://localhost:5678/webhook/interview-webhook')
         self.api_url = os.getenv('API_URL', 'http://localhost:5000')
@@ -50,6 +54,10 @@ class N8NBackendService:
         print("📡 Using enhanced local processing...")
         return self._enhanced_local_processing(interview_data)
     
+    def _features(self, data):
+        """Transcript features computed at ingest (sent in the analysis), or extracted if missing"""
+        return features_for(data.get("transcript") or "", (data.get("analysis") or {}).get("features"))
+    
     def _send_to_cloud_mcp(self, data):
         """Send to n8n cloud MCP server"""
         try:
@@ -61,6 +69,7 @@ class N8NBackendService:
                 "meeting_url": data.get("meeting_url"),
                 "analysis": data.get("analysis", {}),
                 "metrics": data.get("analysis", {}).get("metrics", {}),
+                "features": self._features(data).to_dict(),
                 "raw_data": data.get("raw_data", {})
             }
             
@@ -69,7 +78,7 @@ class N8NBackendService:
                 "Authorization": f"Bearer {self.jwt}"
             }
             
-            response = requests.post(self.mcp_url, json=payload, headers=headers, timeout=10)
+            response = circuit_breaker.post(self.mcp_url, rate_limit='n8n', max_wait=self.max_wait, json=payload, headers=headers, timeout=10)
             if response.status_code == 200:
                 return response.json()
             return None
@@ -80,7 +89,7 @@ class N8NBackendService:
     def _send_to_local_webhook(self, data):
         """Send to local n8n webhook"""
         try:
-            response = requests.post(self.local_webhook, json=data, timeout=5)
+            response = circuit_breaker.post(self.local_webhook, json=data, timeout=5)
             if response.status_code == 200:
                 return response.json()
             return None
@@ -89,14 +98,13 @@ class N8NBackendService:
     
     def _enhanced_local_processing(self, data):
         """Enhanced processing without n8n (fallback)"""
-        transcript = data.get("transcript", "")
-        analysis = data.get("analysis", {})
+        features = self._features(data)
         
         # Additional processing
         enhanced = {
-            "sentiment_analysis": self._analyze_sentiment(transcript),
-            "topic_extraction": self._extract_topics(transcript),
-            "engagement_score": self._calculate_engagement(transcript),
+            "sentiment_analysis": self._analyze_sentiment(features),
+            "topic_extraction": self._extract_topics(features),
+            "engagement_score": self._calculate_engagement(features),
             "processed_at": datetime.now().isoformat(),
             "processing_method": "local-enhanced"
         }
@@ -106,14 +114,10 @@ class N8NBackendService:
             "n8n_enhanced": enhanced
         }
     
-    def _analyze_sentiment(self, text):
+    def _analyze_sentiment(self, features):
         """Simple sentiment analysis"""
-        text_lower = text.lower()
-        positive = ['excellent', 'great', 'success', 'achieved', 'improved', 'solved', 'optimized', 'love', 'enjoy']
-        negative = ['difficult', 'challenge', 'problem', 'issue', 'failed', 'struggled', 'hard', 'complex']
-        
-        pos_count = sum(1 for w in positive if w in text_lower)
-        neg_count = sum(1 for w in negative if w in text_lower)
+        pos_count = features.count(SENTIMENT_WORDS['positive'])
+        neg_count = features.count(SENTIMENT_WORDS['negative'])
         
         score = pos_count - neg_count
         return {
@@ -123,31 +127,14 @@ class N8NBackendService:
             "sentiment": "positive" if score > 0 else "negative" if score < 0 else "neutral"
         }
     
-    def _extract_topics(self, text):
+    def _extract_topics(self, features):
         """Extract key topics from transcript"""
-        text_lower = text.lower()
-        topics = []
-        
-        topic_keywords = {
-            "Programming Languages": ["python", "javascript", "java", "c++", "typescript", "go", "rust"],
-            "Frameworks": ["react", "django", "flask", "spring", "angular", "vue", "express"],
-            "Databases": ["database", "sql", "postgresql", "mongodb", "redis", "mysql"],
-            "APIs": ["api", "rest", "graphql", "endpoint", "microservice"],
-            "Cloud": ["aws", "azure", "gcp", "cloud", "docker", "kubernetes", "devops"],
-            "Testing": ["test", "testing", "unit test", "integration", "qa"],
-            "Architecture": ["architecture", "design pattern", "system design", "scalability"]
-        }
-        
-        for topic, keywords in topic_keywords.items():
-            if any(kw in text_lower for kw in keywords):
-                topics.append(topic)
-        
-        return topics
+        return [topic for topic, keywords in TOPIC_KEYWORDS.items() if features.mentions_any(keywords)]
     
-    def _calculate_engagement(self, text):
+    def _calculate_engagement(self, features):
         """Calculate engagement level"""
-        word_count = len(text.split())
-        question_count = text.count('?')
+        word_count = features.word_count
+        question_count = features.question_count
         
         if word_count > 500 and question_count > 5:
             return "high"
@@ -5,6 +5,8 @@ n8n MCP Server integration
 import requests
 import json
 from config import N8N_MCP_URL, N8N_MCP_JWT
+from n8n_backend import N8NBackend, mcp_payload
+import circuit_breaker
 
 def send_to_n8n_mcp(data, endpoint="process-interview"):
     """Send data to n8n MCP server"""
@@ -16,7 +18,7 @@ def send_to_n8n_mcp(data, endpoint="process-interview"):
     }
     
     try:
-        response = requests.post(url, json=data, headers=headers, timeout=10)
+        response = circuit_breaker.post(url, rate_limit='n8n', json=data, headers=headers, timeout=10)
         if response.status_code == 200:
             return response.json()
         else:
@@ -38,6 +40,14 @@ def process_interview_with_n8n(interview_data):
     
     return send_to_n8n_mcp(payload, "process-interview")
 
+def send_batch_to_n8n_mcp(items, endpoint="process-interview"):
+    """Send many payloads in JSON-RPC batch calls, returning one result per item"""
+    return N8NBackend(N8N_MCP_URL, N8N_MCP_JWT).send_batch_to_mcp(items, endpoint)
+
+def process_interviews_with_n8n(interviews):
+    """Process many interviews through n8n MCP in batched requests"""
+    return send_batch_to_n8n_mcp([mcp_payload(interview) for interview in interviews], "process-interview")
+
 def get_enhanced_analysis(interview_id):
     """Get enhanced analysis from n8n"""
     return send_to_n8n_mcp({"interview_id": interview_id}, "get-analysis")
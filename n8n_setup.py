@@ -3,12 +3,12 @@
 n8n setup and integration script
 """
 import subprocess
-import requests
-import time
 import json
 import os
 from pathlib import Path
 
+from readiness import http_probe, wait_until_ready
+
 def check_n8n_installed():
     """Check if n8n is installed"""
     try:
@@ -55,23 +55,17 @@ def start_n8n(port=5678):
         cwd=Path(__file__).parent
     )
     
-    # Wait for n8n to start
-    time.sleep(5)
-    
-    # Check if n8n is running
-    try:
-        response = requests.get(f'http://localhost:{port}/healthz', timeout=5)
-        if response.status_code == 200:
-            print(f"\n{'='*60}")
-            print(f"✓ n8n is running!")
-            print(f"  Web UI: http://localhost:{port}")
-            print(f"  API: http://localhost:{port}/api/v1")
-            print(f"{'='*60}\n")
-            return process
-    except:
-        pass
+    # Wait until n8n answers its health check
+    if wait_until_ready(http_probe(f'http://localhost:{port}/healthz'), timeout=60,
+                        alive=lambda: process.poll() is None):
+        print(f"\n{'='*60}")
+        print(f"✓ n8n is running!")
+        print(f"  Web UI: http://localhost:{port}")
+        print(f"  API: http://localhost:{port}/api/v1")
+        print(f"{'='*60}\n")
+        return process
     
-    print("n8n starting... Check http://localhost:5678")
+    print(f"n8n starting... Check http://localhost:{port}")
     return process
 
 def import_workflow(workflow_file, n8n_url="http://localhost:5678"):
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Local n8n / MCP stand-in with injectable latency and failures
+Implements the process-interview, get-analysis and generate-report MCP
+calls and the interview-webhook path from n8n_enhanced_workflow.json, so
+timeout and queueing behavior can be benchmarked reproducibly.
+
+Usage:
+  python3 n8n_stand_in.py --port 5678 --latency lognormal:-2,0.5 --error-rate 0.05 --hang-rate 0.01
+  N8N_MCP_URL=http://localhost:5678/mcp N8N_MCP_JWT=test \\
+  N8N_WEBHOOK_URL=http://localhost:5678/webhook/interview-webhook python3 api_server.py
+"""
+import argparse
+import random
+import threading
+import time
+from datetime import datetime
+
+from flask import Flask, request, jsonify
+
+from n8n_backend_service import N8NBackendService
+
+MCP_METHODS = ('process-interview', 'get-analysis', 'generate-report')
+
+def parse_latency(spec):
+    """Parse a latency distribution spec into a sampler returning seconds
+
+    Specs: "0.2" or "fixed:0.2", "uniform:LOW,HIGH", "normal:MEAN,STDDEV",
+    "lognormal:MU,SIGMA", "exponential:MEAN". Values are in seconds.
+    """
+    spec = str(spec or '0')
+    kind, _, args = spec.partition(':')
+    if not args:
+        kind, args = 'fixed', kind
+    values = [float(v) for v in args.split(',')]
+    samplers = {
+        'fixed': lambda rng: values[0],
+        'uniform': lambda rng: rng.uniform(values[0], values[1]),
+        'normal': lambda rng: rng.gauss(values[0], values[1]),
+        'lognormal': lambda rng: rng.lognormvariate(values[0], values[1]),
+        'exponential': lambda rng: rng.expovariate(1 / values[0]) if values[0] else 0.0,
+    }
+    if kind not in samplers:
+        raise ValueError(f"Unknown latency distribution '{kind}'")
+    return lambda rng: max(0.0, samplers[kind](rng))
+
+class FaultInjector:
+    """Decides per request how long to wait and whether to fail or hang"""
+
+    def __init__(self, latency='0', error_rate=0.0, hang_rate=0.0, hang_seconds=60.0, seed=None):
+        self.lock = threading.Lock()
+        self.random = random.Random(seed)
+        self.configure(latency=latency, error_rate=error_rate, hang_rate=hang_rate, hang_seconds=hang_seconds)
+        self.stats = {"requests": 0, "errors": 0, "hangs": 0, "by_route": {}}
+
+    def configure(self, latency=None, error_rate=None, hang_rate=None, hang_seconds=None):
+        """Update the fault settings (unspecified ones are kept)"""
+        with self.lock:
+            if latency is not None:
+                self.sample_latency = parse_latency(latency)
+                self.latency_spec = str(latency)
+            if error_rate is not None:
+                self.error_rate = float(error_rate)
+            if hang_rate is not None:
+                self.hang_rate = float(hang_rate)
+            if hang_seconds is not None:
+                self.hang_seconds = float(hang_seconds)
+
+    def settings(self):
+        return {
+            "latency": self.latency_spec,
+            "error_rate": self.error_rate,
+            "hang_rate": self.hang_rate,
+            "hang_seconds": self.hang_seconds
+        }
+
+    def decide(self, route):
+        """Pick (delay_seconds, outcome) for one request; outcome is ok, error or hang"""
+        with self.lock:
+            self.stats['requests'] += 1
+            self.stats['by_route'][route] = self.stats['by_route'].get(route, 0) + 1
+            roll = self.random.random()
+            if roll < self.hang_rate:
+                self.stats['hangs'] += 1
+                return self.hang_seconds, 'hang'
+            delay = self.sample_latency(self.random)
+            if roll < self.hang_rate + self.error_rate:
+                self.stats['errors'] += 1
+                return delay, 'error'
+            return delay, 'ok'
+
+def create_app(injector):
+    """Flask app emulating the n8n endpoints used by this project"""
+    app = Flask(__name__)
+    processor = N8NBackendService()
+
+    def enhance(data):
+        enhanced = processor._enhanced_local_processing(data)['n8n_enhanced']
+        enhanced['processing_method'] = 'n8n-stand-in'
+        return enhanced
+
+    def handle(route, respond):
+        delay, outcome = injector.decide(route)
+        time.sleep(delay)
+        if outcome == 'error':
+            return jsonify({"message": "Injected failure"}), 500
+        if outcome == 'hang':
+            return jsonify({"message": "Injected hang elapsed"}), 504
+        return jsonify(respond()), 200
+
+    def mcp_result(method, params):
+        if method == 'process-interview':
+            return {**params, "n8n_enhanced": enhance(params)}
+        if method == 'get-analysis':
+            return {"interview_id": params.get('interview_id'), "n8n_enhanced": enhance(params)}
+        if method == 'generate-report':
+            return {
+                "interview_id": params.get('interview_id'),
+                "report": f"Interview report for {params.get('interview_id')}",
+                "generated_at": datetime.now().isoformat()
+            }
+        raise KeyError(method)
+
+    def batch_reply(call):
+        reply = {"jsonrpc": "2.0", "id": call.get('id')}
+        if call.get('method') not in MCP_METHODS:
+            reply["error"] = {"code": -32601, "message": f"Unknown method '{call.get('method')}'"}
+        else:
+            reply["result"] = mcp_result(call['method'], call.get('params') or {})
+        return reply
+
+    @app.route('/mcp', methods=['POST'])
+    @app.route('/mcp/<method>', methods=['POST'])
+    def mcp(method=None):
+        """MCP calls as sent by N8NBackend, N8NBackendService and n8n_mcp_integration"""
+        body = request.json or {}
+        if method is None and isinstance(body, list):
+            # JSON-RPC batch from N8NBackend.send_batch_to_mcp
+            return handle('mcp:batch', lambda: [batch_reply(call) for call in body])
+        if method is None and 'method' in body:
+            # JSON-RPC style {"method": ..., "params": ...} from N8NBackend.send_to_mcp
+            method, params = body['method'], body.get('params') or {}
+            wrap = True
+        else:
+            # Direct payload from N8NBackendService / n8n_mcp_integration
+            method, params = method or 'process-interview', body
+            wrap = False
+        if method not in MCP_METHODS:
+            return jsonify({"error": f"Unknown method '{method}'"}), 404
+        return handle(f"mcp:{method}", lambda: {"result": mcp_result(method, params)} if wrap
+                      else mcp_result(method, params))
+
+    @app.route('/webhook/interview-webhook', methods=['POST'])
+    def interview_webhook():
+        """Equivalent of the Webhook → Enhanced Analysis → Respond path of the workflow"""
+        data = request.json or {}
+        return handle('webhook:interview-webhook', lambda: {
+            "status": "success",
+            "interview_id": data.get('id'),
+            "n8n_enhanced": enhance(data)
+        })
+
+    @app.route('/healthz', methods=['GET'])
+    def healthz():
+        return jsonify({"status": "ok"})
+
+    @app.route('/_config', methods=['GET', 'POST'])
+    def config():
+        """Inspect or change fault settings while a benchmark runs"""
+        if request.method == 'POST':
+            try:
+                injector.configure(**(request.json or {}))
+            except (TypeError, ValueError) as e:
+                return jsonify({"error": str(e)}), 400
+        return jsonify(injector.settings())
+
+    @app.route('/_stats', methods=['GET'])
+    def stats():
+        with injector.lock:
+            return jsonify(injector.stats)
+
+    return app
+
+def main():
+    parser = argparse.ArgumentParser(description="Local n8n/MCP stand-in with fault injection")
+    parser.add_argument('--port', type=int, default=5678)
+    parser.add_argument('--latency', default='0', help="Latency distribution, e.g. 0.2, uniform:0.05,0.5, lognormal:-2,0.5")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of requests answered with HTTP 500")
+    parser.add_argument('--hang-rate', type=float, default=0.0, help="Fraction of requests that hang")
+    parser.add_argument('--hang-seconds', type=float, default=60.0, help="How long a hanging request stalls")
+    parser.add_argument('--seed', type=int, default=None, help="Random seed for reproducible runs")
+    args = parser.parse_args()
+
+    injector = FaultInjector(args.latency, args.error_rate, args.hang_rate, args.hang_seconds, args.seed)
+    print(f"{'='*60}")
+    print("n8n Stand-in")
+    print(f"{'='*60}")
+    print(f"  MCP:     http://localhost:{args.port}/mcp")
+    print(f"  Webhook: http://localhost:{args.port}/webhook/interview-webhook")
+    print(f"  Faults:  {injector.settings()}")
+    print(f"{'='*60}\n")
+    create_app(injector).run(host='0.0.0.0', port=args.port, threaded=True)
+
+if __name__ == '__main__':
+    main()
@@ -9,6 +9,8 @@ import json
 import sys
 from pathlib import Path
 
+from readiness import ngrok_probe, wait_until_ready
+
 def check_ngrok_installed():
     """Check if ngrok is installed"""
     script_dir = Path(__file__).parent
@@ -62,25 +64,15 @@ def start_ngrok_tunnel(port=5000):
         cwd=Path(__file__).parent
     )
     
-    # Wait a bit for ngrok to start
-    time.sleep(3)
-    
-    # Get the public URL from ngrok API
-    try:
-        response = requests.get('http://localhost:4040/api/tunnels', timeout=5)
-        if response.status_code == 200:
-            data = response.json()
-            tunnels = data.get('tunnels', [])
-            if tunnels:
-                public_url = tunnels[0]['public_url']
-                print(f"\n{'='*60}")
-                print(f"✓ Ngrok tunnel active!")
-                print(f"  Public URL: {public_url}")
-                print(f"  Local URL: http://localhost:{port}")
-                print(f"{'='*60}\n")
-                return public_url
-    except:
-        pass
+    # Get the public URL from the ngrok API as soon as the tunnel is up
+    public_url = wait_until_ready(ngrok_probe(), timeout=30, alive=lambda: process.poll() is None)
+    if public_url:
+        print(f"\n{'='*60}")
+        print(f"✓ Ngrok tunnel active!")
+        print(f"  Public URL: {public_url}")
+        print(f"  Local URL: http://localhost:{port}")
+        print(f"{'='*60}\n")
+        return public_url
     
     print("Ngrok started but couldn't fetch URL. Check http://localhost:4040")
     return "http://localhost:4040"
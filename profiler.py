@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+On-demand request profiling
+Profiles a request with cProfile when it carries `X-Profile: <PROFILE_TOKEN>`,
+or a sampled share of requests (PROFILE_SAMPLE_RATE). Timed spans around
+analyze_interview and outbound n8n calls are attached to the profile.
+Profiles are written to PROFILE_DIR (pstats file + JSON summary), oldest
+first out, and listed at /api/debug/profiles.
+
+Safe to leave armed: only one profile runs at a time (others are skipped,
+not queued), sampled profiles are capped per minute, disk use is bounded
+by PROFILE_KEEP and nothing is reachable without the token. Requests that
+aren't profiled pay one random() call and a lock check.
+
+Usage:
+  python3 profiler.py                  # list stored profiles
+  python3 profiler.py <profile id>     # print the top functions of a profile
+"""
+import argparse
+import contextvars
+import cProfile
+import hmac
+import json
+import os
+import pstats
+import random
+import re
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+from pathlib import Path
+
+PROFILE_DIR = Path(os.getenv('PROFILE_DIR') or Path(__file__).parent / "profiles")
+PROFILE_SAMPLE_RATE = float(os.getenv('PROFILE_SAMPLE_RATE') or 0)
+PROFILE_MAX_PER_MINUTE = int(os.getenv('PROFILE_MAX_PER_MINUTE') or 6)
+PROFILE_KEEP = int(os.getenv('PROFILE_KEEP') or 50)
+PROFILE_TOKEN = os.getenv('PROFILE_TOKEN', '')
+PROFILE_TOP = 25  # functions kept in a profile's summary
+
+ID_PATTERN = re.compile(r'^[0-9]{8}-[0-9]{6}-[0-9a-f]{8}$')
+
+_active = contextvars.ContextVar('profile_session', default=None)
+
+def is_valid_id(profile_id):
+    return bool(ID_PATTERN.match(profile_id or ''))
+
+class _Session:
+    """One running profile"""
+
+    def __init__(self, label, trigger):
+        self.id = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        self.label = label
+        self.trigger = trigger
+        self.status = None
+        self.spans = []
+        self.started_at = time.time()
+        self.started = time.perf_counter()
+        self.profile = cProfile.Profile()
+
+class RequestProfiler:
+    """Decides which requests to profile and stores the results"""
+
+    def __init__(self, directory=PROFILE_DIR, sample_rate=PROFILE_SAMPLE_RATE, token=PROFILE_TOKEN,
+                 max_per_minute=PROFILE_MAX_PER_MINUTE, keep=PROFILE_KEEP):
+        self.directory = Path(directory)
+        self.sample_rate = sample_rate
+        self.token = token
+        self.max_per_minute = max_per_minute
+        self.keep = keep
+        self._slot = threading.Lock()   # held while a profile runs
+        self._recent = deque()          # start times of sampled profiles in the last minute
+        self._recent_lock = threading.Lock()
+        self._stats = {"profiled": 0, "skipped_busy": 0, "skipped_rate": 0}
+
+    def authorized(self, token):
+        """Whether token unlocks profiling on demand and the debug endpoints"""
+        return bool(self.token) and hmac.compare_digest((token or '').encode('utf-8'), self.token.encode('utf-8'))
+
+    def _sample(self):
+        if not self.sample_rate or random.random() >= self.sample_rate:
+            return False
+        now = time.monotonic()
+        with self._recent_lock:
+            while self._recent and now - self._recent[0] > 60:
+                self._recent.popleft()
+            if len(self._recent) >= self.max_per_minute:
+                self._stats['skipped_rate'] += 1
+                return False
+            self._recent.append(now)
+        return True
+
+    def begin(self, label, token=None):
+        """Start profiling the current context if requested or sampled; returns the session or None"""
+        if _active.get() is not None:
+            return None
+        if token and self.authorized(token):
+            trigger = 'header'
+        elif self._sample():
+            trigger = 'sampled'
+        else:
+            return None
+        if not self._slot.acquire(blocking=False):
+            self._stats['skipped_busy'] += 1
+            return None
+        session = _Session(label, trigger)
+        try:
+            session.profile.enable()
+        except ValueError:
+            # Another profiler (a debugger, say) owns the interpreter's hook
+            self._slot.release()
+            return None
+        _active.set(session)
+        return session
+
+    def finish(self, session):
+        """Stop a session begun by begin() and write it out"""
+        session.profile.disable()
+        duration = time.perf_counter() - session.started
+        _active.set(None)
+        try:
+            self._write(session, duration)
+            self._stats['profiled'] += 1
+        except OSError as e:
+            print(f"⚠️  Could not write profile {session.id}: {e}")
+        finally:
+            self._slot.release()
+
+    @contextmanager
+    def profile(self, label, token=None):
+        """Profile a block (sampled like requests); yields the session or None"""
+        session = self.begin(label, token)
+        try:
+            yield session
+        finally:
+            if session is not None:
+                self.finish(session)
+
+    def _write(self, session, duration):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        stats = pstats.Stats(session.profile)
+        top = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:PROFILE_TOP]
+        summary = {
+            "id": session.id,
+            "label": session.label,
+            "status": session.status,
+            "trigger": session.trigger,
+            "pid": os.getpid(),
+            "started_at": session.started_at,
+            "duration_ms": round(duration * 1000, 2),
+            "spans": session.spans,
+            "top": [{"function": f"{func[2]} ({Path(func[0]).name}:{func[1]})", "calls": nc,
+                     "total_ms": round(tt * 1000, 2), "cumulative_ms": round(ct * 1000, 2)}
+                    for func, (cc, nc, tt, ct, callers) in top]
+        }
+        stats.dump_stats(self.directory / f"{session.id}.prof")
+        (self.directory / f"{session.id}.json").write_text(json.dumps(summary), encoding='utf-8')
+        self._rotate()
+
+    def _summaries(self):
+        """Summary files, oldest first"""
+        paths = []
+        for path in self.directory.glob('*.json') if self.directory.exists() else []:
+            try:
+                paths.append((path.stat().st_mtime, path.name, path))
+            except FileNotFoundError:
+                pass  # rotated away by another process
+        return [path for _, _, path in sorted(paths)]
+
+    def _rotate(self):
+        summaries = self._summaries()
+        for old in summaries[:max(0, len(summaries) - self.keep)]:
+            old.unlink(missing_ok=True)
+            old.with_suffix('.prof').unlink(missing_ok=True)
+
+    def list(self):
+        """Summaries of stored profiles, newest first"""
+        profiles = []
+        for path in reversed(self._summaries()):
+            try:
+                summary = json.loads(path.read_text(encoding='utf-8'))
+            except (OSError, ValueError):
+                continue  # rotated away or half-written
+            summary.pop('top', None)
+            profiles.append(summary)
+        return profiles
+
+    def summary(self, profile_id):
+        """Full summary of one profile, or None"""
+        if not is_valid_id(profile_id):
+            return None
+        try:
+            return json.loads((self.directory / f"{profile_id}.json").read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return None
+
+    def stats_path(self, profile_id):
+        """Path of a profile's pstats file, or None"""
+        path = self.directory / f"{profile_id}.prof" if is_valid_id(profile_id) else None
+        return path if path is not None and path.exists() else None
+
+    def stats(self):
+        return {"armed": bool(self.sample_rate or self.token), "sample_rate": self.sample_rate,
+                "on_demand": bool(self.token), "busy": self._slot.locked(), **self._stats}
+
+profiler = RequestProfiler()
+
+@contextmanager
+def span(name):
+    """Time a block and attach it to the running profile, if any"""
+    session = _active.get()
+    if session is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        session.spans.append({"name": name, "offset_ms": round((started - session.started) * 1000, 2),
+                              "duration_ms": round((time.perf_counter() - started) * 1000, 2)})
+
+def traced(name):
+    """Decorator recording calls of a function as spans of the running profile"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if _active.get() is None:
+                return func(*args, **kwargs)
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect stored request profiles")
+    parser.add_argument('profile_id', nargs='?', help="Profile to show")
+    parser.add_argument('--sort', default='cumulative', help="pstats sort key (cumulative, tottime, calls)")
+    parser.add_argument('--limit', type=int, default=30)
+    args = parser.parse_args()
+
+    if args.profile_id:
+        path = profiler.stats_path(args.profile_id)
+        if path is None:
+            print(f"✗ No profile '{args.profile_id}' in {profiler.directory}")
+            return
+        print(json.dumps({k: v for k, v in profiler.summary(args.profile_id).items() if k != 'top'}, indent=2))
+        pstats.Stats(str(path)).sort_stats(args.sort).print_stats(args.limit)
+        return
+    profiles = profiler.list()
+    print(f"{'='*60}")
+    print(f"Stored profiles ({len(profiles)}) in {profiler.directory}")
+    print(f"{'='*60}")
+    for p in profiles:
+        print(f"  {p['id']}  {p['duration_ms']:>9.1f}ms  {p['status'] or '-':>3}  {p['trigger']:<7}  {p['label']}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Token-bucket rate limiting for outbound third-party APIs
+ElevenLabs, Recall.ai and n8n cloud each get a bucket with their own quota.
+Bucket state lives in a small SQLite file by default, so the API server,
+the analysis workers and CLI tools draw from the same quota. A 429 pauses
+the whole service until its Retry-After has passed, and the request is
+retried once the bucket allows it.
+
+Usage:
+  python3 rate_limiter.py            # show quotas and shared bucket state
+"""
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+
+import requests
+
+RATE_LIMIT_DB = Path(os.getenv('RATE_LIMIT_DB') or Path(__file__).parent / "rate_limits.db")
+RATE_LIMIT_BACKEND = os.getenv('RATE_LIMIT_BACKEND', 'sqlite')  # or "memory" (per process)
+MAX_WAIT = float(os.getenv('RATE_LIMIT_MAX_WAIT', '60'))
+MAX_RETRIES = int(os.getenv('RATE_LIMIT_RETRIES', '2'))
+# Longest wait for a call made while serving an HTTP request (webhooks, report reads)
+REQUEST_MAX_WAIT = float(os.getenv('RATE_LIMIT_REQUEST_MAX_WAIT') or 2)
+
+# Requests per second and burst size; override with RATE_LIMIT_<SERVICE> and RATE_LIMIT_<SERVICE>_BURST
+DEFAULT_QUOTAS = {
+    "elevenlabs": (2.0, 5),
+    "recall": (2.0, 5),
+    "n8n": (10.0, 20)
+}
+
+class RateLimited(requests.exceptions.RequestException):
+    """Raised when a request would have to wait longer than allowed for its service's quota"""
+
+def quota_for(service):
+    """(rate, burst) for a service; a rate of 0 means unlimited"""
+    rate, burst = DEFAULT_QUOTAS.get(service, (0.0, 1))
+    key = f"RATE_LIMIT_{service.upper()}"
+    rate = float(os.getenv(key) or rate)
+    burst = int(os.getenv(f"{key}_BURST") or burst)
+    return rate, max(1, burst)
+
+def retry_after_seconds(response, default=None):
+    """Delay requested by a 429/503 response (Retry-After in seconds or as an HTTP date)"""
+    value = response.headers.get('Retry-After') if response is not None else None
+    if not value:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return default
+
+class MemoryBackend:
+    """Bucket state for one process"""
+
+    def __init__(self):
+        self._buckets = {}  # name -> [tokens, updated, blocked_until]
+        self._lock = threading.Lock()
+
+    def take(self, name, rate, capacity):
+        """Take a token; returns 0 on success or the seconds to wait before trying again"""
+        with self._lock:
+            state = self._buckets.setdefault(name, [float(capacity), time.time(), 0.0])
+            return _take(state, rate, capacity, time.time())
+
+    def block(self, name, until):
+        """Hold back every request for name until the given time"""
+        with self._lock:
+            state = self._buckets.setdefault(name, [0.0, time.time(), 0.0])
+            state[0] = 0.0
+            state[2] = max(state[2], until)
+
+    def state(self, name):
+        with self._lock:
+            state = self._buckets.get(name)
+            return {"tokens": round(state[0], 2), "blocked_until": state[2]} if state else None
+
+class SqliteBackend:
+    """Bucket state in SQLite, shared by every process using the same file"""
+
+    def __init__(self, path=RATE_LIMIT_DB):
+        self.path = Path(path)
+        self._local = threading.local()
+        self._connection().execute(
+            "CREATE TABLE IF NOT EXISTS buckets (name TEXT PRIMARY KEY, tokens REAL NOT NULL, "
+            "updated REAL NOT NULL, blocked_until REAL NOT NULL DEFAULT 0)")
+
+    def _connection(self):
+        # sqlite3 connections can't be shared between threads
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")
+            self._local.conn = conn
+        return conn
+
+    def _update(self, name, change, default):
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT tokens, updated, blocked_until FROM buckets WHERE name = ?",
+                               (name,)).fetchone()
+            state = list(row) if row else list(default)
+            result = change(state)
+            conn.execute("INSERT OR REPLACE INTO buckets (name, tokens, updated, blocked_until) VALUES (?, ?, ?, ?)",
+                         (name, *state))
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        return result
+
+    def take(self, name, rate, capacity):
+        now = time.time()
+        return self._update(name, lambda state: _take(state, rate, capacity, now), (float(capacity), now, 0.0))
+
+    def block(self, name, until):
+        def change(state):
+            state[0] = 0.0
+            state[2] = max(state[2], until)
+        self._update(name, change, (0.0, time.time(), 0.0))
+
+    def state(self, name):
+        row = self._connection().execute("SELECT tokens, blocked_until FROM buckets WHERE name = ?",
+                                         (name,)).fetchone()
+        return {"tokens": round(row[0], 2), "blocked_until": row[1]} if row else None
+
+def _take(state, rate, capacity, now):
+    """Refill a [tokens, updated, blocked_until] state and take one token from it"""
+    tokens, updated, blocked_until = state
+    tokens = min(capacity, tokens + max(0.0, now - updated) * rate)
+    state[0], state[1] = tokens, now
+    if now < blocked_until:
+        return blocked_until - now
+    if not rate:
+        return 0.0  # unlimited, apart from Retry-After pauses
+    if tokens >= 1:
+        state[0] = tokens - 1
+        return 0.0
+    return (1 - tokens) / rate
+
+class TokenBucket:
+    """Thread-safe token bucket limiting requests per second
+
+    With a SqliteBackend, buckets of the same name in different processes
+    share their tokens.
+    """
+
+    def __init__(self, rate, burst=None, name=None, backend=None):
+        self.rate = rate
+        self.capacity = burst or max(1, int(rate))
+        self.name = name or f"bucket-{id(self)}"
+        self.backend = backend or MemoryBackend()
+        self._stats = {"acquired": 0, "waited": 0.0, "throttled": 0, "rejected": 0}
+        self._stats_lock = threading.Lock()
+
+    def acquire(self, max_wait=None):
+        """Block until a request may be sent
+
+        Raises RateLimited instead if that would take longer than max_wait seconds.
+        """
+        started = time.monotonic()
+        while True:
+            wait = self.backend.take(self.name, self.rate, self.capacity)
+            if wait <= 0:
+                break
+            if max_wait is not None and time.monotonic() - started + wait > max_wait:
+                with self._stats_lock:
+                    self._stats['rejected'] += 1
+                raise RateLimited(f"{self.name} rate limit: next request allowed in {wait:.1f}s")
+            time.sleep(wait)
+        with self._stats_lock:
+            self._stats['acquired'] += 1
+            self._stats['waited'] += time.monotonic() - started
+
+    def throttled(self, retry_after):
+        """The service answered 429: pause every user of this bucket for retry_after seconds"""
+        with self._stats_lock:
+            self._stats['throttled'] += 1
+        self.backend.block(self.name, time.time() + retry_after)
+
+    def stats(self):
+        with self._stats_lock:
+            stats = {**self._stats, "waited": round(self._stats['waited'], 3)}
+        return {"rate": self.rate, "burst": self.capacity, **stats, "shared": self.backend.state(self.name)}
+
+_backend = None
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+def _shared_backend():
+    global _backend
+    if _backend is None:
+        _backend = MemoryBackend() if RATE_LIMIT_BACKEND == 'memory' else SqliteBackend(RATE_LIMIT_DB)
+    return _backend
+
+def limiter_for(service):
+    """The rate limiter for a third-party service, configured from the environment"""
+    with _limiters_lock:
+        limiter = _limiters.get(service)
+        if limiter is None:
+            rate, burst = quota_for(service)
+            limiter = _limiters[service] = TokenBucket(rate, burst, name=service, backend=_shared_backend())
+        return limiter
+
+def limiter_stats():
+    """Quota, local counters and shared state of every limiter used in this process"""
+    with _limiters_lock:
+        limiters = dict(_limiters)
+    return {service: limiter.stats() for service, limiter in limiters.items()}
+
+def request(service, method, url, max_wait=MAX_WAIT, retries=MAX_RETRIES, **kwargs):
+    """requests.request within the service's quota
+
+    429 responses pause the service for their Retry-After (or a backoff)
+    and are retried up to `retries` times; the last response is returned.
+    Raises RateLimited if the quota would hold the request longer than
+    max_wait seconds.
+    """
+    limiter = limiter_for(service)
+    for attempt in range(retries + 1):
+        limiter.acquire(max_wait)
+        response = requests.request(method, url, **kwargs)
+        if response.status_code != 429:
+            return response
+        delay = retry_after_seconds(response, default=min(MAX_WAIT, 2 ** attempt) * random.uniform(0.5, 1.0))
+        limiter.throttled(delay)
+        print(f"⏳ {service} rate limited (429); pausing {delay:.1f}s")
+        if attempt == retries or delay > max_wait:
+            return response
+    return response
+
+def get(service, url, **kwargs):
+    return request(service, 'GET', url, **kwargs)
+
+def post(service, url, **kwargs):
+    return request(service, 'POST', url, **kwargs)
+
+def main():
+    print(f"{'='*60}")
+    print("Outbound Rate Limits")
+    print(f"{'='*60}")
+    print(f"  Backend: {RATE_LIMIT_BACKEND} ({RATE_LIMIT_DB})\n")
+    for service in DEFAULT_QUOTAS:
+        print(f"  {service}: {json.dumps(limiter_for(service).stats())}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Readiness probes for the local stack
+Services are polled with exponential backoff until they answer, so
+startup waits exactly as long as a component needs instead of a fixed
+sleep.
+"""
+import time
+
+import requests
+
+def http_probe(url, timeout=2):
+    """Probe that is ready once url answers with a non-5xx status"""
+    def probe():
+        return requests.get(url, timeout=timeout).status_code < 500
+    return probe
+
+def ngrok_probe(api_url="http://localhost:4040/api/tunnels", timeout=2):
+    """Probe that is ready (returning the public URL) once ngrok reports a tunnel"""
+    def probe():
+        tunnels = requests.get(api_url, timeout=timeout).json().get('tunnels', [])
+        return tunnels[0]['public_url'] if tunnels else None
+    return probe
+
+def wait_until_ready(probe, timeout=60, initial_delay=0.1, max_delay=2.0, alive=None):
+    """Poll probe with exponential backoff until it returns a truthy value
+
+    Returns that value, or None when timeout passes or alive() turns false
+    (the process being waited on has exited).
+    """
+    deadline = time.monotonic() + timeout
+    delay = initial_delay
+    while True:
+        try:
+            result = probe()
+            if result:
+                return result
+        except (requests.exceptions.RequestException, ValueError, KeyError):
+            pass
+        if alive is not None and not alive():
+            return None
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return None
+        time.sleep(min(delay, remaining))
+        delay = min(max_delay, delay * 2)
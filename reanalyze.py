@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Bulk re-analysis of stored interviews
+Re-scores stored interviews with the current analyze_interview rubric
+across a process pool and writes results back in batches
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+import requests
+
+from interview_analysis import analyze_interview, get_rubric, is_stale, set_rubric
+from interview_store import (DATA_FILE, SNAPSHOT_FILE, DataDirLock, InterviewStore, parse_time_filter,
+                             parse_timestamp)
+DEFAULT_BATCH_SIZE = 200
+
+def interview_duration(interview):
+    """Get the audio duration recorded for an interview"""
+    duration = interview.get('audio_duration')
+    if duration is None and isinstance(interview.get('raw_data'), dict):
+        duration = interview['raw_data'].get('duration')
+    return duration
+
+def select_interviews(interviews, ids=None, since=None, until=None, processed_by=None, stale_only=False):
+    """Select the interviews matching the given filters
+
+    Raises ValueError for a since/until that isn't an ISO timestamp.
+    """
+    ids = set(ids) if ids else None
+    since = parse_time_filter(since, 'since')
+    until = parse_time_filter(until, 'until')
+
+    selected = []
+    for interview in interviews:
+        if ids is not None and interview.get('id') not in ids:
+            continue
+        if processed_by and interview.get('processed_by', 'recall') != processed_by:
+            continue
+        if stale_only and not is_stale(interview.get('analysis')):
+            continue
+        if since or until:
+            timestamp = parse_timestamp(interview.get('timestamp'))
+            if timestamp is None:
+                continue
+            if since and timestamp < since:
+                continue
+            if until and timestamp > until:
+                continue
+        selected.append(interview)
+    return selected
+
+def _reanalyze_job(job):
+    """Worker entry point: re-score a single transcript"""
+    index, transcript, duration = job
+    return index, analyze_interview(transcript, duration)
+
+def _apply_in_place(interview, analysis, reanalyzed_at):
+    """Write a new analysis straight into the interview dict"""
+    interview['analysis'] = analysis
+    interview['last_reanalyzed'] = reanalyzed_at
+    return True
+
+def reanalyze_interviews(interviews, workers=None, batch_size=DEFAULT_BATCH_SIZE, on_batch=None, apply=None, **filters):
+    """Re-score stored interviews, yielding a progress report after each batch
+
+    Results are written back one batch at a time through apply(interview,
+    analysis, reanalyzed_at), which updates the dict in place by default and
+    returns whether the result was stored. on_batch is called after every
+    batch so callers can persist them.
+    """
+    apply = apply or _apply_in_place
+    selected = select_interviews(interviews, **filters)
+    total = len(selected)
+    workers = workers or os.cpu_count() or 1
+    batch_size = max(1, batch_size)
+    started = time.time()
+
+    progress = {"processed": 0, "changed": 0, "total": total, "elapsed": 0.0, "done": False}
+    if not total:
+        progress["done"] = True
+        yield progress
+        return
+
+    jobs = [(i, inv.get('transcript', ''), interview_duration(inv)) for i, inv in enumerate(selected)]
+
+    def apply_batch(batch):
+        reanalyzed_at = datetime.now().isoformat()
+        for index, analysis in batch:
+            interview = selected[index]
+            previous_score = interview.get('analysis', {}).get('score')
+            if apply(interview, analysis, reanalyzed_at) and previous_score != analysis['score']:
+                progress['changed'] += 1
+        if on_batch:
+            on_batch([selected[index] for index, _ in batch])
+        progress['processed'] += len(batch)
+        progress['elapsed'] = round(time.time() - started, 3)
+        progress['done'] = progress['processed'] == total
+        return dict(progress)
+
+    # Small jobs are faster inline than paying for worker start-up
+    if workers == 1 or total < batch_size:
+        results = map(_reanalyze_job, jobs)
+        executor = None
+    else:
+        # Workers score with the same rubric as this process, even if it was swapped at runtime.
+        # Spawned rather than forked: the API server calls this from a threaded process, and a
+        # forked child could inherit a lock another thread was holding
+        executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                                       initializer=set_rubric, initargs=(get_rubric(),))
+        chunksize = max(1, min(batch_size, total // (workers * 4)))
+        results = executor.map(_reanalyze_job, jobs, chunksize=chunksize)
+
+    try:
+        batch = []
+        for result in results:
+            batch.append(result)
+            if len(batch) >= batch_size:
+                yield apply_batch(batch)
+                batch = []
+        if batch:
+            yield apply_batch(batch)
+    finally:
+        if executor:
+            executor.shutdown(cancel_futures=True)
+
+def reanalyze_via_api(api_url, **options):
+    """Trigger re-analysis on a running API server and print streamed progress"""
+    headers = {"Authorization": f"Bearer {os.environ['API_TOKEN']}"} if os.getenv('API_TOKEN') else {}
+    response = requests.post(f"{api_url.rstrip('/')}/api/reanalyze", json=options, headers=headers,
+                             stream=True, timeout=None)
+    if response.status_code != 200:
+        print(f"✗ Error: {response.status_code} - {response.text}")
+        return False
+    for line in response.iter_lines():
+        if line:
+            _print_progress(json.loads(line))
+    return True
+
+def _print_progress(progress):
+    """Print a single progress report"""
+    if 'error' in progress:
+        print(f"✗ {progress['error']}")
+        return
+    print(f"🔍 {progress['processed']}/{progress['total']} re-analyzed "
+          f"({progress['changed']} score changes, {progress['elapsed']}s)")
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-score stored interviews with the current rubric")
+    parser.add_argument('--ids', nargs='*', help="Only re-analyze these interview ids")
+    parser.add_argument('--since', help="Only interviews recorded at or after this ISO timestamp")
+    parser.add_argument('--until', help="Only interviews recorded at or before this ISO timestamp")
+    parser.add_argument('--processed-by', help="Only interviews from this source (recall or n8n)")
+    parser.add_argument('--stale-only', action='store_true', help="Only interviews scored with an older rubric version")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help="Interviews written back per batch")
+    parser.add_argument('--data-file', default=str(SNAPSHOT_FILE), help="Interview snapshot to update in place")
+    parser.add_argument('--api', help="Run on a live API server instead, e.g. http://localhost:5000")
+    args = parser.parse_args()
+    try:
+        parse_time_filter(args.since, '--since')
+        parse_time_filter(args.until, '--until')
+    except ValueError as e:
+        parser.error(str(e))
+
+    options = {
+        "ids": args.ids,
+        "since": args.since,
+        "until": args.until,
+        "processed_by": args.processed_by,
+        "stale_only": args.stale_only,
+    }
+
+    print(f"{'='*60}")
+    print("Bulk Interview Re-analysis")
+    print(f"{'='*60}\n")
+
+    if args.api:
+        ok = reanalyze_via_api(args.api, workers=args.workers, batch_size=args.batch_size, **options)
+        sys.exit(0 if ok else 1)
+
+    data_file = Path(args.data_file)
+    if not data_file.exists() and not DATA_FILE.exists():
+        print(f"✗ No interview data at {data_file}")
+        sys.exit(1)
+    # A running API server owns the store; rewriting it underneath would lose its updates
+    if not DataDirLock(data_file.parent).acquire():
+        print(f"✗ An API server is using {data_file.parent}; re-run with --api <server URL>")
+        sys.exit(1)
+    store = InterviewStore(data_file).load(legacy_json=DATA_FILE)
+    interviews = list(store)
+    positions = {id(interview): idx for idx, interview in enumerate(interviews)}
+
+    def apply(interview, analysis, reanalyzed_at):
+        store[positions[id(interview)]] = {**interview, 'analysis': analysis, 'last_reanalyzed': reanalyzed_at}
+        return True
+
+    for progress in reanalyze_interviews(interviews, workers=args.workers, batch_size=args.batch_size,
+                                         on_batch=lambda batch: store.flush(), apply=apply, **options):
+        _print_progress(progress)
+    print(f"\n💾 Saved re-analyzed interviews to {data_file}")
+
+if __name__ == '__main__':
+    main()
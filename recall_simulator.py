@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Local Recall.ai simulator for load-testing webhook ingestion
+Accepts the bot-creation payload built by interview_bot.create_interview_bot,
+returns bot ids, then streams realistic realtime transcription webhooks
+(partials and finals) and a recording-complete payload to the bot's webhook.
+
+Usage:
+  python3 recall_simulator.py serve --port 5055
+  RECALL_API_BASE_URL=http://localhost:5055 python3 batch_launcher.py schedule.json
+
+  python3 recall_simulator.py load --meetings 200 --webhook-url http://localhost:5000/api/webhook/recall
+"""
+import argparse
+import random
+import threading
+import time
+import uuid
+from datetime import datetime
+
+import requests
+from flask import Flask, request, jsonify
+
+INTERVIEWER = "AI Interviewer - Sarah"
+
+QUESTIONS = [
+    "Can you walk me through a recent project you are proud of?",
+    "How do you approach debugging a production issue?",
+    "What is your experience with cloud platforms like AWS or GCP?",
+    "How do you make sure your code is well tested?",
+    "Tell me about a time you disagreed with a teammate. How did you resolve it?",
+    "How would you design a rate limiter for a public API?",
+    "Which databases have you used and how did you choose between them?",
+]
+
+ANSWERS = [
+    "I built a REST API in Python with Flask and PostgreSQL that handled a few thousand requests per second.",
+    "We moved our services to Docker and Kubernetes on AWS, which made deployments much more reliable.",
+    "First I try to reproduce the problem locally, then I add logging and narrow it down with a debugger.",
+    "I write unit tests with pytest and integration tests that run in our CI/CD pipeline on every merge.",
+    "On the frontend I mostly use React with TypeScript, and on the backend Node and Express.",
+    "We had a performance challenge with a slow SQL query, so I added an index and cached results in Redis.",
+    "I mentor junior developers and do a lot of code review, and we pair program on tricky features.",
+    "For authentication we used OAuth with JWT tokens and rotated the signing keys regularly.",
+    "I like to break the problem down, discuss the trade-offs with the team and then refactor incrementally.",
+    "Our architecture was a set of microservices communicating over GraphQL and a message queue.",
+]
+
+class RecallSimulator:
+    """Simulates Recall.ai bots streaming transcription webhooks"""
+
+    def __init__(self, utterances=12, interval=1.0, jitter=0.5, partials=2, candidate_ratio=0.6,
+                 speakers=None, max_in_flight=50, send_recording=True, timeout=30, seed=None):
+        self.utterances = utterances
+        self.interval = interval
+        self.jitter = jitter
+        self.partials = partials
+        self.candidate_ratio = candidate_ratio
+        self.speakers = speakers or ["Candidate"]
+        self.send_recording = send_recording
+        self.timeout = timeout
+        self.random = random.Random(seed)
+        self.in_flight = threading.BoundedSemaphore(max_in_flight)
+        self.bots = {}
+        self.lock = threading.Lock()
+        self.results = []  # (latency_seconds, status_code or error, event_kind)
+
+    def create_bot(self, payload):
+        """Register a bot from a Recall.ai bot-creation payload and start its meeting"""
+        meeting_url = payload.get('meeting_url')
+        webhook = (payload.get('realtime_media', {}).get('transcription', {}).get('webhook') or {})
+        if not meeting_url or not webhook.get('url'):
+            raise ValueError("meeting_url and realtime_media.transcription.webhook.url are required")
+
+        bot_id = str(uuid.uuid4())
+        bot = {
+            "id": bot_id,
+            "bot_name": payload.get('bot_name'),
+            "meeting_url": meeting_url,
+            "status": "joining",
+            "created_at": datetime.now().isoformat()
+        }
+        with self.lock:
+            self.bots[bot_id] = bot
+        threading.Thread(target=self.run_meeting, args=(bot_id, meeting_url, webhook['url']), daemon=True).start()
+        return bot
+
+    def run_meeting(self, bot_id, meeting_url, webhook_url):
+        """Stream one simulated meeting's transcription to the webhook"""
+        rng = random.Random(self.random.random())
+        session = requests.Session()
+        segments = []
+        started = time.time()
+        self._set_status(bot_id, "in_call_recording")
+
+        for _ in range(self.utterances):
+            if rng.random() < self.candidate_ratio:
+                speaker, text = rng.choice(self.speakers), rng.choice(ANSWERS)
+            else:
+                speaker, text = INTERVIEWER, rng.choice(QUESTIONS)
+            words = text.split()
+
+            # Partials grow towards the final utterance, like streaming ASR
+            for i in range(1, self.partials + 1):
+                cut = max(1, len(words) * i // (self.partials + 1))
+                self._post(session, webhook_url, self._transcription(bot_id, meeting_url, speaker,
+                                                                    " ".join(words[:cut]), False), 'partial')
+                self._pause(rng, self.interval / (self.partials + 1))
+            self._post(session, webhook_url, self._transcription(bot_id, meeting_url, speaker, text, True), 'final')
+            segments.append({"speaker": speaker, "text": text})
+            self._pause(rng, self.interval)
+
+        if self.send_recording:
+            self._post(session, webhook_url, {
+                "event": "bot.done",
+                "bot_id": bot_id,
+                "meeting_url": meeting_url,
+                "duration": round(time.time() - started, 1),
+                "recording": {
+                    "id": str(uuid.uuid4()),
+                    "transcript": segments
+                }
+            }, 'recording')
+        self._set_status(bot_id, "done")
+
+    def run_load(self, meetings, webhook_url, stagger=0.0):
+        """Run many simultaneous meetings against a webhook and wait for them"""
+        threads = []
+        for i in range(meetings):
+            bot_id = f"sim_{uuid.uuid4().hex[:12]}"
+            with self.lock:
+                self.bots[bot_id] = {"id": bot_id, "status": "joining"}
+            thread = threading.Thread(target=self.run_meeting,
+                                      args=(bot_id, f"https://meet.google.com/sim-{i}", webhook_url), daemon=True)
+            thread.start()
+            threads.append(thread)
+            if stagger:
+                time.sleep(stagger)
+        for thread in threads:
+            thread.join()
+        return self.stats()
+
+    def stats(self):
+        """Webhook delivery latency and status summary"""
+        with self.lock:
+            results = list(self.results)
+        latencies = sorted(r[0] for r in results)
+        statuses = {}
+        for _, status, _ in results:
+            statuses[str(status)] = statuses.get(str(status), 0) + 1
+
+        def percentile(p):
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000, 1)
+
+        return {
+            "requests": len(results),
+            "statuses": statuses,
+            "latency_ms": {
+                "p50": percentile(0.50),
+                "p95": percentile(0.95),
+                "p99": percentile(0.99),
+                "max": round(latencies[-1] * 1000, 1) if latencies else None
+            }
+        }
+
+    def _transcription(self, bot_id, meeting_url, speaker, text, is_final):
+        return {
+            "event": "transcription",
+            "bot_id": bot_id,
+            "meeting_url": meeting_url,
+            "speaker": speaker,
+            "text": text,
+            "is_final": is_final,
+            "timestamp": datetime.now().isoformat()
+        }
+
+    def _post(self, session, url, payload, kind):
+        with self.in_flight:
+            started = time.time()
+            try:
+                status = session.post(url, json=payload, timeout=self.timeout).status_code
+            except requests.exceptions.RequestException as e:
+                status = type(e).__name__
+            elapsed = time.time() - started
+        with self.lock:
+            self.results.append((elapsed, status, kind))
+
+    def _pause(self, rng, seconds):
+        if seconds > 0:
+            time.sleep(max(0.0, seconds + rng.uniform(-self.jitter, self.jitter) * seconds))
+
+    def _set_status(self, bot_id, status):
+        with self.lock:
+            if bot_id in self.bots:
+                self.bots[bot_id]['status'] = status
+
+def create_app(simulator):
+    """Flask app exposing the Recall.ai bot API backed by a simulator"""
+    app = Flask(__name__)
+
+    @app.route('/api/v1/bot/', methods=['POST'])
+    def create_bot():
+        try:
+            return jsonify(simulator.create_bot(request.json or {})), 201
+        except ValueError as e:
+            return jsonify({"detail": str(e)}), 400
+
+    @app.route('/api/v1/bot/<bot_id>/', methods=['GET'])
+    def get_bot(bot_id):
+        bot = simulator.bots.get(bot_id)
+        if not bot:
+            return jsonify({"detail": "Not found."}), 404
+        return jsonify(bot)
+
+    @app.route('/stats', methods=['GET'])
+    def stats():
+        return jsonify(simulator.stats())
+
+    return app
+
+def main():
+    parser = argparse.ArgumentParser(description="Local Recall.ai simulator")
+    parser.add_argument('mode', choices=['serve', 'load'], help="serve the bot API, or run a load test directly")
+    parser.add_argument('--port', type=int, default=5055, help="Port for serve mode")
+    parser.add_argument('--webhook-url', default="http://localhost:5000/api/webhook/recall", help="Webhook for load mode")
+    parser.add_argument('--meetings', type=int, default=50, help="Simultaneous meetings in load mode")
+    parser.add_argument('--stagger', type=float, default=0.0, help="Seconds between meeting starts in load mode")
+    parser.add_argument('--utterances', type=int, default=12, help="Utterances per meeting")
+    parser.add_argument('--interval', type=float, default=1.0, help="Seconds between utterances")
+    parser.add_argument('--jitter', type=float, default=0.5, help="Relative pacing jitter (0-1)")
+    parser.add_argument('--partials', type=int, default=2, help="Partial results sent before each final")
+    parser.add_argument('--candidate-ratio', type=float, default=0.6, help="Share of utterances spoken by candidates")
+    parser.add_argument('--speakers', nargs='*', help="Candidate speaker names")
+    parser.add_argument('--max-in-flight', type=int, default=50, help="Concurrent webhook requests")
+    parser.add_argument('--no-recording', action='store_true', help="Don't send recording-complete payloads")
+    parser.add_argument('--seed', type=int, default=None, help="Random seed for reproducible runs")
+    args = parser.parse_args()
+
+    simulator = RecallSimulator(
+        utterances=args.utterances, interval=args.interval, jitter=args.jitter, partials=args.partials,
+        candidate_ratio=args.candidate_ratio, speakers=args.speakers, max_in_flight=args.max_in_flight,
+        send_recording=not args.no_recording, seed=args.seed
+    )
+
+    print(f"{'='*60}")
+    print("Recall.ai Simulator")
+    print(f"{'='*60}\n")
+
+    if args.mode == 'serve':
+        print(f"Bot API: http://localhost:{args.port}/api/v1/bot/")
+        print(f"Set RECALL_API_BASE_URL=http://localhost:{args.port} to use it\n")
+        create_app(simulator).run(host='0.0.0.0', port=args.port, threaded=True)
+        return
+
+    print(f"Simulating {args.meetings} meetings → {args.webhook_url}\n")
+    started = time.time()
+    stats = simulator.run_load(args.meetings, args.webhook_url, stagger=args.stagger)
+    elapsed = time.time() - started
+    print(f"✓ {stats['requests']} webhooks in {elapsed:.1f}s ({stats['requests'] / elapsed:.1f}/s)")
+    print(f"  Statuses: {stats['statuses']}")
+    print(f"  Latency: p50 {stats['latency_ms']['p50']}ms  p95 {stats['latency_ms']['p95']}ms  "
+          f"p99 {stats['latency_ms']['p99']}ms  max {stats['latency_ms']['max']}ms")
+
+if __name__ == '__main__':
+    main()
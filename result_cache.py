@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Result caches keyed by interview
+Keeps n8n enhance_analysis / generate_report results per interview and
+transcript hash, and serialized API responses per interview and record
+version, with LRU size eviction and a TTL, so repeated views of an
+interview need neither another MCP round trip nor re-serialization.
+"""
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+
+def transcript_hash(transcript):
+    """Fingerprint of the transcript a result was computed from"""
+    return hashlib.sha256((transcript or '').encode('utf-8')).hexdigest()
+
+class ResultCache:
+    """Thread-safe LRU cache with per-entry expiry, keyed by (kind, interview_id, ...) tuples"""
+
+    def __init__(self, max_entries=512, ttl=3600.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+
+    def get(self, key):
+        """Cached value for key, or None if absent or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] < time.monotonic():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self._stats['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats['hits'] += 1
+            return entry[1]
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats['evictions'] += 1
+
+    def get_or_compute(self, key, compute):
+        """Cached value, or compute() stored for next time (failed, None results aren't cached)"""
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            if value is not None:
+                self.put(key, value)
+        return value
+
+    def invalidate(self, interview_id):
+        """Drop every result for an interview, e.g. when its transcript grows"""
+        with self._lock:
+            stale = [key for key in self._entries if key[1] == interview_id]
+            for key in stale:
+                del self._entries[key]
+            self._stats['invalidations'] += len(stale)
+            return len(stale)
+
+    def stats(self):
+        with self._lock:
+            lookups = self._stats['hits'] + self._stats['misses']
+            return {"size": len(self._entries), "max_entries": self.max_entries, "ttl": self.ttl, **self._stats,
+                    "hit_rate": round(self._stats['hits'] / lookups, 3) if lookups else 0.0}
+
+# Shared by every N8NBackend in the process, so api_server can invalidate it
+n8n_result_cache = ResultCache(
+    max_entries=int(os.getenv('N8N_CACHE_SIZE', '512')),
+    ttl=float(os.getenv('N8N_CACHE_TTL', '3600'))
+)
+
+# Serialized bodies of hot interview reads in api_server
+response_cache = ResultCache(
+    max_entries=int(os.getenv('RESPONSE_CACHE_SIZE', '256')),
+    ttl=float(os.getenv('RESPONSE_CACHE_TTL', '3600'))
+)
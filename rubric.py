@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Versioned interview scoring rubric
+Keyword lists, weights and normalization used by analyze_interview.
+A custom rubric can be loaded from a JSON file via RUBRIC_FILE.
+"""
+import copy
+import hashlib
+import json
+import os
+
+# Versioned by its content fingerprint (set below), so editing it marks older analyses stale
+DEFAULT_RUBRIC = {
+    "keywords": {
+        # Enhanced technical keywords for software developers
+        "programming_languages": ['python', 'javascript', 'java', 'c++', 'c#', 'go', 'rust', 'typescript',
+                                  'ruby', 'php', 'swift', 'kotlin', 'scala', 'dart', 'r', 'matlab'],
+        "frameworks": ['react', 'angular', 'vue', 'django', 'flask', 'spring', 'express', 'node',
+                       'laravel', 'rails', 'next', 'nuxt', 'nest', 'fastapi'],
+        "technical_concepts": ['api', 'rest', 'graphql', 'microservices', 'docker', 'kubernetes',
+                               'aws', 'azure', 'gcp', 'database', 'sql', 'nosql', 'mongodb',
+                               'postgresql', 'redis', 'elasticsearch', 'git', 'ci/cd', 'devops',
+                               'agile', 'scrum', 'tdd', 'testing', 'unit test', 'integration test',
+                               'algorithm', 'data structure', 'big o', 'optimization', 'scalability',
+                               'security', 'authentication', 'authorization', 'oauth', 'jwt'],
+        "soft_skills": ['team', 'collaboration', 'communication', 'leadership', 'mentor',
+                        'code review', 'pair programming', 'scrum master', 'product owner'],
+        "problem_solving": ['problem', 'solution', 'approach', 'challenge', 'solve', 'debug',
+                            'troubleshoot', 'optimize', 'refactor', 'architecture', 'design pattern']
+    },
+    "weights": {
+        "technical": 0.4,
+        "communication": 0.3,
+        "problem_solving": 0.2,
+        "engagement": 0.1
+    },
+    # Values at which each component saturates to a ratio of 1.0
+    "normalization": {
+        "technical_depth": 15,
+        "communication_quality": 20,
+        "problem_solving": 10,
+        "word_count": 500,
+        "words_per_communication_point": 50
+    }
+}
+
+def rubric_fingerprint(rubric):
+    """Stable short hash of a rubric's scoring content"""
+    content = {k: v for k, v in rubric.items() if k != 'version'}
+    encoded = json.dumps(content, sort_keys=True).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()[:12]
+
+DEFAULT_RUBRIC['version'] = rubric_fingerprint(DEFAULT_RUBRIC)
+
+def build_rubric(overrides=None):
+    """Merge overrides over the default rubric and assign its version
+
+    Sections that are present in the overrides replace the matching keys of
+    the default. A rubric without an explicit version is versioned by its
+    content fingerprint so edited rubrics never share a version.
+    """
+    rubric = copy.deepcopy(DEFAULT_RUBRIC)
+    overrides = overrides or {}
+    for section in ('keywords', 'weights', 'normalization'):
+        rubric[section].update(overrides.get(section, {}))
+    rubric['version'] = str(overrides.get('version') or rubric_fingerprint(rubric))
+    return rubric
+
+def load_rubric(path=None):
+    """Load a rubric from a JSON file, falling back to the default rubric"""
+    path = path or os.getenv('RUBRIC_FILE')
+    if not path:
+        return copy.deepcopy(DEFAULT_RUBRIC)
+    with open(path, 'r') as f:
+        return build_rubric(json.load(f))
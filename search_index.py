@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Inverted index for full-text search over interview transcripts
+Maintained incrementally as transcript chunks arrive; supports boolean
+(AND/OR/NOT) and "phrase" queries with BM25 ranking and snippets.
+Archived interviews stay indexed so search covers them, so the index is
+not bounded: it grows with the total number of interviews.
+"""
+import math
+import re
+import threading
+
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*")
+QUERY_RE = re.compile(r'"[^"]*"|\(|\)|-?[^\s()"]+')
+
+# BM25 tuning
+K1 = 1.2
+B = 0.75
+
+def tokenize(text):
+    """Lowercase word tokens of a transcript (keeps c++, c#, etc. intact)"""
+    return TOKEN_RE.findall((text or '').lower())
+
+def _token_spans(text):
+    """Token character spans in a transcript, in token order"""
+    return [(m.start(), m.end()) for m in TOKEN_RE.finditer((text or '').lower())]
+
+class QuerySyntaxError(ValueError):
+    """Raised for malformed search queries"""
+
+class TranscriptIndex:
+    """Positional inverted index over interview transcripts"""
+
+    def __init__(self):
+        self._postings = {}    # term -> {doc_id: [positions]}
+        self._doc_lengths = {}  # doc_id -> number of tokens
+        self._doc_terms = {}    # doc_id -> set of terms, so removal only touches its postings
+        self._total_length = 0
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._doc_lengths)
+
+    def add_text(self, doc_id, text):
+        """Append a transcript chunk to a document, indexing only the new tokens"""
+        tokens = tokenize(text)
+        with self._lock:
+            offset = self._doc_lengths.get(doc_id, 0)
+            for position, term in enumerate(tokens, start=offset):
+                self._postings.setdefault(term, {}).setdefault(doc_id, []).append(position)
+            self._doc_terms.setdefault(doc_id, set()).update(tokens)
+            self._doc_lengths[doc_id] = offset + len(tokens)
+            self._total_length += len(tokens)
+
+    def set_text(self, doc_id, text):
+        """Replace a document's full transcript"""
+        with self._lock:
+            self.remove(doc_id)
+            self.add_text(doc_id, text)
+
+    def remove(self, doc_id):
+        """Drop a document from the index"""
+        with self._lock:
+            if doc_id not in self._doc_lengths:
+                return
+            for term in self._doc_terms.pop(doc_id, ()):
+                docs = self._postings[term]
+                del docs[doc_id]
+                if not docs:
+                    del self._postings[term]
+            self._total_length -= self._doc_lengths.pop(doc_id)
+
+    def rebuild(self, documents):
+        """Rebuild the index from (doc_id, text) pairs"""
+        with self._lock:
+            self._postings = {}
+            self._doc_lengths = {}
+            self._doc_terms = {}
+            self._total_length = 0
+            for doc_id, text in documents:
+                self.add_text(doc_id, text)
+
+    def search(self, query, limit=20):
+        """Run a query, returning [(doc_id, relevance, matched_terms)] best first"""
+        node = _QueryParser(query).parse()
+        with self._lock:
+            matches = self._evaluate(node)
+            terms = _positive_terms(node)
+            ranked = sorted(((doc_id, self._bm25(doc_id, terms)) for doc_id in matches),
+                            key=lambda item: item[1], reverse=True)
+        return [(doc_id, round(score, 4), terms) for doc_id, score in ranked[:limit]], len(ranked)
+
+    def _evaluate(self, node):
+        kind = node[0]
+        if kind == 'term':
+            return set(self._postings.get(node[1], ()))
+        if kind == 'phrase':
+            return self._phrase_docs(node[1])
+        if kind == 'not':
+            return set(self._doc_lengths) - self._evaluate(node[1])
+        if kind == 'and':
+            result = None
+            # Evaluate positive clauses first so NOT clauses only subtract
+            for child in sorted(node[1], key=lambda c: c[0] == 'not'):
+                if child[0] == 'not' and result is not None:
+                    result -= self._evaluate(child[1])
+                else:
+                    docs = self._evaluate(child)
+                    result = docs if result is None else result & docs
+                if not result:
+                    return set()
+            return result or set()
+        if kind == 'or':
+            result = set()
+            for child in node[1]:
+                result |= self._evaluate(child)
+            return result
+        return set()
+
+    def _phrase_docs(self, terms):
+        if not terms:
+            return set()
+        postings = [self._postings.get(term, {}) for term in terms]
+        candidates = set(postings[0])
+        for docs in postings[1:]:
+            candidates &= set(docs)
+        matched = set()
+        for doc_id in candidates:
+            following = [set(docs[doc_id]) for docs in postings[1:]]
+            for start in postings[0][doc_id]:
+                if all(start + i in positions for i, positions in enumerate(following, start=1)):
+                    matched.add(doc_id)
+                    break
+        return matched
+
+    def _bm25(self, doc_id, terms):
+        doc_count = len(self._doc_lengths)
+        avg_length = self._total_length / doc_count if doc_count else 0
+        length = self._doc_lengths.get(doc_id, 0)
+        score = 0.0
+        for term in terms:
+            docs = self._postings.get(term, {})
+            tf = len(docs.get(doc_id, ()))
+            if not tf:
+                continue
+            idf = math.log(1 + (doc_count - len(docs) + 0.5) / (len(docs) + 0.5))
+            norm = K1 * (1 - B + B * length / avg_length) if avg_length else K1
+            score += idf * tf * (K1 + 1) / (tf + norm)
+        return score
+
+def make_snippet(text, terms, width=160):
+    """Excerpt of text around the first matched term, with match offsets"""
+    text = text or ''
+    terms = set(terms)
+    spans = [span for span, token in zip(_token_spans(text), tokenize(text)) if token in terms]
+    if not spans:
+        return text[:width], []
+    first = spans[0][0]
+    start = max(0, first - width // 3)
+    if start > 0:
+        # Don't cut the leading word in half
+        start = text.rfind(' ', 0, start) + 1
+    end = min(len(text), start + width)
+    snippet = text[start:end]
+    highlights = [[s - start, e - start] for s, e in spans if s >= start and e <= end]
+    if start > 0:
+        snippet = "..." + snippet
+        highlights = [[s + 3, e + 3] for s, e in highlights]
+    if end < len(text):
+        snippet += "..."
+    return snippet, highlights
+
+def _positive_terms(node):
+    """Terms that contribute to ranking (everything not under a NOT)"""
+    kind = node[0]
+    if kind == 'term':
+        return [node[1]]
+    if kind == 'phrase':
+        return list(node[1])
+    if kind in ('and', 'or'):
+        terms = []
+        for child in node[1]:
+            terms.extend(t for t in _positive_terms(child) if t not in terms)
+        return terms
+    return []
+
+class _QueryParser:
+    """Recursive-descent parser for search queries
+
+    query  := or
+    or     := and ("OR" and)*
+    and    := unary+            (implicit AND, "AND" is optional)
+    unary  := "NOT" unary | "-"word | word | "phrase" | "(" or ")"
+    """
+
+    def __init__(self, query):
+        self.tokens = QUERY_RE.findall(query or '')
+        self.pos = 0
+
+    def parse(self):
+        if not self.tokens:
+            raise QuerySyntaxError("Empty query")
+        node = self._or()
+        if self.pos < len(self.tokens):
+            raise QuerySyntaxError(f"Unexpected '{self.tokens[self.pos]}'")
+        return node
+
+    def _peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def _or(self):
+        children = [self._and()]
+        while self._peek() == 'OR':
+            self.pos += 1
+            children.append(self._and())
+        return children[0] if len(children) == 1 else ('or', children)
+
+    def _and(self):
+        children = []
+        while self._peek() not in (None, ')', 'OR'):
+            if self._peek() == 'AND':
+                self.pos += 1
+                continue
+            children.append(self._unary())
+        if not children:
+            raise QuerySyntaxError("Expected a search term")
+        return children[0] if len(children) == 1 else ('and', children)
+
+    def _unary(self):
+        token = self._peek()
+        self.pos += 1
+        if token == 'NOT':
+            return ('not', self._unary())
+        if token == '(':
+            node = self._or()
+            if self._peek() != ')':
+                raise QuerySyntaxError("Missing ')'")
+            self.pos += 1
+            return node
+        if token.startswith('"'):
+            return ('phrase', tokenize(token.strip('"')))
+        if token.startswith('-') and len(token) > 1:
+            return ('not', self._word(token[1:]))
+        return self._word(token)
+
+    def _word(self, token):
+        terms = tokenize(token)
+        if not terms:
+            raise QuerySyntaxError(f"Nothing to search for in '{token}'")
+        # Words like "ci/cd" tokenize into several terms and match as a phrase
+        return ('term', terms[0]) if len(terms) == 1 else ('phrase', terms)
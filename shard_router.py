@@ -0,0 +1,493 @@
+#!/usr/bin/env python3
+"""
+Sharded deployment: consistent-hash router in front of several API nodes
+Interviews are partitioned by bot_id over a hash ring of api_server nodes
+(each with its own DATA_DIR). The router forwards webhooks and reads for
+one interview to the owning node and fans list, search, analytics and
+health queries out to all of them. Re-analysis, rubric reloads and profile
+listings run on every node. Imports are split between the nodes that own
+their interviews. Synthesized speech is placed on nodes by its audio key.
+
+Search results are merged by each shard's BM25 score. Every shard computes
+IDF and average length over its own transcripts, so scores from different
+shards are not strictly comparable and the merged order is approximate.
+
+Adding a node moves only about 1/N of the keys. Meetings that started
+before the change keep going to the node that holds them (pass the old
+node list as --previous-nodes), and reads of moved keys fall back to
+asking every node.
+
+Usage:
+  python3 shard_router.py --spawn 3                    # 3 local nodes on 5001-5003, router on 5000
+  python3 shard_router.py --nodes http://10.0.0.5:5000,http://10.0.0.6:5000
+  python3 shard_router.py --nodes http://a:5000,http://b:5000,http://c:5000 --previous-nodes http://a:5000,http://b:5000
+"""
+import argparse
+import bisect
+import hashlib
+import json
+import os
+import queue
+import signal
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import requests
+from flask import Flask, Response, jsonify, request, send_from_directory, stream_with_context
+from flask_cors import CORS
+
+from analytics import merge_snapshots
+from audio_store import DEFAULT_MODEL_ID, DEFAULT_VOICE_ID, audio_key
+from bulk_import import import_id, iter_stream_lines
+
+BASE_DIR = Path(__file__).parent
+VIRTUAL_NODES = 128
+FORWARD_TIMEOUT = float(os.getenv('SHARD_FORWARD_TIMEOUT', '30'))
+IMPORT_CHUNK = int(os.getenv('SHARD_IMPORT_CHUNK', '5000'))  # items sent to a node per import request
+HOP_HEADERS = {'connection', 'keep-alive', 'transfer-encoding', 'content-length', 'content-encoding'}
+
+def _hash(value):
+    return int.from_bytes(hashlib.md5(value.encode('utf-8')).digest()[:8], 'big')
+
+class HashRing:
+    """Consistent hash ring with virtual nodes"""
+
+    def __init__(self, nodes=(), vnodes=VIRTUAL_NODES):
+        self.vnodes = vnodes
+        self._ring = []  # sorted (hash, node)
+        self.nodes = []
+        for node in nodes:
+            self.add(node)
+
+    def add(self, node):
+        if node in self.nodes:
+            return
+        self.nodes.append(node)
+        for i in range(self.vnodes):
+            bisect.insort(self._ring, (_hash(f"{node}#{i}"), node))
+
+    def remove(self, node):
+        self.nodes.remove(node)
+        self._ring = [entry for entry in self._ring if entry[1] != node]
+
+    def node_for(self, key):
+        """Node owning a key"""
+        if not self._ring:
+            raise LookupError("hash ring is empty")
+        index = bisect.bisect(self._ring, (_hash(str(key)),)) % len(self._ring)
+        return self._ring[index][1]
+
+def shard_key(path, data, body=b''):
+    """bot_id (or interview id) a webhook belongs to, as api_server derives it"""
+    data = data if isinstance(data, dict) else {}
+    if path.endswith('/n8n'):
+        data = data.get('interview_data', data)
+        key = data.get('bot_id') or data.get('id')
+    else:
+        bot = data.get('bot')
+        key = data.get('bot_id') or data.get('id') or (bot.get('id') if isinstance(bot, dict) else None)
+    # Without an id, api_server makes one up; any node will do, so spread by content
+    return str(key) if key else hashlib.md5(body).hexdigest()
+
+class ShardRouter:
+    """Forwarding and fan-out over the nodes of a hash ring"""
+
+    def __init__(self, nodes, previous_nodes=None, timeout=FORWARD_TIMEOUT):
+        self.ring = HashRing(nodes)
+        self.previous = HashRing(previous_nodes) if previous_nodes else None
+        self.timeout = timeout
+        self._local = threading.local()
+        self._pool = ThreadPoolExecutor(max_workers=max(4, len(nodes) * 4), thread_name_prefix="fanout")
+        self.stats = {"forwarded": 0, "fanouts": 0, "fallbacks": 0, "sticky": 0, "node_errors": 0}
+        self._stats_lock = threading.Lock()
+
+    def count(self, stat):
+        with self._stats_lock:
+            self.stats[stat] += 1
+
+    def _session(self):
+        # One pooled session per thread
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
+
+    def call(self, node, method, path, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+        return self._session().request(method, f"{node}{path}", **kwargs)
+
+    def owner(self, key):
+        """Node for a key; an interview that already lives on its pre-resize owner stays there"""
+        node = self.ring.node_for(key)
+        if self.previous:
+            old = self.previous.node_for(key)
+            if old != node and old in self.ring.nodes:
+                try:
+                    if self.call(old, 'GET', f"/api/interviews/{key}").status_code == 200:
+                        self.count('sticky')
+                        return old
+                except requests.exceptions.RequestException:
+                    pass
+        return node
+
+    def fan_out(self, method, path, **kwargs):
+        """Send a request to every node at once; returns [(node, response or None)]"""
+        self.count('fanouts')
+
+        def one(node):
+            try:
+                return node, self.call(node, method, path, **kwargs)
+            except requests.exceptions.RequestException as e:
+                print(f"⚠️  Shard {node} unreachable: {e}")
+                self.count('node_errors')
+                return node, None
+        return list(self._pool.map(one, self.ring.nodes))
+
+def relay(response):
+    """Flask response carrying a node's response"""
+    headers = [(k, v) for k, v in response.headers.items() if k.lower() not in HOP_HEADERS]
+    return Response(response.content, status=response.status_code, headers=headers)
+
+def forward_headers():
+    """Headers of the current request to pass on to a node (auth tokens, Range, validators)"""
+    return {k: v for k, v in request.headers.items() if k.lower() not in HOP_HEADERS and k.lower() != 'host'}
+
+def forward(router, node):
+    """Send the current request to one node and relay its answer"""
+    router.count('forwarded')
+    try:
+        response = router.call(node, request.method, request.full_path.rstrip('?'), data=request.get_data(),
+                               headers=forward_headers(), allow_redirects=False)
+    except requests.exceptions.RequestException as e:
+        router.count('node_errors')
+        return jsonify({"status": "error", "message": f"Shard {node} unavailable: {e}"}), 503
+    return relay(response)
+
+def tagged_lines(node, response):
+    """A node's NDJSON progress lines, each tagged with the node"""
+    for line in response.iter_lines():
+        if line:
+            yield json.dumps({"node": node, **json.loads(line)}) + "\n"
+
+def merge_streams(streams):
+    """Interleave the NDJSON lines of several open streaming responses as they arrive"""
+    lines = queue.Queue()
+
+    def pump(node, response):
+        try:
+            for line in tagged_lines(node, response):
+                lines.put(line)
+        except (requests.exceptions.RequestException, ValueError) as e:
+            lines.put(json.dumps({"node": node, "error": str(e)}) + "\n")
+        finally:
+            response.close()
+            lines.put(None)
+
+    for node, response in streams:
+        threading.Thread(target=pump, args=(node, response), daemon=True).start()
+    for _ in streams:
+        while (line := lines.get()) is not None:
+            yield line
+
+def create_app(router):
+    app = Flask(__name__, static_folder=str(BASE_DIR), static_url_path='')
+    CORS(app)
+
+    @app.route('/')
+    def index():
+        return send_from_directory(BASE_DIR, 'index.html')
+
+    @app.route('/dashboard')
+    def dashboard():
+        return send_from_directory(BASE_DIR, 'dashboard.html')
+
+    @app.route('/api/webhook/recall', methods=['POST'])
+    @app.route('/api/webhook/n8n', methods=['POST'])
+    def webhook():
+        body = request.get_data()
+        node = router.owner(shard_key(request.path, request.get_json(silent=True), body))
+        router.count('forwarded')
+        try:
+            response = router.call(node, 'POST', request.full_path.rstrip('?'), data=body,
+                                   headers={"Content-Type": request.content_type or 'application/json'})
+        except requests.exceptions.RequestException as e:
+            router.count('node_errors')
+            return jsonify({"status": "error", "message": f"Shard {node} unavailable: {e}"}), 503
+        return relay(response)
+
+    @app.route('/api/interviews/<interview_id>', methods=['GET'])
+    @app.route('/api/interviews/<interview_id>/<any(report, "enhanced-analysis"):view>', methods=['GET'])
+    def interview(interview_id, view=None):
+        path = request.full_path.rstrip('?')
+        node = router.ring.node_for(interview_id)
+        router.count('forwarded')
+        try:
+            response = router.call(node, 'GET', path)
+            if response.status_code != 404:
+                return relay(response)
+        except requests.exceptions.RequestException:
+            router.count('node_errors')
+        # Not on its owner (ids that aren't bot ids, or keys moved by a resize): ask everyone
+        router.count('fallbacks')
+        for _, response in router.fan_out('GET', path):
+            if response is not None and response.status_code != 404:
+                return relay(response)
+        return jsonify({"error": "Interview not found"}), 404
+
+    @app.route('/api/interviews', methods=['GET'])
+    def interviews():
+        merged = []
+        for node, response in router.fan_out('GET', '/api/interviews'):
+            if response is None or response.status_code != 200:
+                return jsonify({"error": f"Shard {node} unavailable"}), 503
+            merged.extend(response.json())
+        merged.sort(key=lambda interview: interview.get('timestamp') or '')
+        return jsonify(merged)
+
+    @app.route('/api/interviews/latest', methods=['GET'])
+    def latest():
+        candidates = [response.json() for _, response in router.fan_out('GET', '/api/interviews/latest')
+                      if response is not None and response.status_code == 200]
+        if not candidates:
+            return jsonify({"error": "No interviews found"}), 404
+        return jsonify(max(candidates, key=lambda interview: interview.get('timestamp') or ''))
+
+    @app.route('/api/interviews/export', methods=['GET'])
+    def export():
+        """Concatenate the nodes' streaming exports (one CSV header)"""
+        fmt = request.args.get('format', 'ndjson')
+        params = request.args.to_dict()
+
+        def generate():
+            for i, node in enumerate(router.ring.nodes):
+                with router._session().get(f"{node}/api/interviews/export", params=params, stream=True,
+                                           timeout=router.timeout) as response:
+                    response.raise_for_status()
+                    lines = response.iter_lines(decode_unicode=False)
+                    if fmt == 'csv' and i > 0:
+                        next(lines, None)
+                    for line in lines:
+                        yield line + b"\n"
+        return Response(stream_with_context(generate()),
+                        mimetype='text/csv' if fmt == 'csv' else 'application/x-ndjson',
+                        headers={"Content-Disposition": f"attachment; filename=interviews.{fmt}"})
+
+    @app.route('/api/search', methods=['GET'])
+    def search():
+        limit = request.args.get('limit', 20, type=int)
+        results, total, took = [], 0, 0.0
+        for node, response in router.fan_out('GET', '/api/search', params=request.args.to_dict()):
+            if response is None:
+                continue
+            if response.status_code != 200:
+                return relay(response)  # e.g. 400 for a query syntax error
+            data = response.json()
+            results.extend(data['results'])
+            total += data['total']
+            took = max(took, data.get('took_ms', 0))
+        results.sort(key=lambda hit: hit['relevance'], reverse=True)
+        return jsonify({"query": request.args.get('q', ''), "total": total, "results": results[:limit],
+                        "took_ms": took, "shards": len(router.ring.nodes)})
+
+    @app.route('/api/analytics', methods=['GET'])
+    def analytics():
+        snapshots = []
+        for node, response in router.fan_out('GET', '/api/analytics', params=request.args.to_dict()):
+            if response is None:
+                return jsonify({"error": f"Shard {node} unavailable"}), 503
+            if response.status_code != 200:
+                return relay(response)
+            snapshots.append(response.json())
+        return jsonify(merge_snapshots(snapshots, request.args.get('granularity', 'day')))
+
+    @app.route('/api/rubric', methods=['GET'])
+    def rubric():
+        """Nodes share RUBRIC_FILE, so the first node that answers speaks for all"""
+        for node in router.ring.nodes:
+            try:
+                return relay(router.call(node, 'GET', '/api/rubric'))
+            except requests.exceptions.RequestException:
+                router.count('node_errors')
+        return jsonify({"error": "No shard available"}), 503
+
+    @app.route('/api/rubric/reload', methods=['POST'])
+    def reload_rubric():
+        results = router.fan_out('POST', '/api/rubric/reload', headers=forward_headers())
+        statuses = {response.status_code if response is not None else None for _, response in results}
+        if len(statuses) == 1 and statuses.isdisjoint({None, 200}):
+            return relay(results[0][1])  # every node refused alike, e.g. 401 without the API token
+        failed = statuses != {200}
+        nodes = {node: response.json() if response is not None else None for node, response in results}
+        return jsonify({"status": "error" if failed else "success", "nodes": nodes}), 502 if failed else 200
+
+    @app.route('/api/reanalyze', methods=['POST'])
+    def reanalyze():
+        """Re-analyze on every node at once, interleaving their NDJSON progress"""
+        streams = router.fan_out('POST', '/api/reanalyze', data=request.get_data(), headers=forward_headers(),
+                                 stream=True, timeout=None)
+        failed = next(((node, response) for node, response in streams
+                       if response is None or response.status_code != 200), None)
+        if failed:
+            for _, response in streams:
+                if response is not None and response is not failed[1]:
+                    response.close()
+            node, response = failed
+            if response is None:
+                return jsonify({"status": "error", "message": f"Shard {node} unavailable"}), 503
+            return relay(response)  # e.g. 400 for an invalid since/until
+        return Response(stream_with_context(merge_streams(streams)), mimetype='application/x-ndjson')
+
+    @app.route('/api/import', methods=['POST'])
+    def import_interviews():
+        """Split an NDJSON import between the nodes owning its interviews, IMPORT_CHUNK items at a time"""
+        params = request.args.to_dict()
+        headers = forward_headers()
+
+        def send(node, lines):
+            router.count('forwarded')
+            with router.call(node, 'POST', '/api/import', data=b"\n".join(lines) + b"\n", params=params,
+                             headers=headers, stream=True, timeout=None) as response:
+                if response.status_code != 200:
+                    raise requests.exceptions.HTTPError(f"{response.status_code} {response.text.strip()}")
+                yield from tagged_lines(node, response)
+
+        def generate():
+            pending = {node: [] for node in router.ring.nodes}
+            node = router.ring.nodes[0]
+            try:
+                for line in iter_stream_lines(request.stream):
+                    if not line.strip():
+                        continue
+                    try:
+                        raw = json.loads(line)
+                    except ValueError:
+                        raw = None
+                    # Unreadable items go to any node, which counts them as failed
+                    node = router.ring.node_for(import_id(raw)) if isinstance(raw, dict) else router.ring.nodes[0]
+                    pending[node].append(line)
+                    if len(pending[node]) >= IMPORT_CHUNK:
+                        yield from send(node, pending[node])
+                        pending[node] = []
+                for node, lines in pending.items():
+                    if lines:
+                        yield from send(node, lines)
+            except requests.exceptions.RequestException as e:
+                router.count('node_errors')
+                yield json.dumps({"node": node, "error": str(e)}) + "\n"
+
+        return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+    @app.route('/api/tts', methods=['GET', 'POST'])
+    def tts():
+        """Speech lives on the node its audio key hashes to"""
+        params = (request.get_json(silent=True) or {}) if request.method == 'POST' else request.args
+        key = audio_key(params.get('text'), params.get('voice_id') or DEFAULT_VOICE_ID,
+                        params.get('model_id') or DEFAULT_MODEL_ID)
+        return forward(router, router.ring.node_for(key))
+
+    @app.route('/api/tts/<key>.mp3', methods=['GET'])
+    def tts_audio(key):
+        return forward(router, router.ring.node_for(key))
+
+    @app.route('/api/debug/profiles', methods=['GET'])
+    def profiles():
+        stats, merged = {}, []
+        for node, response in router.fan_out('GET', '/api/debug/profiles', headers=forward_headers()):
+            if response is None or response.status_code != 200:
+                continue
+            data = response.json()
+            stats[node] = data['profiler']
+            merged.extend({**profile, "node": node} for profile in data['profiles'])
+        if not stats:
+            return jsonify({"status": "error", "message": "Not found"}), 404
+        merged.sort(key=lambda profile: profile.get('started_at') or 0, reverse=True)
+        return jsonify({"profiler": stats, "profiles": merged})
+
+    @app.route('/api/debug/profiles/<profile_id>', methods=['GET'])
+    def profile(profile_id):
+        for node, response in router.fan_out('GET', f"/api/debug/profiles/{profile_id}",
+                                             params=request.args.to_dict(), headers=forward_headers()):
+            if response is not None and response.status_code == 200:
+                return relay(response)
+        return jsonify({"status": "error", "message": "Not found"}), 404
+
+    @app.route('/api/health', methods=['GET'])
+    def health():
+        nodes = {}
+        for node, response in router.fan_out('GET', '/api/health'):
+            nodes[node] = response.json() if response is not None and response.status_code == 200 else None
+        healthy = all(nodes.values())
+        with router._stats_lock:
+            stats = dict(router.stats)
+        return jsonify({
+            "status": "healthy" if healthy else "degraded",
+            "interviews_count": sum(n['interviews_count'] for n in nodes.values() if n),
+            "router": stats,
+            "nodes": nodes
+        }), 200 if healthy else 503
+
+    return app
+
+def spawn_nodes(count, first_port, data_root, log_dir):
+    """Supervised local api_server nodes, each with its own port and DATA_DIR"""
+    from readiness import http_probe
+    from supervisor import Component, Supervisor
+
+    components = []
+    for i in range(count):
+        port = first_port + i
+        data_dir = Path(data_root) / f"node-{i}"
+        data_dir.mkdir(parents=True, exist_ok=True)
+        components.append(Component(f"shard-{i}", [sys.executable, 'api_server.py'],
+                                    http_probe(f"http://localhost:{port}/api/health"),
+                                    env={"PORT": str(port), "DATA_DIR": str(data_dir), "API_DEBUG": "0"},
+                                    log_dir=log_dir))
+    supervisor = Supervisor(components)
+    supervisor.report(supervisor.start())
+    threading.Thread(target=supervisor.monitor, daemon=True).start()
+    return supervisor, [f"http://localhost:{first_port + i}" for i in range(count)]
+
+def parse_nodes(value):
+    return [node.strip().rstrip('/') for node in (value or '').split(',') if node.strip()]
+
+def main():
+    parser = argparse.ArgumentParser(description="Consistent-hash router for sharded API nodes")
+    parser.add_argument('--nodes', default=os.getenv('SHARD_NODES'), help="Comma-separated node URLs")
+    parser.add_argument('--previous-nodes', default=os.getenv('SHARD_PREVIOUS_NODES'),
+                        help="Node list before the last resize, so running meetings stay on their node")
+    parser.add_argument('--spawn', type=int, default=0, help="Start this many local nodes instead of --nodes")
+    parser.add_argument('--first-port', type=int, default=5001, help="Port of the first spawned node")
+    parser.add_argument('--data-root', default=str(BASE_DIR / "shards"), help="DATA_DIR parent for spawned nodes")
+    parser.add_argument('--log-dir', default='/tmp', help="Log directory for spawned nodes")
+    parser.add_argument('--port', type=int, default=int(os.getenv('PORT', '5000')), help="Router port")
+    args = parser.parse_args()
+
+    supervisor = None
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    if args.spawn:
+        supervisor, nodes = spawn_nodes(args.spawn, args.first_port, args.data_root, args.log_dir)
+    else:
+        nodes = parse_nodes(args.nodes)
+    if not nodes:
+        print("✗ No nodes: pass --nodes URL,URL,... or --spawn N")
+        sys.exit(1)
+
+    router = ShardRouter(nodes, parse_nodes(args.previous_nodes))
+    print(f"{'='*60}")
+    print(f"Shard router on http://localhost:{args.port}")
+    print(f"{'='*60}")
+    for node in nodes:
+        print(f"  - {node}")
+    print(f"{'='*60}\n")
+    try:
+        create_app(router).run(host='0.0.0.0', port=args.port, threaded=True)
+    except (KeyboardInterrupt, SystemExit):
+        pass
+    finally:
+        if supervisor:
+            supervisor.stop()
+
+if __name__ == '__main__':
+    main()
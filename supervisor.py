@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Stack supervisor: API server, n8n and ngrok tunnel
+Starts every component at once, waits on real readiness probes (with
+backoff) instead of fixed sleeps, reports time-to-ready and restarts
+components that crash or never become ready. Each restart runs in its own
+thread, so one slow component doesn't hold up the others.
+
+Usage:
+  python3 supervisor.py                         # API server, n8n (if installed) and ngrok
+  python3 supervisor.py --no-tunnel --n8n-stand-in
+  python3 supervisor.py --only api --api-port 5001
+"""
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+from n8n_setup import check_n8n_installed
+from ngrok_setup import check_ngrok_installed
+from readiness import http_probe, ngrok_probe, wait_until_ready
+
+BASE_DIR = Path(__file__).parent
+READY_TIMEOUT = 90
+MAX_RESTARTS = 5         # per RESTART_WINDOW; beyond that a component is given up on
+RESTART_WINDOW = 300
+RESTART_BACKOFF_MAX = 30
+
+class Component:
+    """One supervised child process and its readiness probe"""
+
+    def __init__(self, name, command, probe, env=None, log_dir=Path('/tmp'), ready_timeout=READY_TIMEOUT):
+        self.name = name
+        self.command = command
+        self.probe = probe
+        self.env = env or {}
+        self.log_path = Path(log_dir) / f"{name}.log"
+        self.ready_timeout = ready_timeout
+        self.process = None
+        self.started_at = None
+        self.status = 'stopped'   # starting, ready, failed, crashed, gave_up
+        self.ready_value = None
+        self.ready_after = None
+        self.restarts = []        # restart times, for the restart budget
+
+    def start(self):
+        log = open(self.log_path, 'ab')
+        # Own process group, so stopping also stops anything the component spawned
+        self.process = subprocess.Popen(self.command, cwd=BASE_DIR, stdout=log, stderr=subprocess.STDOUT,
+                                        env={**os.environ, **self.env}, start_new_session=True)
+        log.close()
+        self.status = 'starting'
+        self.started_at = time.monotonic()
+
+    def alive(self):
+        return self.process is not None and self.process.poll() is None
+
+    def wait_ready(self):
+        """Block until the probe passes; records status and time-to-ready"""
+        self.ready_value = wait_until_ready(self.probe, timeout=self.ready_timeout, alive=self.alive)
+        if self.ready_value:
+            self.status = 'ready'
+            self.ready_after = time.monotonic() - self.started_at
+        else:
+            self.status = 'failed' if self.alive() else 'crashed'
+        return self.status == 'ready'
+
+    def stop(self, timeout=10):
+        if not self.alive():
+            return
+        try:
+            os.killpg(self.process.pid, signal.SIGTERM)
+            self.process.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            os.killpg(self.process.pid, signal.SIGKILL)
+            self.process.wait()
+        except ProcessLookupError:
+            pass
+        self.status = 'stopped'
+
+class Supervisor:
+    """Start components in parallel, report readiness and restart crashed or failed ones"""
+
+    def __init__(self, components, poll_interval=1.0):
+        self.components = components
+        self.poll_interval = poll_interval
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()   # no component is started once stop() has begun
+        self._restarting = {}           # component name -> thread restarting it
+
+    def start(self):
+        """Start everything and wait for readiness; returns seconds until the whole stack was ready"""
+        started = time.monotonic()
+        for component in self.components:
+            component.start()
+            print(f"🚀 Started {component.name} (PID {component.process.pid}, log {component.log_path})")
+        threads = [threading.Thread(target=component.wait_ready, daemon=True) for component in self.components]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return time.monotonic() - started
+
+    def report(self, total):
+        print(f"\n{'='*60}")
+        print(f"Stack ready in {total:.1f}s" if all(c.status == 'ready' for c in self.components)
+              else f"Stack started with problems ({total:.1f}s)")
+        print(f"{'='*60}")
+        for c in self.components:
+            if c.status == 'ready':
+                detail = f" → {c.ready_value}" if isinstance(c.ready_value, str) else ""
+                print(f"✓ {c.name:<8} ready after {c.ready_after:.1f}s{detail}")
+            else:
+                print(f"✗ {c.name:<8} {c.status} (see {c.log_path})")
+        print(f"{'='*60}\n")
+
+    def needs_restart(self, component):
+        """Whether a component exited, or is running but never became ready"""
+        if component.status in ('gave_up', 'stopped'):
+            return False
+        return component.status == 'failed' or not component.alive()
+
+    def monitor(self):
+        """Restart components that exit or fail to become ready, with backoff and a restart budget"""
+        while not self._stopping.wait(self.poll_interval):
+            for component in self.components:
+                restarting = self._restarting.get(component.name)
+                if (restarting and restarting.is_alive()) or not self.needs_restart(component):
+                    continue
+                thread = threading.Thread(target=self._restart, args=(component,), daemon=True,
+                                          name=f"restart-{component.name}")
+                self._restarting[component.name] = thread
+                thread.start()
+
+    def _restart(self, component):
+        now = time.monotonic()
+        component.restarts = [t for t in component.restarts if now - t < RESTART_WINDOW]
+        if len(component.restarts) >= MAX_RESTARTS:
+            component.stop()
+            component.status = 'gave_up'
+            print(f"✗ {component.name} failed {MAX_RESTARTS} times in {RESTART_WINDOW}s; not restarting")
+            return
+        delay = min(RESTART_BACKOFF_MAX, 2 ** len(component.restarts) - 1)
+        if component.alive():
+            print(f"⚠️  {component.name} did not become ready; restarting{f' in {delay}s' if delay else ''}")
+            component.stop()
+        else:
+            print(f"⚠️  {component.name} exited with code {component.process.returncode}; "
+                  f"restarting{f' in {delay}s' if delay else ''}")
+        if self._stopping.wait(delay):
+            return
+        with self._lock:
+            if self._stopping.is_set():
+                return
+            component.restarts.append(time.monotonic())
+            component.start()
+        if component.wait_ready():
+            print(f"✓ {component.name} ready again after {component.ready_after:.1f}s")
+
+    def stop(self):
+        with self._lock:
+            self._stopping.set()
+        for component in reversed(self.components):
+            component.stop()
+        for thread in list(self._restarting.values()):
+            thread.join(timeout=5)
+
+def build_components(args):
+    """Components to run for the given command-line options"""
+    wanted = set(args.only) if args.only else {'api', 'n8n', 'tunnel'}
+    components = []
+    if 'api' in wanted:
+        # Restarts are the supervisor's job, so the API server runs without the debug reloader
+        components.append(Component('api', [sys.executable, 'api_server.py'],
+                                    http_probe(f"http://localhost:{args.api_port}/api/health"),
+                                    env={"PORT": str(args.api_port), "API_DEBUG": "0"}, log_dir=args.log_dir))
+    if 'n8n' in wanted and not args.no_n8n:
+        if args.n8n_stand_in:
+            command = [sys.executable, 'n8n_stand_in.py', '--port', str(args.n8n_port)]
+        elif check_n8n_installed():
+            command = ['n8n', 'start', '--port', str(args.n8n_port)]
+        else:
+            command = None
+            print("⚠️  n8n not installed; skipping it (use --n8n-stand-in for a local stand-in)")
+        if command:
+            components.append(Component('n8n', command, http_probe(f"http://localhost:{args.n8n_port}/healthz"),
+                                        log_dir=args.log_dir))
+    if 'tunnel' in wanted and not args.no_tunnel:
+        ngrok_path = check_ngrok_installed()
+        if ngrok_path:
+            components.append(Component('tunnel', [ngrok_path, 'http', str(args.api_port), '--log=stdout'],
+                                        ngrok_probe(), log_dir=args.log_dir))
+        else:
+            print("⚠️  ngrok not installed; skipping the tunnel")
+    return components
+
+def main():
+    parser = argparse.ArgumentParser(description="Start and supervise the interview stack")
+    parser.add_argument('--only', nargs='+', choices=['api', 'n8n', 'tunnel'], help="Components to run")
+    parser.add_argument('--no-n8n', action='store_true', help="Don't start n8n")
+    parser.add_argument('--no-tunnel', action='store_true', help="Don't start the ngrok tunnel")
+    parser.add_argument('--n8n-stand-in', action='store_true', help="Run n8n_stand_in.py instead of n8n")
+    parser.add_argument('--api-port', type=int, default=5000)
+    parser.add_argument('--n8n-port', type=int, default=5678)
+    parser.add_argument('--log-dir', default='/tmp', help="Directory for component logs")
+    args = parser.parse_args()
+
+    components = build_components(args)
+    if not components:
+        print("✗ Nothing to start")
+        sys.exit(1)
+
+    print(f"{'='*60}")
+    print("Starting AI Interview System")
+    print(f"{'='*60}\n")
+    supervisor = Supervisor(components)
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        supervisor.report(supervisor.start())
+        tunnel = next((c for c in components if c.name == 'tunnel' and c.status == 'ready'), None)
+        if tunnel:
+            print(f"Webhook URL for Recall.ai: {tunnel.ready_value}/api/webhook/recall")
+        print(f"Dashboard: http://localhost:{args.api_port}/dashboard")
+        print("Press Ctrl+C to stop all services\n")
+        supervisor.monitor()
+    except (KeyboardInterrupt, SystemExit):
+        pass
+    finally:
+        print("\nStopping services...")
+        supervisor.stop()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+import threading
+import time
+
+import pytest
+from flask import Flask
+
+from admission import AdmissionController, Overloaded, PRIORITY_FINAL, PRIORITY_REALTIME
+
+def _wait_for_queue(controller, size):
+    deadline = time.monotonic() + 5
+    while controller.stats()["queued"] < size:
+        assert time.monotonic() < deadline, "waiters never queued"
+        time.sleep(0.01)
+
+def _app(controller):
+    app = Flask(__name__)
+
+    @app.route('/hook', methods=['POST'])
+    @controller.guard(lambda data: data.get('priority', PRIORITY_REALTIME))
+    def hook():
+        return "ok"
+
+    return app.test_client()
+
+def test_final_events_are_admitted_before_realtime_chunks():
+    controller = AdmissionController(max_concurrent=1, max_queue=8)
+    order = []
+
+    def request(name, priority):
+        with controller.admit(priority):
+            order.append(name)
+
+    with controller.admit(PRIORITY_FINAL):
+        threads = [threading.Thread(target=request, args=("realtime", PRIORITY_REALTIME))]
+        threads[0].start()
+        _wait_for_queue(controller, 1)
+        threads.append(threading.Thread(target=request, args=("final", PRIORITY_FINAL)))
+        threads[1].start()
+        _wait_for_queue(controller, 2)
+    for thread in threads:
+        thread.join(5)
+
+    assert order == ["final", "realtime"]
+
+def test_full_queue_evicts_a_realtime_waiter_for_a_final_event():
+    controller = AdmissionController(max_concurrent=1, max_queue=1, realtime_queue_limit=1)
+    results = {}
+
+    def request(name, priority):
+        try:
+            with controller.admit(priority):
+                results[name] = 200
+        except Overloaded as e:
+            results[name] = e.status
+
+    with controller.admit(PRIORITY_FINAL):
+        realtime = threading.Thread(target=request, args=("realtime", PRIORITY_REALTIME))
+        realtime.start()
+        _wait_for_queue(controller, 1)
+        final = threading.Thread(target=request, args=("final", PRIORITY_FINAL))
+        final.start()
+        realtime.join(5)
+    final.join(5)
+
+    assert results == {"realtime": 503, "final": 200}
+    assert controller.stats()["evicted"] == 1
+
+def test_realtime_chunk_is_shed_with_429():
+    controller = AdmissionController(max_concurrent=1, max_queue=4, realtime_queue_limit=0)
+    client = _app(controller)
+    with controller.admit(PRIORITY_FINAL):
+        response = client.post('/hook', json={"priority": PRIORITY_REALTIME})
+    assert response.status_code == 429
+    assert int(response.headers['Retry-After']) >= 1
+
+def test_full_queue_rejects_with_503():
+    controller = AdmissionController(max_concurrent=1, max_queue=0)
+    client = _app(controller)
+    with controller.admit(PRIORITY_FINAL):
+        response = client.post('/hook', json={"priority": PRIORITY_FINAL})
+    assert response.status_code == 503
+    assert int(response.headers['Retry-After']) >= 1
+    assert client.post('/hook', json={"priority": PRIORITY_FINAL}).status_code == 200
+
+def test_wait_times_out_with_503():
+    controller = AdmissionController(max_concurrent=1, max_queue=4, queue_timeout=0.05)
+    with controller.admit(PRIORITY_FINAL):
+        with pytest.raises(Overloaded) as exc:
+            with controller.admit(PRIORITY_FINAL):
+                pass
+    assert exc.value.status == 503
+    assert controller.stats()["timed_out"] == 1
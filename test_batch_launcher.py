@@ -0,0 +1,37 @@
+import json
+from datetime import timezone
+
+import pytest
+
+import batch_launcher
+from batch_launcher import load_schedule, launch_schedule
+
+def write_schedule(tmp_path, meetings):
+    path = tmp_path / "schedule.json"
+    path.write_text(json.dumps(meetings))
+    return path
+
+def test_aware_and_naive_join_times_are_normalized_to_utc(tmp_path):
+    meetings = load_schedule(write_schedule(tmp_path, [
+        {"meeting_url": "https://meet/a", "join_at": "2024-05-01T10:00:00Z"},
+        {"meeting_url": "https://meet/b", "join_at": "2024-05-01T12:00:00+02:00"},
+        {"meeting_url": "https://meet/c", "join_at": "2024-05-01T10:00:00"},
+        {"meeting_url": "https://meet/d"}
+    ]))
+    assert meetings[0]["join_at"] == meetings[1]["join_at"]
+    assert all(m["join_at"].tzinfo == timezone.utc for m in meetings[:3])
+    assert "join_at" not in meetings[3]
+
+def test_invalid_join_at_is_rejected_when_loading(tmp_path):
+    with pytest.raises(ValueError):
+        load_schedule(write_schedule(tmp_path, [{"meeting_url": "https://meet/a", "join_at": "tomorrow"}]))
+
+def test_meetings_launch_in_join_time_order(monkeypatch):
+    launched = []
+    monkeypatch.setattr(batch_launcher, "launch_bot", lambda meeting, *args: launched.append(meeting["meeting_url"]))
+    launch_schedule([
+        {"meeting_url": "later", "join_at": "2020-01-01T12:00:00+00:00"},
+        {"meeting_url": "earlier", "join_at": "2020-01-01T11:30:00+01:00"},
+        {"meeting_url": "now"}
+    ], workers=1)
+    assert launched == ["now", "earlier", "later"]
@@ -0,0 +1,77 @@
+import time
+
+import pytest
+import requests
+
+import circuit_breaker
+from circuit_breaker import CircuitBreaker, CircuitOpen
+
+def _wait_for_state(breaker, state):
+    deadline = time.monotonic() + 5
+    while breaker.state != state:
+        assert time.monotonic() < deadline, f"breaker never became {state}"
+        time.sleep(0.01)
+
+def _breaker(probe_results):
+    results = iter(probe_results)
+    return CircuitBreaker("test", probe=lambda: next(results, True), failure_threshold=2, probe_interval=0.01)
+
+def test_breaker_opens_after_consecutive_failures():
+    breaker = _breaker([False] * 1000)
+    breaker.record(False)
+    assert breaker.state == 'closed'
+    breaker.record(False)
+    assert breaker.state == 'open'
+    assert not breaker.allow()
+    assert breaker.stats()["rejected"] == 1
+
+def test_successful_probe_half_opens_and_a_good_trial_closes():
+    breaker = _breaker([False, True])
+    breaker.record(False)
+    breaker.record(False)
+    _wait_for_state(breaker, 'half_open')
+    assert breaker.stats()["probes"] == 2
+
+    # Exactly one trial call goes out
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record(True)
+    assert breaker.state == 'closed'
+    assert breaker.allow()
+
+def test_failed_trial_reopens():
+    breaker = _breaker([True, False, False])
+    breaker.record(False)
+    breaker.record(False)
+    _wait_for_state(breaker, 'half_open')
+    assert breaker.allow()
+    breaker.record(False)
+    assert breaker.state == 'open'
+    assert breaker.stats()["opened"] == 2
+
+def test_cancelled_trial_is_handed_to_the_next_call():
+    breaker = _breaker([True])
+    breaker.record(False)
+    breaker.record(False)
+    _wait_for_state(breaker, 'half_open')
+    assert breaker.allow()
+    breaker.cancel()
+    assert breaker.allow()
+
+def test_post_fails_fast_while_open(monkeypatch):
+    calls = []
+
+    def failing_post(url, **kwargs):
+        calls.append(url)
+        raise requests.exceptions.ConnectionError("refused")
+
+    url = "http://n8n.test/webhook/open"
+    monkeypatch.setattr(circuit_breaker.requests, 'post', failing_post)
+    monkeypatch.setitem(circuit_breaker._breakers, url,
+                        CircuitBreaker(url, probe=lambda: False, failure_threshold=2, probe_interval=60))
+    for _ in range(2):
+        with pytest.raises(requests.exceptions.ConnectionError):
+            circuit_breaker.post(url, json={})
+    with pytest.raises(CircuitOpen):
+        circuit_breaker.post(url, json={})
+    assert len(calls) == 2
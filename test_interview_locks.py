@@ -0,0 +1,48 @@
+import threading
+import time
+
+from interview_locks import KeyedLocks
+
+def _wait_for_tickets(locks, key, count):
+    _, tickets = locks._stripe(key)
+    deadline = time.monotonic() + 5
+    while tickets.get(key, [0])[0] < count:
+        assert time.monotonic() < deadline, "waiters never queued"
+        time.sleep(0.01)
+
+def test_waiters_for_a_key_are_served_in_arrival_order():
+    locks = KeyedLocks(stripes=1)
+    order = []
+
+    def worker(n):
+        with locks.hold("meeting"):
+            order.append(n)
+
+    threads = []
+    with locks.hold("meeting"):
+        for n in range(8):
+            thread = threading.Thread(target=worker, args=(n,))
+            thread.start()
+            threads.append(thread)
+            _wait_for_tickets(locks, "meeting", n + 2)
+    for thread in threads:
+        thread.join(5)
+
+    assert order == list(range(8))
+    assert locks.active_keys() == 0
+
+def test_other_keys_on_the_same_stripe_are_not_blocked():
+    locks = KeyedLocks(stripes=1)
+    entered = threading.Event()
+
+    def other():
+        with locks.hold("other"):
+            entered.set()
+
+    with locks.hold("meeting"):
+        assert locks.busy("meeting")
+        thread = threading.Thread(target=other)
+        thread.start()
+        assert entered.wait(5)
+    thread.join(5)
+    assert not locks.busy("meeting")
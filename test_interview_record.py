@@ -0,0 +1,39 @@
+import json
+
+from interview_record import InterviewRecord
+from interview_store import InterviewStore
+
+def test_short_transcript_survives_reload(tmp_path):
+    raw = {"id": "n1", "transcript": "short one"}
+    store = InterviewStore(tmp_path / "interviews.snap").load()
+    store.append({"id": "n1", "transcript": "short one", "analysis": {"score": 1, "transcript": "short one"},
+                  "raw_data": [raw]})
+    store.flush()
+
+    reloaded = InterviewStore(tmp_path / "interviews.snap").load()
+    record = reloaded[0].to_dict()
+    assert record["raw_data"] == [raw]
+    assert record["analysis"]["transcript"] == "short one"
+
+    # A later chunk appends to the decoded list, not to a re-encoded string
+    updated = {**reloaded[0], "raw_data": reloaded[0]["raw_data"] + [{"bot_id": "b2", "text": "hi"}]}
+    reloaded[0] = updated
+    reloaded.flush()
+    assert InterviewStore(tmp_path / "interviews.snap").load()[0].to_dict()["raw_data"] == \
+        [raw, {"bot_id": "b2", "text": "hi"}]
+
+def test_long_transcript_round_trip(tmp_path):
+    transcript = "I have built REST APIs in Python for five years"
+    data = {"id": "n2", "transcript": transcript, "analysis": {"score": 5, "transcript": transcript},
+            "raw_data": [{"transcript": transcript}]}
+    store = InterviewStore(tmp_path / "interviews.snap").load()
+    store.append(data)
+    store.flush()
+    assert InterviewStore(tmp_path / "interviews.snap").load()[0].to_dict() == data
+
+def test_legacy_record_is_compacted():
+    legacy = {"id": "n3", "transcript": "hello there", "raw_data": {"text": "hello there"}}
+    record = InterviewRecord.from_stored(legacy)
+    assert isinstance(record.to_stored()["raw_data"], str)
+    assert json.loads(record.to_stored()["raw_data"]) == {"text": "hello there"}
+    assert record.to_dict()["raw_data"] == {"text": "hello there"}
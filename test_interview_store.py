@@ -0,0 +1,54 @@
+from interview_store import InterviewStore
+
+RECORDS = [{"id": f"i{n}", "bot_id": f"b{n}" if n % 2 else None, "timestamp": f"2024-01-0{n + 1}T10:00:00",
+            "transcript": f"answer number {n}"} for n in range(4)]
+
+def _store(tmp_path, records=RECORDS):
+    store = InterviewStore(tmp_path / "interviews.snap").load()
+    for record in records:
+        store.append(record)
+    store.flush()
+    return store
+
+def test_snapshot_and_index_round_trip(tmp_path):
+    _store(tmp_path)
+
+    reloaded = InterviewStore(tmp_path / "interviews.snap").load()
+    assert len(reloaded) == len(RECORDS)
+    assert [reloaded.meta(n) for n in range(len(RECORDS))] == \
+        [(r["id"], r["bot_id"], r["timestamp"]) for r in RECORDS]
+    assert [record.to_dict() for record in reloaded] == RECORDS
+
+def test_updates_survive_reload(tmp_path):
+    store = _store(tmp_path)
+    store[1] = {**store[1], "transcript": "a longer answer"}
+    store.append({"id": "i9", "bot_id": "b9", "timestamp": "2024-02-01T10:00:00", "transcript": "new"})
+    store.flush()
+
+    reloaded = InterviewStore(tmp_path / "interviews.snap").load()
+    assert reloaded[1]["transcript"] == "a longer answer"
+    assert reloaded.meta(-1) == ("i9", "b9", "2024-02-01T10:00:00")
+    assert len(reloaded) == len(RECORDS) + 1
+
+def test_archived_records_are_read_from_segments(tmp_path):
+    store = _store(tmp_path)
+    assert store.archive_cold(hot_max=1) == len(RECORDS) - 1
+    assert [store.is_archived(n) for n in range(len(RECORDS))] == [True, True, True, False]
+    assert store.stats()["segments"] == 1
+
+    reloaded = InterviewStore(tmp_path / "interviews.snap").load()
+    assert reloaded.is_archived(0)
+    assert [record.to_dict() for record in reloaded] == RECORDS
+    # Archived records are read on demand, never cached
+    assert reloaded.stats()["materialized"] == 1
+
+def test_updated_archived_record_becomes_hot_again(tmp_path):
+    store = _store(tmp_path)
+    store.archive_cold(hot_max=1)
+    store[0] = {**store[0], "transcript": "revised"}
+    store.flush()
+
+    reloaded = InterviewStore(tmp_path / "interviews.snap").load()
+    assert not reloaded.is_archived(0)
+    assert reloaded[0]["transcript"] == "revised"
+    assert reloaded[1]["transcript"] == "answer number 1"
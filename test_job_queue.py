@@ -0,0 +1,52 @@
+import time
+
+from job_queue import JobQueue
+
+def test_queued_jobs_for_an_interview_are_coalesced(tmp_path):
+    queue = JobQueue(tmp_path / "jobs.db")
+    first = queue.enqueue('analyze', 'i1', {"transcript": "hello"})
+    second = queue.enqueue('analyze', 'i1', {"transcript": "hello there"})
+    assert first == second
+    assert queue.claim() == (first, 'analyze', 'i1', {"transcript": "hello there"})
+    assert queue.claim() is None
+
+def test_running_job_is_reclaimed_only_after_its_lease_expires(tmp_path):
+    queue = JobQueue(tmp_path / "jobs.db")
+    job_id = queue.enqueue('analyze', 'i1', {})
+    assert queue.claim(lease=0.2)[0] == job_id
+    assert queue.claim() is None
+    assert queue.stats()["running"] == 1
+
+    time.sleep(0.3)
+    assert queue.claim()[0] == job_id
+
+def test_renewed_lease_keeps_the_job(tmp_path):
+    queue = JobQueue(tmp_path / "jobs.db")
+    job_id = queue.enqueue('analyze', 'i1', {})
+    queue.claim(lease=0.2)
+    assert queue.renew(job_id, lease=60)
+    time.sleep(0.3)
+    assert queue.claim() is None
+
+    queue.complete(job_id, {"score": 1})
+    assert not queue.renew(job_id)
+    assert queue.finished() == [(job_id, 'analyze', 'i1', {"score": 1})]
+    queue.ack([job_id])
+    assert queue.stats() == {"queued": 0, "running": 0, "done": 0, "failed": 0}
+
+def test_failed_job_is_retried_until_max_attempts(tmp_path):
+    queue = JobQueue(tmp_path / "jobs.db")
+    job_id = queue.enqueue('analyze', 'i1', {"transcript": "x"})
+    for _ in range(2):
+        assert queue.claim()[0] == job_id
+        queue.fail(job_id, "boom", max_attempts=2)
+    assert queue.claim() is None
+    assert queue.failed() == [(job_id, 'analyze', 'i1', {"transcript": "x"}, "boom")]
+
+def test_fail_with_zero_attempts_fails_for_good(tmp_path):
+    queue = JobQueue(tmp_path / "jobs.db")
+    job_id = queue.enqueue('analyze', 'i1', {})
+    queue.claim()
+    queue.fail(job_id, "unrecoverable", max_attempts=0)
+    assert queue.stats()["failed"] == 1
+    assert queue.claim() is None
@@ -0,0 +1,46 @@
+import time
+
+import pytest
+
+from rate_limiter import MemoryBackend, RateLimited, SqliteBackend, TokenBucket, _take
+
+def test_bucket_refills_at_its_rate_up_to_capacity():
+    state = [0.0, 100.0, 0.0]
+    assert _take(state, 2.0, 5, 100.25) == pytest.approx(0.25)  # half a token refilled
+    assert _take(state, 2.0, 5, 100.5) == 0.0
+    assert state[0] == pytest.approx(0.0)
+
+    assert _take(state, 2.0, 5, 200.0) == 0.0  # long idle: refilled to capacity only
+    assert state[0] == pytest.approx(4.0)
+
+def test_burst_is_served_immediately_then_limited():
+    bucket = TokenBucket(20.0, burst=3, backend=MemoryBackend())
+    started = time.monotonic()
+    for _ in range(3):
+        bucket.acquire(max_wait=0)
+    assert time.monotonic() - started < 0.05
+
+    bucket.acquire(max_wait=1)  # waits about 1/20 s for a refill
+    assert time.monotonic() - started >= 0.04
+    assert bucket.stats()["acquired"] == 4
+
+def test_request_beyond_max_wait_is_rejected():
+    bucket = TokenBucket(1.0, burst=1, backend=MemoryBackend())
+    bucket.acquire(max_wait=0)
+    with pytest.raises(RateLimited):
+        bucket.acquire(max_wait=0.5)
+    assert bucket.stats()["rejected"] == 1
+
+def test_throttled_service_waits_for_retry_after():
+    bucket = TokenBucket(100.0, burst=10, backend=MemoryBackend())
+    bucket.throttled(30)
+    with pytest.raises(RateLimited):
+        bucket.acquire(max_wait=5)
+
+def test_sqlite_buckets_share_tokens(tmp_path):
+    first = TokenBucket(0.5, burst=2, name="svc", backend=SqliteBackend(tmp_path / "limits.db"))
+    second = TokenBucket(0.5, burst=2, name="svc", backend=SqliteBackend(tmp_path / "limits.db"))
+    first.acquire(max_wait=0)
+    second.acquire(max_wait=0)
+    with pytest.raises(RateLimited):
+        first.acquire(max_wait=0)
@@ -0,0 +1,14 @@
+import pytest
+
+from reanalyze import select_interviews
+
+INTERVIEWS = [{"id": "old", "timestamp": "2024-01-01T10:00:00"},
+              {"id": "new", "timestamp": "2024-06-01T10:00:00"}]
+
+def test_invalid_filter_is_rejected():
+    with pytest.raises(ValueError):
+        select_interviews(INTERVIEWS, since="garbage")
+
+def test_aware_filter_compares_with_naive_timestamps():
+    selected = select_interviews(INTERVIEWS, since="2024-03-01T00:00:00Z")
+    assert [interview["id"] for interview in selected] == ["new"]
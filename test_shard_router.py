@@ -0,0 +1,31 @@
+from shard_router import HashRing, shard_key
+
+NODES = ["http://node-a:5000", "http://node-b:5000", "http://node-c:5000"]
+KEYS = [f"bot-{n}" for n in range(2000)]
+
+def _assignment(ring):
+    return {key: ring.node_for(key) for key in KEYS}
+
+def test_assignment_is_stable_across_rings_and_node_order():
+    assignment = _assignment(HashRing(NODES))
+    assert _assignment(HashRing(NODES)) == assignment
+    assert _assignment(HashRing(reversed(NODES))) == assignment
+    assert set(assignment.values()) == set(NODES)
+
+def test_adding_a_node_only_moves_keys_to_it():
+    before = _assignment(HashRing(NODES))
+    ring = HashRing(NODES)
+    ring.add("http://node-d:5000")
+    after = _assignment(ring)
+
+    moved = [key for key in KEYS if after[key] != before[key]]
+    assert all(after[key] == "http://node-d:5000" for key in moved)
+    assert 0 < len(moved) < len(KEYS) / 2
+
+    ring.remove("http://node-d:5000")
+    assert _assignment(ring) == before
+
+def test_webhooks_for_a_bot_share_a_key():
+    assert shard_key('/webhook/recall', {"bot_id": "b1"}) == "b1"
+    assert shard_key('/webhook/recall', {"bot": {"id": "b1"}}) == "b1"
+    assert shard_key('/webhook/n8n', {"interview_data": {"bot_id": "b1"}}) == "b1"
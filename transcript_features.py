@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Transcript features shared by every analyzer
+A transcript is lowercased, tokenized and scanned for keywords once per
+ingest. analyze_interview and the n8n backend's sentiment, topic and
+engagement analyzers all read the resulting TranscriptFeatures instead of
+each making their own passes over the text. The compact form (to_dict) is
+stored with the analysis and sent to n8n, so downstream processing
+doesn't rescan the transcript either; the Code nodes of
+n8n_enhanced_workflow.json read them when present.
+
+Keyword hits keep the substring semantics the analyzers have always used
+("test" matches "testing"), so scores are unchanged.
+"""
+import re
+import threading
+
+SENTIMENT_WORDS = {
+    "positive": ['excellent', 'great', 'success', 'achieved', 'improved', 'solved', 'optimized', 'love', 'enjoy'],
+    "negative": ['difficult', 'challenge', 'problem', 'issue', 'failed', 'struggled', 'hard', 'complex']
+}
+
+TOPIC_KEYWORDS = {
+    "Programming Languages": ["python", "javascript", "java", "c++", "typescript", "go", "rust"],
+    "Frameworks": ["react", "django", "flask", "spring", "angular", "vue", "express"],
+    "Databases": ["database", "sql", "postgresql", "mongodb", "redis", "mysql"],
+    "APIs": ["api", "rest", "graphql", "endpoint", "microservice"],
+    "Cloud": ["aws", "azure", "gcp", "cloud", "docker", "kubernetes", "devops"],
+    "Testing": ["test", "testing", "unit test", "integration", "qa"],
+    "Architecture": ["architecture", "design pattern", "system design", "scalability"]
+}
+
+# Counted into metrics.technical_keywords by the n8n workflow
+WORKFLOW_TECHNICAL_KEYWORDS = ['code', 'programming', 'algorithm', 'software', 'development', 'python',
+                               'javascript', 'java', 'api', 'database', 'system', 'architecture', 'framework',
+                               'git', 'deployment', 'testing', 'debugging']
+
+BASE_VOCABULARY = frozenset(
+    [word for words in SENTIMENT_WORDS.values() for word in words] +
+    [keyword for keywords in TOPIC_KEYWORDS.values() for keyword in keywords] +
+    WORKFLOW_TECHNICAL_KEYWORDS)
+
+SENTENCE_END = re.compile(r'[.!?]+')
+
+_vocabularies = {}  # rubric version -> keywords scanned for it
+_vocabularies_lock = threading.Lock()
+
+def vocabulary(rubric=None):
+    """Every keyword an analyzer looks for, for the given rubric"""
+    if rubric is None:
+        return BASE_VOCABULARY
+    with _vocabularies_lock:
+        words = _vocabularies.get(rubric['version'])
+        if words is None:
+            words = BASE_VOCABULARY.union(*rubric['keywords'].values())
+            _vocabularies[rubric['version']] = words
+        return words
+
+class TranscriptFeatures:
+    """Tokens, counts and keyword hits of one transcript"""
+
+    __slots__ = ('length', 'tokens', 'word_count', 'question_count', 'sentence_count', 'keyword_hits',
+                 'rubric_version')
+
+    def __init__(self, length, tokens, word_count, question_count, sentence_count, keyword_hits,
+                 rubric_version=None):
+        self.length = length
+        self.tokens = tokens
+        self.word_count = word_count
+        self.question_count = question_count
+        self.sentence_count = sentence_count
+        self.keyword_hits = frozenset(keyword_hits)
+        self.rubric_version = rubric_version
+
+    @classmethod
+    def extract(cls, text, rubric=None):
+        """Compute the features of text, scanning for the rubric's keywords as well as the base ones"""
+        text = text or ''
+        text_lower = text.lower()
+        tokens = text.split()
+        hits = [keyword for keyword in vocabulary(rubric) if keyword in text_lower]
+        return cls(len(text), tokens, len(tokens), text.count('?'), len(SENTENCE_END.findall(text)), hits,
+                   rubric['version'] if rubric else None)
+
+    @classmethod
+    def from_dict(cls, data, text, rubric=None):
+        """Features sent along with text, or None if they don't belong to it or lack the rubric's keywords"""
+        if not isinstance(data, dict) or data.get('length') != len(text or ''):
+            return None
+        if rubric is not None and data.get('rubric_version') != rubric['version']:
+            return None
+        try:
+            return cls(data['length'], None, data['word_count'], data['question_count'], data['sentence_count'],
+                       data['keyword_hits'], data.get('rubric_version'))
+        except (KeyError, TypeError):
+            return None
+
+    def count(self, keywords):
+        """How many of keywords occur in the transcript"""
+        return sum(1 for keyword in keywords if keyword in self.keyword_hits)
+
+    def mentions_any(self, keywords):
+        return any(keyword in self.keyword_hits for keyword in keywords)
+
+    def to_dict(self):
+        """Compact form stored with the analysis and sent to n8n (without the tokens)"""
+        return {
+            "length": self.length,
+            "word_count": self.word_count,
+            "question_count": self.question_count,
+            "sentence_count": self.sentence_count,
+            "keyword_hits": sorted(self.keyword_hits),
+            "rubric_version": self.rubric_version
+        }
+
+def features_for(text, data=None, rubric=None):
+    """Features of text: the precomputed ones in data if they still apply, else freshly extracted"""
+    return TranscriptFeatures.from_dict(data, text, rubric) or TranscriptFeatures.extract(text, rubric)